@@ -1,9 +1,24 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import altair as alt
-import joblib
-from PIL import Image
+import os
+import tempfile
+
+from batch_predict import predict_csv
+from chart_data import ips_bar_data, scatter_data
+from comparables import open_index_if_current
+from correlation_stats import CorrelationStats, melt_corr
+from artifact_watcher import dataset_watcher, model_watcher, start_watching
+from dataset_stats import DATA_PATH, describe_frame, histogram_frame, load_or_build_stats
+from feature_schema import SLIDER_STEP, SPEC_OPTIONS, SPEC_RANGES
+from filter_index import FilterIndex
+from prediction_cache import PredictionCache, spec_key
+from prediction_engine import EUR_TO_IDR
+from prediction_intervals import open_intervals_if_current
+from section_timing import TIMINGS
+from sensitivity import BRAND_SWEEP, SWEEPS, sensitivity
+
+# Timing per section (opt-in lewat APP_TIMING=1); no-op kalau tidak aktif
+rerun_start = TIMINGS.now()
 
 # ===============================
 # CONFIG & CUSTOM CSS
@@ -196,19 +211,183 @@ COLORS = {
 # ===============================
 # LOAD DATA & MODEL
 # ===============================
-@st.cache_data
-def load_data():
-    df = pd.read_csv("data_final1_TEKREK.csv")
-    return df.drop(columns=["Unnamed: 0"])
+# Statistik dataset: dihitung sekali per versi CSV (disimpan di disk), lalu dari memori
+@st.cache_resource
+def load_dataset_stats(dataset_version, _df):
+    return load_or_build_stats(DATA_PATH, df=_df, dataset_sha256=dataset_version)
+
+# Index filter halaman Analisis (sorted price + bitset RAM/IPS), sekali per dataset
+@st.cache_resource
+def load_filter_index(dataset_version, _df):
+    return FilterIndex.build(_df)
+
+# Momen (count, sum, XᵀX) per bucket RAM × IPS × price bin untuk heatmap korelasi
+@st.cache_resource
+def load_corr_stats(dataset_version, _df):
+    return CorrelationStats(_df)
+
+# Data heatmap (format long) di-cache per filter state
+@st.cache_data(max_entries=256)
+def correlation_chart_data(dataset_version, min_price, max_price, ram_filter, ips_filter, _corr_stats):
+    return melt_corr(_corr_stats.corr(min_price, max_price, ram_filter, ips_filter))
+
+# Index "laptop serupa" (fitur di-standardisasi dengan scaler model), per dataset + model;
+# dibangun saat training / `comparables.py build`, tidak pernah di request path.
+# None (bagian disembunyikan) kalau belum ada / tidak cocok dengan versi ini
+@st.cache_resource
+def load_comparables(dataset_version, artifact_version):
+    try:
+        return open_index_if_current(dataset_version)
+    except (OSError, ValueError):
+        return None
+
+# Matriks koefisien bootstrap (B × 29) untuk interval prediksi, per dataset + model;
+# di-fit saat training / `prediction_intervals.py build`. None -> interval disembunyikan
+@st.cache_resource
+def load_intervals(dataset_version, artifact_version, _schema):
+    try:
+        return open_intervals_if_current(dataset_version, _schema)
+    except (OSError, ValueError):
+        return None
+
+# Shared oleh semua session (LRU, thread-safe)
+@st.cache_resource
+def get_prediction_cache():
+    return PredictionCache(maxsize=4096)
+
+# Hot reload: thread background cek mtime tiap APP_RELOAD_INTERVAL detik, konfirmasi
+# dengan sha256, load + validasi versi baru, lalu swap. Cache turunan versi lama dibuang
+def _invalidate_dataset_caches(old, new):
+    for cached in (load_dataset_stats, load_filter_index, load_corr_stats, correlation_chart_data,
+                   analysis_charts, load_comparables, load_intervals):
+        cached.clear()
+
+def _invalidate_model_caches(old, new):
+    load_comparables.clear()
+    load_intervals.clear()
+    get_prediction_cache().clear()
 
 @st.cache_resource
-def load_model():
-    model = joblib.load("prediksi_model_linear_TEKREK.pkl")
-    scaler = joblib.load("scaler_linear_TEKREK.pkl")
-    return model, scaler
+def get_artifact_watchers():
+    watchers = {"dataset": dataset_watcher(), "model": model_watcher()}
+    for watcher in watchers.values():
+        watcher.current  # versi pertama di-load sekarang (gagal -> error di first run)
+    watchers["dataset"].on_swap(_invalidate_dataset_caches)
+    watchers["model"].on_swap(_invalidate_model_caches)
+    start_watching(list(watchers.values()))
+    return watchers
+
+# Satu snapshot per rerun: rerun yang sedang jalan selesai dengan versi ini,
+# walaupun watcher sudah swap ke versi baru di tengah jalan
+watchers = get_artifact_watchers()
+data_snapshot = watchers["dataset"].current
+model_snapshot = watchers["model"].current
+dataset_version = data_snapshot.version
+artifact_version = model_snapshot.version
+
+with TIMINGS.section("load_data"):
+    # Satu DataFrame read-only untuk semua session; shallow view per rerun: tambah/hapus
+    # kolom tidak bocor ke session lain, tulis in-place -> ValueError (array read-only)
+    df = data_snapshot.value.copy(deep=False)
+with TIMINGS.section("dataset_stats"):
+    stats = load_dataset_stats(dataset_version, df)
+with TIMINGS.section("load_engine"):
+    # Registry model (lazy, LRU), engine default dan tabel harga `price_grid.py build`
+    model_registry, engine, price_grid = model_snapshot.value
+prediction_cache = get_prediction_cache()
 
-df = load_data()
-model, scaler = load_model()
+def artifacts_swapped():
+    """True kalau watcher sudah swap sejak full run ini (fragment masih pegang versi lama)."""
+    return (watchers["dataset"].version != dataset_version
+            or watchers["model"].version != artifact_version)
+
+def predict_price(spec, predictor=None):
+    # Grid dulu (satu index lookup, hanya model default), model hanya untuk spec di luar grid
+    if predictor is None or predictor is engine:
+        if price_grid is not None:
+            price = price_grid.lookup(*spec)
+            if price is not None:
+                return price
+        return engine.predict(*spec)
+    return predictor.predict(*spec)
+
+# ===============================
+# ANALYSIS CHARTS
+# ===============================
+# Spec chart di-cache per filter state; data hanya kolom yang dipakai,
+# bar IPS sudah di-agregasi dan scatter di-sample di atas SCATTER_MAX_POINTS
+@st.cache_resource(max_entries=64)
+def analysis_charts(dataset_version, min_price, max_price, ram_filter, ips_filter, _df, _rows):
+    import altair as alt
+
+    data = _df.iloc[_rows]
+    charts = {}
+    charts["ram"] = alt.Chart(scatter_data(data, "ram")).mark_circle(
+        size=70, opacity=0.7
+    ).encode(
+        x=alt.X('RAM (GB):Q', title='RAM (GB)', scale=alt.Scale(zero=False)),
+        y=alt.Y('Price (Euro):Q', title='Price (€)', scale=alt.Scale(zero=False)),
+        color=alt.Color('RAM (GB):Q', scale=alt.Scale(scheme='purples'), legend=None),
+        tooltip=['RAM (GB)', 'Price (Euro)', 'CPU_Frequency (GHz)', 'SSD']
+    ).properties(
+        height=350,
+        background="#EFF6FF"   # 🎨 warna lebih terang
+    ).configure_axis(
+        labelColor="#1E293B",     # warna angka di sumbu
+        titleColor="#2563EB",     # warna judul sumbu
+        labelFontSize=12,
+        titleFontSize=14
+    ).interactive()
+
+    charts["cpu"] = alt.Chart(scatter_data(data, "cpu")).mark_circle(size=70, opacity=0.7).encode(
+        x=alt.X('CPU_Frequency (GHz):Q', title='CPU Frequency (GHz)', scale=alt.Scale(zero=False)),
+        y=alt.Y('Price (Euro):Q', title='Price (€)', scale=alt.Scale(zero=False)),
+        color=alt.Color('CPU_Frequency (GHz):Q', scale=alt.Scale(scheme='reds'), legend=None),
+        tooltip=['CPU_Frequency (GHz)', 'Price (Euro)', 'RAM (GB)', 'SSD']
+    ).properties(
+        height=350,
+        background="#F5F3FF" 
+    ).configure_axis(
+        labelColor="#1E293B",     # warna angka di sumbu
+        titleColor="#2563EB",     # warna judul sumbu
+        labelFontSize=12,
+        titleFontSize=14
+    ).interactive()
+
+    charts["ips"] = alt.Chart(ips_bar_data(data)).mark_bar(cornerRadius=10).encode(
+        x=alt.X('IPS_Panel:N', title='IPS Panel', axis=alt.Axis(labelAngle=0)),
+        y=alt.Y('Average Price:Q', title='Average Price (€)'),
+        color=alt.Color('IPS_Panel:N', scale=alt.Scale(
+        domain=[0, 1],
+        range=['#94A3B8', '#10B981']   # grey-blue & emerald
+    ), legend=None),
+        tooltip=['IPS_Panel', 'Average Price']
+    ).properties(
+        height=350,
+        background="#FCEEFF"
+    ).configure_axis(
+        labelColor="#1E293B",     # warna angka di sumbu
+        titleColor="#2563EB",     # warna judul sumbu
+        labelFontSize=12,
+        titleFontSize=14
+    )
+
+    charts["weight"] = alt.Chart(scatter_data(data, "weight")).mark_circle(size=70, opacity=0.7).encode(
+        x=alt.X('Weight (kg):Q', title='Weight (kg)', scale=alt.Scale(zero=False)),
+        y=alt.Y('Price (Euro):Q', title='Price (€)', scale=alt.Scale(zero=False)),
+        color=alt.Color('Weight (kg):Q', scale=alt.Scale(scheme='teals'), legend=None),
+        tooltip=['Weight (kg)', 'Price (Euro)', 'Inches', 'RAM (GB)']
+    ).properties(
+        height=350,
+        background="#EAF7F0"
+    ).configure_axis(
+        labelColor="#1E293B",     # warna angka di sumbu
+        titleColor="#2563EB",     # warna judul sumbu
+        labelFontSize=12,
+        titleFontSize=14
+    ).interactive()
+
+    return charts
 
 # ===============================
 # SIDEBAR
@@ -225,6 +404,7 @@ with st.sidebar:
     page = st.radio(
         "",
         ["🏠 Dashboard", "📊 Analisis", "🔮 Prediksi"],
+        key="page",
         label_visibility="collapsed"
     )
     
@@ -233,11 +413,11 @@ with st.sidebar:
     # Informasi dataset
     st.markdown("### 📦 Dataset Info")
     st.info(f"""
-    **Total Samples:** {len(df):,}
+    **Total Samples:** {stats['n_rows']:,}
     
-    **Features:** {len(df.columns)}
+    **Features:** {stats['n_cols']}
     
-    **Price Range:** €{df['Price (Euro)'].min():,.0f} - €{df['Price (Euro)'].max():,.0f}
+    **Price Range:** €{stats['price_min']:,.0f} - €{stats['price_max']:,.0f}
     """)
     
     st.markdown("---")
@@ -246,7 +426,8 @@ with st.sidebar:
 # ===============================
 # DASHBOARD PAGE
 # ===============================
-if page == "🏠 Dashboard":
+@TIMINGS.timed("page.dashboard")
+def dashboard_page():
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
         st.markdown("""
@@ -266,7 +447,7 @@ if page == "🏠 Dashboard":
         st.markdown(f"""
         <div class="metric-card">
             <div style="font-size: 0.9rem; opacity: 0.9;">📊 Total Data</div>
-            <div style="font-size: 2rem; font-weight: 700;">{len(df):,}</div>
+            <div style="font-size: 2rem; font-weight: 700;">{stats['n_rows']:,}</div>
         </div>
         """, unsafe_allow_html=True)
     
@@ -274,7 +455,7 @@ if page == "🏠 Dashboard":
         st.markdown(f"""
         <div class="metric-card" style="background: linear-gradient(135deg, #ed64a6 0%, #ed64a6 100%);">
             <div style="font-size: 0.9rem; opacity: 0.9;">💶 Avg Price</div>
-            <div style="font-size: 2rem; font-weight: 700;">€{df['Price (Euro)'].mean():,.0f}</div>
+            <div style="font-size: 2rem; font-weight: 700;">€{stats['price_mean']:,.0f}</div>
         </div>
         """, unsafe_allow_html=True)
     
@@ -282,7 +463,7 @@ if page == "🏠 Dashboard":
         st.markdown(f"""
         <div class="metric-card" style="background: linear-gradient(135deg, #4299e1 0%, #4299e1 100%);">
             <div style="font-size: 0.9rem; opacity: 0.9;">💾 Max RAM</div>
-            <div style="font-size: 2rem; font-weight: 700;">{df['RAM (GB)'].max()} GB</div>
+            <div style="font-size: 2rem; font-weight: 700;">{stats['ram_max']} GB</div>
         </div>
         """, unsafe_allow_html=True)
     
@@ -290,7 +471,7 @@ if page == "🏠 Dashboard":
         st.markdown(f"""
         <div class="metric-card" style="background: linear-gradient(135deg, #48bb78 0%, #38a169 100%);">
             <div style="font-size: 0.9rem; opacity: 0.9;">⚙️ Max CPU</div>
-            <div style="font-size: 2rem; font-weight: 700;">{df['CPU_Frequency (GHz)'].max()} GHz</div>
+            <div style="font-size: 2rem; font-weight: 700;">{stats['cpu_max']} GHz</div>
         </div>
         """, unsafe_allow_html=True)
     
@@ -337,28 +518,39 @@ if page == "🏠 Dashboard":
     # Tabs for different views
     tab1, tab2, tab3 = st.tabs(["📋 10 baris pertama", "📈 Statistik data", "🎯 Distribusi target (Price)"])
     
-    with tab1:
+    # .style meng-import Styler (dan matplotlib) baru saat tabel ini dirender
+    with tab1, TIMINGS.section("dashboard.head_gradient"):
         st.dataframe(df.head(10).style.background_gradient(subset=['Price (Euro)'], cmap='Purples'), 
                     use_container_width=True, height=350)
     
-    with tab2:
-        st.dataframe(df.describe().style.background_gradient(cmap='Blues'), 
+    with tab2, TIMINGS.section("dashboard.describe_gradient"):
+        st.dataframe(describe_frame(stats).style.background_gradient(cmap='Blues'), 
                     use_container_width=True, height=350)
     
-    with tab3:
+    with tab3, TIMINGS.section("dashboard.histogram"):
         col1, col2 = st.columns(2)
         with col1:
-            price_chart = alt.Chart(df).mark_bar(color=COLORS['primary']).encode(
-                alt.X('Price (Euro):Q', bin=alt.Bin(maxbins=30), title='Price (€)'),
-                alt.Y('count()', title='Frequency'),
-                tooltip=['count()']
-            ).properties(height=300)
-            st.altair_chart(price_chart, use_container_width=True)
+            # Spec Vega-Lite langsung (tanpa Altair) supaya Dashboard tidak perlu import altair
+            st.vega_lite_chart(histogram_frame(stats), {
+                "height": 300,
+                "mark": {"type": "bar", "color": COLORS['primary']},
+                "encoding": {
+                    "x": {"field": "bin_start", "type": "quantitative", "title": "Price (€)"},
+                    "x2": {"field": "bin_end"},
+                    "y": {"field": "count", "type": "quantitative", "title": "Frequency"},
+                    "tooltip": [{"field": "count", "type": "quantitative", "title": "Count"}],
+                },
+            }, use_container_width=True)
 
 # ===============================
 # ANALYTICS PAGE
 # ===============================
-elif page == "📊 Analisis":
+# Fragment: geser slider / filter hanya me-rerun halaman ini, bukan seluruh app.py
+@st.fragment
+@TIMINGS.timed("page.analysis")
+def analytics_page():
+    if artifacts_swapped():
+        st.rerun(scope="app")
     st.markdown("""
             <div style="text-align:left;">
             <span style="font-size:3rem;">📊</span>
@@ -379,9 +571,10 @@ elif page == "📊 Analisis":
         )
         min_price, max_price = st.slider(
             "",
-            float(df['Price (Euro)'].min()),
-            float(df['Price (Euro)'].max()),
-            (float(df['Price (Euro)'].min()), float(df['Price (Euro)'].max())),
+            stats['price_min'],
+            stats['price_max'],
+            (stats['price_min'], stats['price_max']),
+            key="price_range",
             step=100.0
         )
     
@@ -392,8 +585,9 @@ elif page == "📊 Analisis":
         )
         ram_filter = st.multiselect(
             "",
-            options=sorted(df['RAM (GB)'].unique()),
-            default=sorted(df['RAM (GB)'].unique())
+            key="ram_filter",
+            options=stats['ram_values'],
+            default=stats['ram_values']
         )
     
     with col3:
@@ -403,43 +597,30 @@ elif page == "📊 Analisis":
         )
         ips_filter = st.multiselect(
             "",
+            key="ips_filter",
             options=[0, 1],
             default=[0, 1],
             format_func=lambda x: "Yes" if x == 1 else "No"
         )
     
-    # Filter data
-    filtered_df = df[
-        (df['Price (Euro)'] >= min_price) & 
-        (df['Price (Euro)'] <= max_price) &
-        (df['RAM (GB)'].isin(ram_filter)) &
-        (df['IPS_Panel'].isin(ips_filter))
-    ]
+    # Filter data (binary search harga + AND/OR bitset, tanpa scan semua baris)
+    with TIMINGS.section("analysis.filter_query"):
+        filter_index = load_filter_index(dataset_version, df)
+        filtered_rows = filter_index.query(min_price, max_price, ram_filter, ips_filter)
+    with TIMINGS.section("analysis.altair_charts"):
+        charts = analysis_charts(
+            dataset_version, min_price, max_price, tuple(ram_filter), tuple(ips_filter),
+            df, filtered_rows
+        )
     
-    st.markdown(f"*Showing {len(filtered_df)} of {len(df)} records*")
+    st.markdown(f"*Showing {len(filtered_rows)} of {len(df)} records*")
     
     # Visualizations grid
     col1, col2 = st.columns(2)
     
-    with col1:
+    with col1, TIMINGS.section("analysis.render_ram"):
         st.markdown(f'<h3 style="color: {COLORS["warning"]};">💾 Price vs RAM</h3>', unsafe_allow_html=True)
-        chart_ram = alt.Chart(filtered_df).mark_circle(
-            size=70, opacity=0.7
-        ).encode(
-            x=alt.X('RAM (GB):Q', title='RAM (GB)', scale=alt.Scale(zero=False)),
-            y=alt.Y('Price (Euro):Q', title='Price (€)', scale=alt.Scale(zero=False)),
-            color=alt.Color('RAM (GB):Q', scale=alt.Scale(scheme='purples'), legend=None),
-            tooltip=['RAM (GB)', 'Price (Euro)', 'CPU_Frequency (GHz)', 'SSD']
-        ).properties(
-            height=350,
-            background="#EFF6FF"   # 🎨 warna lebih terang
-        ).configure_axis(
-            labelColor="#1E293B",     # warna angka di sumbu
-            titleColor="#2563EB",     # warna judul sumbu
-            labelFontSize=12,
-            titleFontSize=14
-        ).interactive()
-        st.altair_chart(chart_ram, use_container_width=True)
+        st.altair_chart(charts["ram"], use_container_width=True)
         st.info("""
             📊 **Insight:**
             Secara umum terdapat tren positif antara RAM dan harga laptop.
@@ -448,23 +629,9 @@ elif page == "📊 Analisis":
             melainkan juga spesifikasi lain seperti CPU dan penyimpanan.
             """)
     
-    with col2:
+    with col2, TIMINGS.section("analysis.render_cpu"):
         st.markdown(f'<h3 style="color: {COLORS["secondary"]};">⚡ Price vs CPU Frequency</h3>', unsafe_allow_html=True)
-        chart_cpu = alt.Chart(filtered_df).mark_circle(size=70, opacity=0.7).encode(
-            x=alt.X('CPU_Frequency (GHz):Q', title='CPU Frequency (GHz)', scale=alt.Scale(zero=False)),
-            y=alt.Y('Price (Euro):Q', title='Price (€)', scale=alt.Scale(zero=False)),
-            color=alt.Color('CPU_Frequency (GHz):Q', scale=alt.Scale(scheme='reds'), legend=None),
-            tooltip=['CPU_Frequency (GHz)', 'Price (Euro)', 'RAM (GB)', 'SSD']
-        ).properties(
-            height=350,
-            background="#F5F3FF" 
-        ).configure_axis(
-            labelColor="#1E293B",     # warna angka di sumbu
-            titleColor="#2563EB",     # warna judul sumbu
-            labelFontSize=12,
-            titleFontSize=14
-        ).interactive()
-        st.altair_chart(chart_cpu, use_container_width=True)
+        st.altair_chart(charts["cpu"], use_container_width=True)
         st.info("""
             📊 **Insight:**
             Semakin tinggi frekuensi CPU, potensi harga meningkat, namun tidak sepenuhnya linear. Laptop dengan CPU 1.0 GHz cenderung berada
@@ -474,49 +641,18 @@ elif page == "📊 Analisis":
     
     col3, col4 = st.columns(2)
     
-    with col3:
+    with col3, TIMINGS.section("analysis.render_ips"):
         st.markdown(f'<h3 style="color: {COLORS["accent"]};">🖥️ Pengaruh IPS Panel</h3>', unsafe_allow_html=True)
-        chart_ips = alt.Chart(filtered_df).mark_bar(cornerRadius=10).encode(
-            x=alt.X('IPS_Panel:N', title='IPS Panel', axis=alt.Axis(labelAngle=0)),
-            y=alt.Y('mean(Price (Euro)):Q', title='Average Price (€)'),
-            color=alt.Color('IPS_Panel:N', scale=alt.Scale(
-            domain=[0, 1],
-            range=['#94A3B8', '#10B981']   # grey-blue & emerald
-        ), legend=None),
-            tooltip=['IPS_Panel', 'mean(Price (Euro))']
-        ).properties(
-            height=350,
-            background="#FCEEFF"
-        ).configure_axis(
-            labelColor="#1E293B",     # warna angka di sumbu
-            titleColor="#2563EB",     # warna judul sumbu
-            labelFontSize=12,
-            titleFontSize=14
-        )
-        st.altair_chart(chart_ips, use_container_width=True)
+        st.altair_chart(charts["ips"], use_container_width=True)
         st.info("""
             📊 **Insight:**
             Pengaruh IPS Panel memang cukup signifikan dikarenakan IPS Panel memiliki warna yang lebih bagus dibanding layar dengan no IPS Panel, tentu 
             hal tersebut juga menjadi faktor mengapa Laptop dengan IPS Panel memiliki harga yang lebih tinggi.
             """)
     
-    with col4:
+    with col4, TIMINGS.section("analysis.render_weight"):
         st.markdown(f'<h3 style="color: {COLORS["info"]};">⚖️ Weight vs Price</h3>', unsafe_allow_html=True)
-        chart_weight = alt.Chart(filtered_df).mark_circle(size=70, opacity=0.7).encode(
-            x=alt.X('Weight (kg):Q', title='Weight (kg)', scale=alt.Scale(zero=False)),
-            y=alt.Y('Price (Euro):Q', title='Price (€)', scale=alt.Scale(zero=False)),
-            color=alt.Color('Weight (kg):Q', scale=alt.Scale(scheme='teals'), legend=None),
-            tooltip=['Weight (kg)', 'Price (Euro)', 'Inches', 'RAM (GB)']
-        ).properties(
-            height=350,
-            background="#EAF7F0"
-        ).configure_axis(
-            labelColor="#1E293B",     # warna angka di sumbu
-            titleColor="#2563EB",     # warna judul sumbu
-            labelFontSize=12,
-            titleFontSize=14
-        ).interactive()
-        st.altair_chart(chart_weight, use_container_width=True)
+        st.altair_chart(charts["weight"], use_container_width=True)
         st.info("""
             📊 **Insight:**
             Secara umum, tidak terlihat hubungan linear yang kuat antara berat laptop (Weight) dan harga (Price). Laptop dengan berat sekitar 1–3 kg memiliki rentang harga yang cukup luas, mulai dari harga rendah hingga tinggi.
@@ -525,10 +661,14 @@ elif page == "📊 Analisis":
     
     # Correlation heatmap
     st.markdown(f'<h3 style="color: {COLORS["dark"]};">📈 Korelasi antar fitur</h3>', unsafe_allow_html=True)
-    numeric_cols = filtered_df.select_dtypes(include=[np.number]).columns
-    corr_matrix = filtered_df[numeric_cols].corr()
+    with TIMINGS.section("analysis.corr"):
+        corr_long = correlation_chart_data(
+            dataset_version, min_price, max_price, tuple(ram_filter), tuple(ips_filter),
+            load_corr_stats(dataset_version, df)
+        )
     
-    corr_chart = alt.Chart(corr_matrix.reset_index().melt('index')).mark_rect().encode(
+    import altair as alt
+    corr_chart = alt.Chart(corr_long).mark_rect().encode(
         x=alt.X('index:N', title=''),
         y=alt.Y('variable:N', title=''),
         color=alt.Color('value:Q', scale=alt.Scale(scheme='purplered')),
@@ -542,13 +682,18 @@ elif page == "📊 Analisis":
             labelFontSize=12,
             titleFontSize=14
     )
-    st.altair_chart(corr_chart, use_container_width=True)
+    with TIMINGS.section("analysis.render_corr"):
+        st.altair_chart(corr_chart, use_container_width=True)
 
 # ===============================
 # PREDICTION PAGE
 # ===============================
-
-elif page == "🔮 Prediksi":
+# Fragment: perubahan input & tombol prediksi hanya me-rerun halaman ini
+@st.fragment
+@TIMINGS.timed("page.prediction")
+def prediction_page():
+    if artifacts_swapped():
+        st.rerun(scope="app")
     st.markdown("""
             <div style="text-align:left;">
             <span style="font-size:3rem;">🔮</span>
@@ -563,6 +708,24 @@ elif page == "🔮 Prediksi":
     # Input sections with cards
     st.markdown('<h2 style="color: #4a5568;">🎛️ Konfigurasikan Spesifikasi Laptop Anda!</h2>', unsafe_allow_html=True)
     
+    # ===============================
+    # MODEL SECTION
+    # ===============================
+    st.markdown(f'<div class="feature-card"><h4 style="color: {COLORS["primary"]};">🧠 Model</h4></div>', unsafe_allow_html=True)
+    selected_model = st.selectbox(
+        "Model Prediksi",
+        options=model_registry.keys(),
+        format_func=model_registry.label,
+        help="Model lain di-load di background saat dipilih; session lain tetap jalan"
+    )
+    # Load dimulai sekarang (background thread), ditunggu baru saat tombol prediksi ditekan
+    model_future = model_registry.load_async(selected_model)
+    n_resident, resident_bytes = model_registry.resident_summary()
+    st.caption(
+        ("✅ Model siap" if model_future.done() else "⏳ Model sedang dimuat...")
+        + f" · {n_resident}/{model_registry.max_resident} model di memori ({resident_bytes / 2**20:.2f} MB)"
+    )
+
     # ===============================
     # BRAND SECTION
     # ===============================
@@ -572,16 +735,10 @@ elif page == "🔮 Prediksi":
     </div>
     ''', unsafe_allow_html=True)
 
-    company_list = [
-        'Apple','Asus','Chuwi','Dell','Fujitsu','Google','HP',
-        'Huawei','LG','Lenovo','MSI','Mediacom',
-        'Microsoft','Razer','Samsung','Toshiba','Vero','Xiaomi'
-    ]
-
     company = st.selectbox(
         "Pilih Brand Laptop",
-        options=company_list,
-        index=company_list.index("Dell"),
+        options=engine.schema.categories,
+        index=max(engine.brand_index("Dell"), 0),
         help="Brand mempengaruhi positioning harga dan segmentasi pasar"
     )
 
@@ -601,10 +758,11 @@ elif page == "🔮 Prediksi":
         )
         cpu = st.slider(
             "",
-            min_value=1.0,
-            max_value=5.0,
+            key="cpu",
+            min_value=SPEC_RANGES["cpu"][0],
+            max_value=SPEC_RANGES["cpu"][1],
             value=2.5,
-            step=0.1,
+            step=SLIDER_STEP,
             help="Frekuensi yang lebih tinggi = Kecepatan Pemrosesan yang lebih tinggi"
         )
         st.markdown(f"<small style='color: {COLORS['secondary']};'>Selected: {cpu} GHz</small>", unsafe_allow_html=True)
@@ -616,7 +774,8 @@ elif page == "🔮 Prediksi":
         )
         ram = st.selectbox(
             "",
-            options=[2, 4, 6, 8, 12, 14],
+            key="ram",
+            options=SPEC_OPTIONS["ram"],
             index=2,
             help="Semakin banyak ram, semakin mudah multitasking"
         )
@@ -629,10 +788,10 @@ elif page == "🔮 Prediksi":
         )
         inches = st.slider(
             "",
-            min_value=10.0,
-            max_value=18.0,
+            min_value=SPEC_RANGES["inches"][0],
+            max_value=SPEC_RANGES["inches"][1],
             value=15.6,
-            step=0.1,
+            step=SLIDER_STEP,
             help="Layar yang besar menyajikan viewing experience yang semakin baik"
         )
         st.markdown(f"<small style='color: {COLORS['primary']};'>Selected: {inches}\"</small>", unsafe_allow_html=True)
@@ -644,7 +803,7 @@ elif page == "🔮 Prediksi":
     with col4:
         ssd = st.selectbox(
             "SSD Capacity (GB)",
-            options=[0, 128, 256, 512, 1024],
+            options=SPEC_OPTIONS["ssd"],
             index=2,
             help="SSD provides faster boot and load times"
         )
@@ -653,7 +812,7 @@ elif page == "🔮 Prediksi":
     with col5:
         hdd = st.selectbox(
             "HDD Capacity (GB)",
-            options=[0, 500, 1000],
+            options=SPEC_OPTIONS["hdd"],
             index=1,
             help="HDD offers more storage at lower cost"
         )
@@ -666,7 +825,7 @@ elif page == "🔮 Prediksi":
     with col6:
         res_width = st.selectbox(
             "Resolution Width",
-            options=[1366, 1920, 2560, 2880],
+            options=SPEC_OPTIONS["res_width"],
             index=1,
             help="Higher width means sharper display"
         )
@@ -675,7 +834,7 @@ elif page == "🔮 Prediksi":
     with col7:
         res_height = st.selectbox(
             "Resolution Height",
-            options=[768, 1080, 1600, 1800],
+            options=SPEC_OPTIONS["res_height"],
             index=1,
             help="Higher height means more vertical space"
         )
@@ -685,10 +844,10 @@ elif page == "🔮 Prediksi":
 
         weight = st.slider(
             "Berat (Kg)",
-            min_value=1.0,
-            max_value=4.0,
+            min_value=SPEC_RANGES["weight"][0],
+            max_value=SPEC_RANGES["weight"][1],
             value=2.0,
-            step=0.1,
+            step=SLIDER_STEP,
             help="Lower weight means better portability"
         )
         st.markdown(f"<small style='color: {COLORS['accent']};'>Selected: {weight} kg</small>", unsafe_allow_html=True)
@@ -700,7 +859,7 @@ elif page == "🔮 Prediksi":
     with col9:
         ips = st.radio(
             "IPS Panel",
-            options=[0, 1],
+            options=SPEC_OPTIONS["ips"],
             index=1,
             format_func=lambda x: "✅ Yes" if x == 1 else "❌ No",
             help="IPS panels offer better color and viewing angles",
@@ -710,7 +869,7 @@ elif page == "🔮 Prediksi":
     with col10:
         touchscreen = st.radio(
             "Touchscreen",
-            options=[0, 1],
+            options=SPEC_OPTIONS["touchscreen"],
             index=0,
             format_func=lambda x: "✅ Yes" if x == 1 else "❌ No",
             help="Touchscreen enables touch interaction",
@@ -722,38 +881,44 @@ elif page == "🔮 Prediksi":
     # Prediction button
     col_btn1, col_btn2, col_btn3 = st.columns([1, 2, 1])
     with col_btn2:
-        if st.button("🚀 Prediksi Harga Sekarang!!", use_container_width=True):
+        if st.button("🚀 Prediksi Harga Sekarang!!", key="predict", use_container_width=True):
             with st.spinner("🤖 Menganalisis Spesifikasi..."):
-                company_columns = [
-                    'Company_Apple','Company_Asus','Company_Chuwi','Company_Dell',
-                    'Company_Fujitsu','Company_Google','Company_HP','Company_Huawei',
-                    'Company_LG','Company_Lenovo','Company_MSI','Company_Mediacom',
-                    'Company_Microsoft','Company_Razer','Company_Samsung',
-                    'Company_Toshiba','Company_Vero','Company_Xiaomi'
-                
-                ]   
-                company_dict = {col: 0 for col in company_columns}
-                selected_col = f"Company_{company}"
-
-                if selected_col in company_dict:
-                    company_dict[selected_col] = 1
-                    
-                # Prepare input data
-                input_data = pd.DataFrame([[ 
+                # Make prediction (scaler + model sudah digabung di engine)
+                spec = (
                     inches, cpu, ram, weight, touchscreen,
-                    ssd, res_width, res_height, ips, hdd
-                ] + list(company_dict.values())],
-                columns=[
-                    "Inches", "CPU_Frequency (GHz)", "RAM (GB)", "Weight (kg)",
-                    "Touchscreen", "SSD", "Res_Width", "Res_Height",
-                    "IPS_Panel", "HDD"
-                ] + company_columns)
-                
-                # Make prediction
-                input_scaled = scaler.transform(input_data)
-                prediction = model.predict(input_scaled)[0]
+                    ssd, res_width, res_height, ips, hdd, company
+                )
+                with TIMINGS.section("prediction.load_model"):
+                    try:
+                        predictor = model_future.result()
+                    except (OSError, ValueError, KeyError) as e:
+                        st.error(f"Model {model_registry.label(selected_model)} gagal di-load: {e}")
+                        return
+                with TIMINGS.section("prediction.predict"):
+                    prediction = prediction_cache.get_or_compute(
+                        (selected_model, spec_key(*spec)), lambda: predict_price(spec, predictor),
+                        version=artifact_version
+                    )
+                # Interval prediksi: satu matmul ke B replika bootstrap + persentil
+                with TIMINGS.section("prediction.interval"):
+                    # Interval dari bootstrap model linear, jadi hanya untuk model default
+                    intervals = load_intervals(dataset_version, artifact_version, engine.schema) if predictor is engine else None
+                    interval_html = ""
+                    if intervals is not None:
+                        price_lo, price_hi = intervals.interval(*spec)
+                        interval_html = f"""
+                        <p style="font-size: 1.1rem; margin: 0.6rem 0 0 0;">
+                            Interval {intervals.level:.0%}: €{max(price_lo, 0):,.0f} – €{price_hi:,.0f}
+                        </p>"""
+                # What-if: setiap input di-sweep (input lain tetap) dalam satu predict_batch
+                with TIMINGS.section("prediction.sensitivity"):
+                    sweep = sensitivity(predictor, spec)
+                # k laptop asli paling mirip (nearest neighbour di ruang fitur ter-standardisasi)
+                with TIMINGS.section("prediction.comparables"):
+                    comparables = load_comparables(dataset_version, artifact_version)
+                    if comparables is not None:
+                        similar_rows, similar_dist = comparables.query(spec, k=5)
                 
-                EUR_TO_IDR = 19990
                 price_idr = prediction * EUR_TO_IDR
 
                 # Display result
@@ -771,9 +936,9 @@ elif page == "🔮 Prediksi":
                         </h1>
                         <h2 style="font-size: 2.2rem; margin: 0; color: #FFD700;">
                             Rp {price_idr:,.0f}
-                        </h2>
+                        </h2>{interval_html}
                         <p style="opacity: 0.9; margin-top: 1rem;">
-                            Kurs asumsi: 1€ = Rp {EUR_TO_IDR:,.0f}
+                            Model: {model_registry.label(selected_model)} · Kurs asumsi: 1€ = Rp {EUR_TO_IDR:,.0f}
                         </p>
                     </div>
                     """, unsafe_allow_html=True)
@@ -811,7 +976,7 @@ elif page == "🔮 Prediksi":
                 📊 Komparasi harga
                 </h3>
                 """, unsafe_allow_html=True)
-                avg_price = df['Price (Euro)'].mean()
+                avg_price = stats['price_mean']
                 price_diff = prediction - avg_price
                 price_diff_pct = (price_diff / avg_price) * 100
                 
@@ -846,9 +1011,10 @@ elif page == "🔮 Prediksi":
                 # Visualization of prediction vs actual distribution
                 chart_data = pd.DataFrame({
                     'Category': ['Your Prediction', 'Market Average', 'Minimum', 'Maximum'],
-                    'Price': [prediction, avg_price, df['Price (Euro)'].min(), df['Price (Euro)'].max()]
+                    'Price': [prediction, avg_price, stats['price_min'], stats['price_max']]
                 })
                 
+                import altair as alt  # baru di-load saat ada hasil prediksi
                 price_chart = alt.Chart(chart_data).mark_bar().encode(
                     x=alt.X(
                         'Category:N',
@@ -878,7 +1044,168 @@ elif page == "🔮 Prediksi":
                     titleColor="#EAF7F0", 
                     labelFontSize=12,
                 ).interactive()
-                st.altair_chart(price_chart, use_container_width=True)
+                with TIMINGS.section("prediction.render_comparison"):
+                    st.altair_chart(price_chart, use_container_width=True)
+
+                # Sensitivity: semua kurva what-if dalam satu chart
+                st.markdown(f"""
+                <h3 style="color: {COLORS['success']}; font-weight:700;">
+                🔀 Bagaimana jika...?
+                </h3>
+                """, unsafe_allow_html=True)
+                # Spec Vega-Lite langsung (tanpa validasi Altair): satu dataset,
+                # kurva numerik di-facet, brand sebagai bar
+                sensitivity_spec = {
+                    "background": "#111827",
+                    "config": {
+                        "axis": {"labelColor": "#EAF7F0", "titleColor": "#EAF7F0", "labelFontSize": 12},
+                        "header": {"labelColor": "#EAF7F0", "labelFontSize": 13},
+                    },
+                    "vconcat": [
+                        {
+                            "transform": [{"filter": f"datum.input !== '{BRAND_SWEEP}'"}],
+                            "facet": {"field": "input", "type": "nominal", "title": None,
+                                      "sort": list(SWEEPS)},
+                            "columns": 4,
+                            "spec": {
+                                "width": 180,
+                                "height": 140,
+                                "encoding": {
+                                    "x": {"field": "value", "type": "quantitative", "title": None,
+                                          "scale": {"zero": False}},
+                                    "y": {"field": "Price", "type": "quantitative", "title": "Price (€)"},
+                                    "tooltip": [
+                                        {"field": "input"}, {"field": "label"},
+                                        {"field": "Price", "type": "quantitative", "format": ",.0f"},
+                                    ],
+                                },
+                                "layer": [
+                                    {"mark": {"type": "line", "color": COLORS['info']}},
+                                    {"transform": [{"filter": "datum.current"}],
+                                     "mark": {"type": "point", "filled": True, "size": 90,
+                                              "color": COLORS['success']}},
+                                ],
+                            },
+                            "resolve": {"scale": {"x": "independent"}},
+                        },
+                        {
+                            "transform": [{"filter": f"datum.input === '{BRAND_SWEEP}'"}],
+                            "width": 800,
+                            "height": 200,
+                            "mark": {"type": "bar", "cornerRadius": 4},
+                            "encoding": {
+                                "x": {"field": "label", "type": "nominal", "title": "Brand",
+                                      "sort": "-y"},
+                                "y": {"field": "Price", "type": "quantitative", "title": "Price (€)"},
+                                "color": {"condition": {"test": "datum.current", "value": COLORS['success']},
+                                          "value": COLORS['info']},
+                                "tooltip": [
+                                    {"field": "label", "title": "Brand"},
+                                    {"field": "Price", "type": "quantitative", "format": ",.0f"},
+                                ],
+                            },
+                        },
+                    ],
+                }
+                with TIMINGS.section("prediction.render_sensitivity"):
+                    st.vega_lite_chart(sweep, sensitivity_spec, use_container_width=True)
+                st.caption(
+                    f"{len(sweep):,} variasi konfigurasi (satu input diubah, input lain tetap) "
+                    "dihitung dalam satu batch prediksi"
+                )
+
+                # Comparable laptops dari dataset, dengan harga aslinya
+                if comparables is not None:
+                    st.markdown(f"""
+                    <h3 style="color: {COLORS['success']}; font-weight:700;">
+                    🔎 Laptop serupa di dataset
+                    </h3>
+                    """, unsafe_allow_html=True)
+                    similar = df.iloc[similar_rows]
+                    brand_codes = engine.schema.codes_from_onehot(similar)
+                    similar_table = pd.DataFrame({
+                        # kode -1 = brand referensi drop_first
+                        'Brand': [engine.schema.name(c) for c in brand_codes],
+                        'CPU (GHz)': similar['CPU_Frequency (GHz)'].to_numpy(),
+                        'RAM (GB)': similar['RAM (GB)'].to_numpy(),
+                        'SSD (GB)': similar['SSD'].to_numpy(),
+                        'HDD (GB)': similar['HDD'].to_numpy(),
+                        'Layar': [f"{i:g}\" {w}×{h}" for i, w, h in zip(
+                            similar['Inches'], similar['Res_Width'], similar['Res_Height'])],
+                        'Berat (kg)': similar['Weight (kg)'].to_numpy(),
+                        'Harga asli (€)': similar['Price (Euro)'].to_numpy(),
+                        'Jarak': similar_dist,
+                    })
+                    st.dataframe(
+                        similar_table, hide_index=True, use_container_width=True,
+                        column_config={
+                            'Harga asli (€)': st.column_config.NumberColumn(format="€%.0f"),
+                            'Jarak': st.column_config.NumberColumn(format="%.2f"),
+                        }
+                    )
+
+                cache_stats = prediction_cache.stats()
+                st.caption(
+                    f"Prediction cache: {cache_stats['hits']:,} hit / {cache_stats['misses']:,} miss / "
+                    f"{cache_stats['evictions']:,} evicted "
+                    f"(hit rate {cache_stats['hit_rate']:.0%}, {cache_stats['size']:,}/{cache_stats['maxsize']:,} entries)"
+                )
+
+    # ===============================
+    # BATCH PREDICTION (CSV)
+    # ===============================
+    st.markdown("---")
+    st.markdown('<h2 style="color: #4a5568;">📦 Prediksi Batch dari CSV</h2>', unsafe_allow_html=True)
+    st.markdown(
+        '<p style="color: #718096;">Upload CSV dengan kolom fitur yang sama seperti dataset '
+        '(<code>Company_*</code> one-hot atau satu kolom <code>Company</code> berisi nama brand).</p>',
+        unsafe_allow_html=True
+    )
+    batch_file = st.file_uploader("CSV konfigurasi laptop", type=["csv"])
+    if batch_file is not None and st.button("📦 Prediksi Semua Baris", use_container_width=True):
+        try:
+            predictor = model_future.result()
+        except (OSError, ValueError, KeyError) as e:
+            st.error(f"Model {model_registry.label(selected_model)} gagal di-load: {e}")
+            return
+        progress_text = st.empty()
+        # Hasil ditulis ke disk per chunk, jadi prediksi tidak menahan seluruh CSV di memori.
+        # download_button (Streamlit 1.51) tetap membaca seluruh file hasil ke memori
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            out_path = os.path.join(tmp_dir, "prediksi_harga_batch.csv")
+            try:
+                with TIMINGS.section("prediction.batch_csv"):
+                    batch_stats = predict_csv(
+                        predictor, batch_file, out_path,
+                        progress=lambda n: progress_text.markdown(f"*{n:,} baris diproses...*"),
+                        intervals=load_intervals(dataset_version, artifact_version, engine.schema) if predictor is engine else None
+                    )
+            except ValueError as e:
+                st.error(f"CSV tidak valid: {e}")
+            else:
+                progress_text.markdown(
+                    f"*{batch_stats['rows']:,} baris dalam {batch_stats['seconds']:.2f} detik "
+                    f"({batch_stats['rows_per_sec']:,.0f} baris/detik)*"
+                )
+                with open(out_path, "rb") as out:
+                    st.download_button(
+                        "⬇️ Download Hasil Prediksi (CSV)",
+                        data=out,
+                        file_name="prediksi_harga_batch.csv",
+                        mime="text/csv",
+                        on_click="ignore",
+                        use_container_width=True
+                    )
+
+# ===============================
+# ROUTING
+# ===============================
+if page == "🏠 Dashboard":
+    dashboard_page()
+elif page == "📊 Analisis":
+    analytics_page()
+elif page == "🔮 Prediksi":
+    prediction_page()
 
 # ===============================
 # FOOTER
@@ -904,4 +1231,38 @@ https://www.hpc-hub.gunadarma.ac.id/
 </a>
 
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+# ===============================
+# HOT RELOAD STATUS
+# ===============================
+st.sidebar.caption(f"🔄 Model `{artifact_version[:8]}` · Dataset `{dataset_version[:8]}`")
+for watcher in watchers.values():
+    if watcher.last_error:
+        st.sidebar.warning(
+            f"Versi baru {watcher.name} ditolak, versi lama tetap dipakai: {watcher.last_error}"
+        )
+
+# ===============================
+# DEBUG: TIMING PER SECTION
+# ===============================
+# Hanya tampil dengan APP_TIMING=1; fragment rerun tercatat, tapi panel
+# baru ter-update pada full rerun berikutnya
+TIMINGS.record_since("script", rerun_start)
+if TIMINGS.enabled:
+    with st.sidebar.expander("⏱️ Timing per section (ms)"):
+        timing_rows = pd.DataFrame(TIMINGS.snapshot())
+        if len(timing_rows):
+            ms_cols = ["p50", "p95", "p99", "last"]
+            timing_rows[ms_cols] = timing_rows[ms_cols] * 1000
+            st.dataframe(
+                timing_rows[["section", "count"] + ms_cols].sort_values("p50", ascending=False),
+                hide_index=True, use_container_width=True
+            )
+        st.download_button(
+            "⬇️ Prometheus dump", data=TIMINGS.prometheus_text(),
+            file_name="app_section_timing.prom", mime="text/plain", on_click="ignore"
+        )
+        if st.button("Reset timing"):
+            TIMINGS.reset()
+    TIMINGS.maybe_export()
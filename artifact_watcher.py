@@ -0,0 +1,347 @@
+import argparse
+import hashlib
+import os
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from dataset_stats import DATA_PATH, file_sha256
+from feature_schema import SCHEMA
+from model_registry import BUILTIN_ENTRY, DEFAULT_KEY, MANIFEST_PATH, ModelRegistry, read_manifest
+from model_artifact import MODEL_ARTIFACT_FORMAT
+from prediction_engine import MODEL_PATH, SCALER_PATH
+
+# APP_RELOAD_INTERVAL=detik antar cek file (0 = hot reload mati)
+POLL_INTERVAL_S = float(os.environ.get("APP_RELOAD_INTERVAL", "2"))
+
+# Satu versi artefak yang sudah di-load & lolos validasi (immutable, di-swap utuh)
+Loaded = namedtuple("Loaded", "version value signature loaded_at")
+ModelBundle = namedtuple("ModelBundle", "registry engine price_grid")
+
+PROBE_SPEC = (15.6, 2.5, 8, 2.0, 0, 256, 1920, 1080, 1, 500, "Dell")
+
+
+def file_signature(paths):
+    """(mtime_ns, size) per path, None for a missing file; cheap enough per poll."""
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            signature.append(None)
+        else:
+            signature.append((st.st_mtime_ns, st.st_size))
+    return tuple(signature)
+
+
+def content_sha256(paths):
+    """One digest over the contents of ``paths`` (missing files included as such)."""
+    h = hashlib.sha256()
+    for path in paths:
+        h.update(os.path.basename(path).encode())
+        try:
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    h.update(block)
+        except FileNotFoundError:
+            h.update(b"\0missing")
+    return h.hexdigest()
+
+
+# ===============================
+# WATCHER
+# ===============================
+class ArtifactWatcher:
+    """One hot-reloadable artifact: a set of files plus the loader that
+    turns them into a value. ``paths`` is a list, or a callable returning
+    one when the file set itself is described by an artifact (a manifest).
+    ``digest(paths)`` names a version; it is what :attr:`version` returns.
+
+    :meth:`check` is cheap when nothing changed (one ``stat`` per file).
+    When the mtime/size signature moves, the content hash decides whether
+    this is really a new version (a ``touch`` or an identical re-copy is
+    not). A new version is loaded and validated on the calling thread,
+    normally the background poller, and then swapped in as one
+    :class:`Loaded` reference. Readers take :attr:`current` once and keep
+    using that object, so a rerun that started on the old version finishes
+    on it. A version that fails to load or validate is rejected and the
+    old one stays until the files change again.
+    """
+
+    def __init__(self, name, paths, loader, validate=None, digest=content_sha256):
+        self.name = name
+        self._paths = paths
+        self.loader = loader
+        self.validate = validate
+        self.digest = digest
+        self._current = None
+        self._rejected = None
+        self._lock = threading.Lock()   # satu reload sekaligus
+        self._listeners = []
+        self.reloads = 0
+        self.touches = 0
+        self.failures = 0
+        self.last_error = None
+
+    @property
+    def paths(self):
+        return list(self._paths() if callable(self._paths) else self._paths)
+
+    @property
+    def current(self):
+        if self._current is None:
+            self.check()
+            if self._current is None:
+                raise RuntimeError(f"{self.name}: no valid version loaded ({self.last_error})")
+        return self._current
+
+    @property
+    def version(self):
+        return self.current.version
+
+    def on_swap(self, callback):
+        """``callback(old, new)`` after every swap (old is None the first time)."""
+        self._listeners.append(callback)
+
+    def check(self):
+        """Poll once; returns True when a new version was swapped in."""
+        paths = self.paths
+        signature = file_signature(paths)
+        current = self._current
+        if (current is not None and signature == current.signature) or signature == self._rejected:
+            return False
+        with self._lock:
+            current = self._current
+            if current is not None and signature == current.signature:
+                return False
+            digest = self.digest(paths)
+            if file_signature(paths) != signature:
+                return False   # file masih ditulis; cek lagi di poll berikutnya
+            if current is not None and digest == current.version:
+                self._current = current._replace(signature=signature)
+                self.touches += 1
+                return False
+            try:
+                value = self.loader()
+                if self.validate is not None:
+                    self.validate(value)
+            except Exception as e:  # versi baru apa pun yang gagal tidak boleh menjatuhkan app
+                self._rejected = signature
+                self.failures += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                return False
+            new = Loaded(digest, value, signature, time.time())
+            self._current = new   # swap atomik: satu assignment referensi
+            self._rejected = None
+            self.last_error = None
+            self.reloads += 1
+        for callback in self._listeners:
+            callback(current, new)
+        return True
+
+    def stats(self):
+        current = self._current
+        return {
+            "artifact": self.name,
+            "version": current.version[:12] if current else None,
+            "loaded_at": current.loaded_at if current else None,
+            "reloads": self.reloads,
+            "touches": self.touches,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+def start_watching(watchers, interval=POLL_INTERVAL_S):
+    """Daemon thread that calls :meth:`ArtifactWatcher.check` on every
+    watcher each ``interval`` seconds; returns the stop Event (None when
+    ``interval`` is 0, i.e. hot reload disabled)."""
+    if interval <= 0:
+        return None
+    stop = threading.Event()
+
+    def poll():
+        while not stop.wait(interval):
+            for watcher in watchers:
+                watcher.check()
+
+    threading.Thread(target=poll, name="artifact-watcher", daemon=True).start()
+    return stop
+
+
+# ===============================
+# APP ARTIFACTS
+# ===============================
+def validate_dataset(df, schema=SCHEMA):
+    missing = [c for c in schema.feature_columns + [schema.target] if c not in df.columns]
+    if missing:
+        raise ValueError(f"dataset is missing columns {missing}")
+    if not len(df):
+        raise ValueError("dataset is empty")
+    values = df[schema.feature_columns + [schema.target]]
+    if not all(np.issubdtype(dtype, np.number) for dtype in values.dtypes):
+        raise ValueError("dataset feature columns must be numeric")
+    if not np.isfinite(values.to_numpy(dtype=np.float64)).all():
+        raise ValueError("dataset has missing or non-finite values")
+
+
+def validate_model(bundle, schema=SCHEMA):
+    """The default engine is consistent with its own schema (brands are
+    data-driven, a retrained model may add one) and takes the form's
+    numeric inputs in ``schema.numeric`` order."""
+    engine = bundle.engine
+    own = engine.schema
+    if own.numeric != schema.numeric:
+        raise ValueError(f"model numeric features {own.numeric} do not match the form inputs")
+    if len(engine.numeric_weights) != len(own.numeric) or len(engine.brand_offsets) != len(own.categories):
+        raise ValueError("model weights do not match its own feature layout")
+    params = np.concatenate([engine.numeric_weights, engine.brand_offsets, [engine.intercept]])
+    if not np.isfinite(params).all():
+        raise ValueError("model has non-finite parameters")
+    if not np.isfinite(engine.predict(*PROBE_SPEC)):
+        raise ValueError("model returns a non-finite price")
+
+
+def load_model_bundle():
+    from model_artifact import artifact_source_sha256
+    from price_grid import artifact_sha256, open_grid_if_current
+
+    registry = ModelRegistry.from_manifest()
+    engine = registry.get(DEFAULT_KEY)
+    # Grid dikunci ke hash .pkl sumber model; untuk artefak JSON dibaca dari hash
+    # yang dicatat di artefak, jadi .pkl tidak wajib ada
+    if MODEL_ARTIFACT_FORMAT == "pickle":
+        source = artifact_sha256(MODEL_PATH, SCALER_PATH)
+    else:
+        source = artifact_source_sha256()
+    grid = open_grid_if_current(source) if source else None
+    return ModelBundle(registry, engine, grid)
+
+
+def load_frozen_dataset():
+    from dataset_store import STORE_DIR, freeze_frame, load_dataset
+
+    return freeze_frame(load_dataset(DATA_PATH, STORE_DIR))
+
+
+def model_paths():
+    """Every file :func:`load_model_bundle` reads: the built-in model, the
+    price grid, the registry manifest and the files of each entry in it."""
+    from price_grid import GRID_META_PATH, GRID_PATH
+
+    paths = BUILTIN_ENTRY["files"] + [GRID_PATH, GRID_META_PATH, MANIFEST_PATH]
+    try:
+        entries = read_manifest(MANIFEST_PATH)["models"]
+    except (OSError, ValueError):
+        entries = []   # manifest rusak: loader yang akan menolak versi ini
+    for entry in entries:
+        paths.extend(f for f in entry.get("files", []) if f not in paths)
+    return paths
+
+
+def model_watcher():
+    return ArtifactWatcher("model", model_paths, load_model_bundle, validate_model)
+
+
+def dataset_watcher():
+    # Versi = SHA-256 file CSV, format yang sama dengan yang dicatat oleh
+    # stats/comparables/intervals, supaya snapshot bisa diteruskan ke builder
+    return ArtifactWatcher("dataset", [DATA_PATH], load_frozen_dataset, validate_dataset,
+                           digest=lambda paths: file_sha256(paths[0]))
+
+
+# ===============================
+# CLI
+# ===============================
+def _redeploy_bench(swaps, readers):
+    """Replace the model pickles and their JSON export ``swaps`` times
+    (atomic rename, like a deploy) while ``readers`` threads keep predicting; reports swap latency
+    and the slowest reader call. Runs in a scratch copy of the artifacts."""
+    import shutil
+    import tempfile
+
+    import joblib
+
+    from model_artifact import ARTIFACT_PATH, export_from_pickles
+
+    work = tempfile.mkdtemp(prefix="hot-reload-")
+    for path in (MODEL_PATH, SCALER_PATH, ARTIFACT_PATH):
+        shutil.copy(path, work)
+    cwd = os.getcwd()
+    os.chdir(work)
+    try:
+        watcher = model_watcher()
+        first = watcher.current
+        model = joblib.load(MODEL_PATH)
+        stop, worst, calls, errors = threading.Event(), [0.0], [0], []
+
+        def reader():
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    watcher.current.value.engine.predict(*PROBE_SPEC)
+                except Exception as e:
+                    errors.append(e)
+                worst[0] = max(worst[0], time.perf_counter() - start)
+                calls[0] += 1
+
+        threads = [threading.Thread(target=reader) for _ in range(readers)]
+        for t in threads:
+            t.start()
+        swap_ms, prices = [], {first.version: first.value.engine.predict(*PROBE_SPEC)}
+        for i in range(swaps):
+            model.intercept_ = model.intercept_ + 1.0
+            joblib.dump(model, "model.tmp")
+            os.replace("model.tmp", MODEL_PATH)
+            export_from_pickles()
+            start = time.perf_counter()
+            watcher.check()
+            swap_ms.append((time.perf_counter() - start) * 1000)
+            prices[watcher.version] = watcher.current.value.engine.predict(*PROBE_SPEC)
+        os.utime(MODEL_PATH)          # touch: hash sama, tidak reload
+        watcher.check()
+        with open(MODEL_PATH, "wb") as f:
+            f.write(b"not a pickle")  # deploy rusak: ditolak, versi lama tetap
+        watcher.check()
+        stop.set()
+        for t in threads:
+            t.join()
+        return {
+            "swaps": watcher.reloads - 1,
+            "touches": watcher.touches,
+            "rejected": watcher.failures,
+            "served_after_bad_deploy": watcher.current.value.engine.predict(*PROBE_SPEC),
+            "swap_ms_median": float(np.median(swap_ms)),
+            "reader_calls": calls[0],
+            "reader_errors": len(errors),
+            "reader_worst_ms": worst[0] * 1000,
+            "price_steps": np.diff(list(prices.values())).round(6).tolist(),
+        }
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hot reload of model and dataset artifacts")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("status", help="current versions of the watched artifacts")
+    bench = sub.add_parser("bench", help="redeploy the model repeatedly under concurrent readers")
+    bench.add_argument("--swaps", type=int, default=10)
+    bench.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    if args.command == "status":
+        for watcher in (model_watcher(), dataset_watcher()):
+            watcher.current
+            row = watcher.stats()
+            print(f"{row['artifact']:<8} {row['version']}  {', '.join(watcher.paths)}")
+        return
+    for key, value in _redeploy_bench(args.swaps, args.readers).items():
+        print(f"{key:<24} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from feature_schema import REFERENCE_COMPANY
+from model_artifact import ARTIFACT_PATH, load_engine
+from prediction_engine import EUR_TO_IDR, MODEL_PATH, SCALER_PATH
+
+DEFAULT_CHUNKSIZE = 50_000
+
+PRICE_EUR_COL = "Predicted Price (Euro)"
+PRICE_IDR_COL = "Predicted Price (IDR)"
+LOWER_EUR_COL = "Price Lower (Euro)"
+UPPER_EUR_COL = "Price Upper (Euro)"
+
+
+# ===============================
+# CHUNK ENCODING
+# ===============================
+def _reject(mask, first_row, what):
+    bad = np.flatnonzero(mask)
+    if len(bad):
+        rows = ", ".join(str(first_row + i) for i in bad[:5])
+        more = ", ..." if len(bad) > 5 else ""
+        raise ValueError(f"{len(bad):,} row(s) with {what} (row {rows}{more})")
+
+
+def encode_chunk(chunk, engine, first_row=1):
+    """Return ``(X_numeric, brand_idx)`` for one CSV chunk.
+
+    The brand comes either from the ``Company_*`` one-hot columns used in
+    ``data_final1_TEKREK.csv`` or from a raw ``Company`` column with brand
+    names. Encoding follows ``engine.schema``.
+
+    Rows that cannot be priced raise ``ValueError`` naming their data row
+    numbers (``first_row`` is the number of the chunk's first row):
+    missing or non-finite feature values, and brand names the schema does
+    not know. Only the reference brand maps to index -1; a misspelled
+    brand is not silently priced as it.
+    """
+    schema = engine.schema
+    X_numeric, brand_idx = schema.encode(chunk)
+    _reject(~np.isfinite(X_numeric).all(axis=1), first_row, "missing or non-finite feature values")
+    if not schema.has_onehot(chunk):
+        names = chunk[schema.categorical].astype(str).str.strip().to_numpy()
+        unknown = (brand_idx < 0) & (names != REFERENCE_COMPANY)
+        examples = ", ".join(sorted(set(names[unknown][:5])))
+        _reject(unknown, first_row, f"unknown {schema.categorical} ({examples})")
+    return X_numeric, brand_idx
+
+
+def predict_chunks(engine, source, chunksize=DEFAULT_CHUNKSIZE, intervals=None):
+    """Yield input chunks with EUR and IDR prediction columns appended
+    (plus the lower/upper interval bounds when ``intervals`` is given).
+
+    Only one chunk is held in memory at a time. A chunk with rows that
+    cannot be priced raises ``ValueError`` (see :func:`encode_chunk`). An
+    empty file yields no chunks.
+    """
+    try:
+        reader = pd.read_csv(source, chunksize=chunksize)
+    except pd.errors.EmptyDataError:
+        return
+    first_row = 1
+    for chunk in reader:
+        if "Unnamed: 0" in chunk.columns:
+            chunk = chunk.drop(columns=["Unnamed: 0"])
+        X_numeric, brand_idx = encode_chunk(chunk, engine, first_row)
+        first_row += len(chunk)
+        price = engine.predict_batch(X_numeric, brand_idx)
+        chunk[PRICE_EUR_COL] = price
+        chunk[PRICE_IDR_COL] = price * EUR_TO_IDR
+        if intervals is not None:
+            chunk[LOWER_EUR_COL], chunk[UPPER_EUR_COL] = intervals.interval_batch(
+                X_numeric, brand_idx)
+        yield chunk
+
+
+def output_columns(schema, intervals=None):
+    """Header of the output for an input with a raw categorical column."""
+    columns = schema.numeric + [schema.categorical, PRICE_EUR_COL, PRICE_IDR_COL]
+    if intervals is not None:
+        columns += [LOWER_EUR_COL, UPPER_EUR_COL]
+    return columns
+
+
+def predict_csv(engine, source, dest, chunksize=DEFAULT_CHUNKSIZE, progress=None,
+                intervals=None):
+    """Stream ``source`` through the engine into ``dest`` (path or file object).
+
+    Returns ``{"rows", "seconds", "rows_per_sec"}``. ``progress`` is called
+    with the running row count after each chunk. The header is always
+    written, also for an empty input.
+    """
+    rows = 0
+    chunks = 0
+    start = time.perf_counter()
+    for chunk in predict_chunks(engine, source, chunksize, intervals):
+        chunk.to_csv(dest, index=False, header=(chunks == 0), mode="w" if chunks == 0 else "a")
+        chunks += 1
+        rows += len(chunk)
+        if progress is not None:
+            progress(rows)
+    if chunks == 0:
+        pd.DataFrame(columns=output_columns(engine.schema, intervals)).to_csv(dest, index=False)
+    seconds = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_sec": rows / seconds if seconds > 0 else float("inf"),
+    }
+
+
+# ===============================
+# CLI
+# ===============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch laptop price prediction from CSV")
+    parser.add_argument("input", help="CSV with the data_final1_TEKREK.csv feature columns")
+    parser.add_argument("-o", "--output", default="-", help="output CSV (default: stdout)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--scaler", default=SCALER_PATH)
+    parser.add_argument("--artifact", default=ARTIFACT_PATH)
+    parser.add_argument("--no-interval", action="store_true",
+                        help="skip the bootstrap lower/upper price columns "
+                             "(always skipped for a non-default model)")
+    args = parser.parse_args(argv)
+
+    engine = load_engine(args.model, args.scaler, args.artifact)
+    # Replika bootstrap dari model default; untuk model lain interval tidak cocok
+    default_model = (args.model, args.scaler, args.artifact) == (MODEL_PATH, SCALER_PATH, ARTIFACT_PATH)
+    intervals = None
+    if not args.no_interval and not default_model:
+        print("interval columns skipped: the bootstrap belongs to the default model",
+              file=sys.stderr)
+    elif not args.no_interval:
+        from dataset_store import load_dataset
+        from prediction_intervals import load_or_build_intervals
+
+        intervals = load_or_build_intervals(load_dataset(), schema=engine.schema)
+    dest = sys.stdout if args.output == "-" else args.output
+    try:
+        stats = predict_csv(engine, args.input, dest, args.chunksize, intervals=intervals)
+    except ValueError as e:
+        print(f"{args.input}: {e}", file=sys.stderr)
+        raise SystemExit(1)
+    print(
+        f"{stats['rows']:,} rows in {stats['seconds']:.2f}s "
+        f"({stats['rows_per_sec']:,.0f} rows/sec)",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
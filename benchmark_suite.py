@@ -0,0 +1,245 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+PAGES = ["🏠 Dashboard", "📊 Analisis", "🔮 Prediksi"]
+RESULTS_PATH = "benchmark_results.json"
+
+
+def _summary(seconds):
+    ms = np.asarray(seconds) * 1000
+    return {
+        "n": int(len(ms)),
+        "median_ms": float(np.median(ms)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "min_ms": float(ms.min()),
+    }
+
+
+def _timeit(fn, repeats, warmup=0):
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+# ===============================
+# APP (AppTest)
+# ===============================
+def _app(app_path):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(app_path, default_timeout=120)
+    at.run()
+    return at
+
+
+def _check(at, what):
+    if at.exception:
+        raise RuntimeError(f"{what}: app raised {at.exception[0].message}")
+
+
+def bench_app(app_path="app.py", repeats=10):
+    results = {}
+    start = time.perf_counter()
+    at = _app(app_path)
+    results["first_run_ms"] = (time.perf_counter() - start) * 1000
+    _check(at, "first run")
+
+    results["page_rerun"] = {}
+    for page in PAGES:
+        at.sidebar.radio(key="page").set_value(page).run()
+        _check(at, page)
+        results["page_rerun"][page] = _summary(_timeit(at.run, repeats))
+
+    # Tombol prediksi: spec berbeda tiap kali (cache miss) dan spec sama (cache hit)
+    at.sidebar.radio(key="page").set_value("🔮 Prediksi").run()
+    cpu_values = np.round(np.linspace(1.0, 3.5, repeats), 1)
+    miss = []
+    for cpu in cpu_values:
+        at.slider(key="cpu").set_value(float(cpu)).run()
+        at.button(key="predict").click()
+        start = time.perf_counter()
+        at.run()
+        miss.append(time.perf_counter() - start)
+        _check(at, "prediction")
+    hit = []
+    for _ in range(repeats):
+        at.button(key="predict").click()
+        start = time.perf_counter()
+        at.run()
+        hit.append(time.perf_counter() - start)
+    results["prediction_button"] = {"new_spec": _summary(miss), "repeated_spec": _summary(hit)}
+
+    # Filter halaman Analisis: rentang harga baru tiap kali, lalu bolak-balik dua state
+    at.sidebar.radio(key="page").set_value("📊 Analisis").run()
+    lows = np.linspace(200, 1200, repeats)
+    new_state = []
+    for lo in lows:
+        at.slider(key="price_range").set_value((float(round(lo, -2)), 2500.0))
+        start = time.perf_counter()
+        at.run()
+        new_state.append(time.perf_counter() - start)
+        _check(at, "filter change")
+    toggle = []
+    for i in range(repeats):
+        at.multiselect(key="ram_filter").set_value([4, 8] if i % 2 else [8])
+        start = time.perf_counter()
+        at.run()
+        toggle.append(time.perf_counter() - start)
+    results["analysis_filter_change"] = {"new_price_range": _summary(new_state),
+                                         "ram_filter_toggle": _summary(toggle)}
+    return results
+
+
+# ===============================
+# MICRO-BENCHMARKS
+# ===============================
+def bench_micro(repeats=20):
+    import pandas as pd
+
+    from dataset_stats import DATA_PATH
+    from dataset_store import load_dataset
+    from model_artifact import load_engine
+
+    results = {}
+    results["load_data_columnar"] = _summary(_timeit(load_dataset, repeats, warmup=1))
+    results["load_data_csv"] = _summary(_timeit(
+        lambda: pd.read_csv(DATA_PATH).drop(columns=["Unnamed: 0"]), repeats, warmup=1))
+    # Panggilan pertama .pkl ikut meng-import sklearn; dicatat terpisah
+    results["load_model_pickle_first_ms"] = _timeit(lambda: load_engine(prefer="pickle"), 1)[0] * 1000
+    results["load_model_pickle"] = _summary(_timeit(lambda: load_engine(prefer="pickle"), repeats))
+    results["load_model_json"] = _summary(_timeit(lambda: load_engine(prefer="json"), repeats, warmup=1))
+
+    engine = load_engine()
+    spec = (15.6, 2.5, 8, 2.0, 0, 256, 1920, 1080, 1, 0, "Dell")
+    n = 10_000
+    single = _timeit(lambda: [engine.predict(*spec) for _ in range(n)], 3)
+    results["predict_single_us"] = float(np.median(single) / n * 1e6)
+
+    df = load_dataset()
+    X, codes = engine.schema.encode(df)
+    X, codes = np.tile(X, (100, 1)), np.tile(codes, 100)
+    batch = _timeit(lambda: engine.predict_batch(X, codes), 5)
+    results["predict_batch_rows_per_sec"] = float(len(X) / np.median(batch))
+    return results
+
+
+# ===============================
+# RUN / COMPARE
+# ===============================
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def memory_pass(app_path="app.py"):
+    """Peak traced Python allocation over one visit of every page, a
+    prediction and a filter change, starting from empty Streamlit caches
+    (separate pass: tracing slows reruns)."""
+    import streamlit as st
+
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    tracemalloc.start()
+    try:
+        at = _app(app_path)
+        for page in PAGES:
+            at.sidebar.radio(key="page").set_value(page).run()
+        at.sidebar.radio(key="page").set_value("🔮 Prediksi").run()
+        at.button(key="predict").click().run()
+        at.sidebar.radio(key="page").set_value("📊 Analisis").run()
+        at.slider(key="price_range").set_value((500.0, 1500.0)).run()
+        _check(at, "memory pass")
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def run(app_path="app.py", repeats=10, micro_repeats=20):
+    app = bench_app(app_path, repeats)
+    micro = bench_micro(micro_repeats)
+    traced_peak_mb = memory_pass(app_path)
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeats": repeats,
+        },
+        "app": app,
+        "micro": micro,
+        "memory": {
+            "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            "peak_traced_python_mb": traced_peak_mb,
+        },
+    }
+
+
+def _flatten(d, prefix=""):
+    out = {}
+    for k, v in d.items():
+        key = f"{prefix}{k}"
+        if isinstance(v, dict):
+            out.update(_flatten(v, key + "."))
+        elif isinstance(v, (int, float)) and not isinstance(v, bool):
+            out[key] = v
+    return out
+
+
+def compare(old, new):
+    """Rows of (metric, old, new, ratio) for the metrics both runs have."""
+    a, b = _flatten(old), _flatten(new)
+    return [(k, a[k], b[k], b[k] / a[k] if a[k] else float("nan"))
+            for k in a if k in b
+            and not k.startswith("meta.") and not k.endswith((".n", ".min_ms"))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="app.py benchmark suite (JSON output)")
+    parser.add_argument("--app", default="app.py")
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--micro-repeats", type=int, default=20)
+    parser.add_argument("-o", "--output", default=RESULTS_PATH)
+    parser.add_argument("--compare", metavar="OLD_JSON",
+                        help="print new/old ratios against an earlier run")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(args.app)))
+    results = run(args.app, args.repeats, args.micro_repeats)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+    for key, value in _flatten(results).items():
+        if not key.endswith((".n", ".min_ms", ".p95_ms", ".repeats")):
+            print(f"{key:<60} {value:>12.3f}")
+    print(f"-> {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        print(f"\n{'metric':<60} {'old':>10} {'new':>10} {'new/old':>8}")
+        for key, a, b, ratio in compare(old, results):
+            print(f"{key:<60} {a:>10.2f} {b:>10.2f} {ratio:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+PRICE_COL = "Price (Euro)"
+
+# Di atas batas ini scatter memakai stratified sample (bisa diubah lewat env)
+SCATTER_MAX_POINTS = int(os.environ.get("SCATTER_MAX_POINTS", 5000))
+SAMPLE_STRATA = 20
+
+# Kolom yang benar-benar dipakai tiap chart di halaman Analisis (x, y, tooltip)
+SCATTER_COLUMNS = {
+    "ram": ["RAM (GB)", PRICE_COL, "CPU_Frequency (GHz)", "SSD"],
+    "cpu": ["CPU_Frequency (GHz)", PRICE_COL, "RAM (GB)", "SSD"],
+    "weight": ["Weight (kg)", PRICE_COL, "Inches", "RAM (GB)"],
+}
+
+
+# ===============================
+# SCATTER DATA
+# ===============================
+def stratified_sample(values, max_points, strata=SAMPLE_STRATA, seed=0):
+    """Row positions of a bounded sample stratified on ``values``.
+
+    Rows are split into quantile strata of the x value and every stratum
+    keeps its share of ``max_points`` (at least one row), so sparse
+    regions of the axis stay visible.
+    """
+    n = len(values)
+    if n <= max_points:
+        return np.arange(n)
+    edges = np.unique(np.quantile(values, np.linspace(0, 1, strata + 1)[1:-1]))
+    stratum = np.searchsorted(edges, values, side="right")
+    counts = np.bincount(stratum)
+    quota = np.maximum(1, np.floor(counts * (max_points / n))).astype(np.int64)
+
+    rng = np.random.default_rng(seed)
+    order = np.lexsort((rng.random(n), stratum))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    rank = np.arange(n) - starts[stratum[order]]
+    keep = order[rank < quota[stratum[order]]]
+    return np.sort(keep)
+
+
+def scatter_data(df, chart, max_points=SCATTER_MAX_POINTS):
+    """Only the columns ``chart`` encodes, sampled above ``max_points`` rows."""
+    cols = SCATTER_COLUMNS[chart]
+    data = df[cols]
+    if len(data) > max_points:
+        rows = stratified_sample(data[cols[0]].to_numpy(), max_points)
+        data = data.iloc[rows]
+    return data.reset_index(drop=True)
+
+
+def ips_bar_data(df):
+    """Average price per IPS_Panel value (server-side, two rows)."""
+    return (
+        df.groupby("IPS_Panel", sort=True)[PRICE_COL]
+        .mean()
+        .rename("Average Price")
+        .reset_index()
+    )
+
+
+# ===============================
+# PAYLOAD MEASUREMENT
+# ===============================
+def payload_bytes(chart):
+    """Size of the Vega-Lite spec (with inline data) sent for ``chart``."""
+    import altair as alt
+
+    with alt.data_transformers.disable_max_rows():
+        return len(json.dumps(chart.to_dict()))
+
+
+def _charts(ram, cpu, ips, weight, aggregated):
+    import altair as alt
+
+    if aggregated:
+        y_ips, tip_ips = alt.Y('Average Price:Q'), ['IPS_Panel', 'Average Price']
+    else:
+        y_ips, tip_ips = alt.Y('mean(Price (Euro)):Q'), ['IPS_Panel', 'mean(Price (Euro))']
+    return [
+        alt.Chart(ram).mark_circle().encode(
+            x='RAM (GB):Q', y='Price (Euro):Q',
+            tooltip=['RAM (GB)', 'Price (Euro)', 'CPU_Frequency (GHz)', 'SSD']),
+        alt.Chart(cpu).mark_circle().encode(
+            x='CPU_Frequency (GHz):Q', y='Price (Euro):Q',
+            tooltip=['CPU_Frequency (GHz)', 'Price (Euro)', 'RAM (GB)', 'SSD']),
+        alt.Chart(ips).mark_bar().encode(x='IPS_Panel:N', y=y_ips, tooltip=tip_ips),
+        alt.Chart(weight).mark_circle().encode(
+            x='Weight (kg):Q', y='Price (Euro):Q',
+            tooltip=['Weight (kg)', 'Price (Euro)', 'Inches', 'RAM (GB)']),
+    ]
+
+
+def compare_payload(df, max_points=SCATTER_MAX_POINTS):
+    """Payload bytes of the four Analysis charts: full frame vs aggregated."""
+    before = sum(payload_bytes(c) for c in _charts(df, df, df, df, aggregated=False))
+    after = sum(payload_bytes(c) for c in _charts(
+        scatter_data(df, "ram", max_points),
+        scatter_data(df, "cpu", max_points),
+        ips_bar_data(df),
+        scatter_data(df, "weight", max_points),
+        aggregated=True,
+    ))
+    return before, after
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analysis chart payload bytes per rerun")
+    parser.add_argument("--data", default="data_final1_TEKREK.csv")
+    parser.add_argument("--replicate", default="1,10,100",
+                        help="comma separated dataset replication factors")
+    parser.add_argument("--max-points", type=int, default=SCATTER_MAX_POINTS)
+    args = parser.parse_args(argv)
+
+    base = pd.read_csv(args.data).drop(columns=["Unnamed: 0"], errors="ignore")
+    print(f"{'rows':>9} {'before bytes':>14} {'after bytes':>13} {'ratio':>7}")
+    for k in (int(r) for r in args.replicate.split(",")):
+        df = pd.concat([base] * k, ignore_index=True)
+        before, after = compare_payload(df, args.max_points)
+        print(f"{len(df):>9,} {before:>14,} {after:>13,} {before / after:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
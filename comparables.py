@@ -0,0 +1,284 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from dataset_stats import DATA_PATH, file_sha256
+from feature_schema import SCHEMA
+from model_artifact import ARTIFACT_PATH, artifact_schema, read_artifact
+
+INDEX_PATH = "comparables_TEKREK.npz"
+INDEX_META_PATH = "comparables_TEKREK.json"
+INDEX_FORMAT_VERSION = 1
+
+BLOCK_ROWS = 1 << 16
+DEFAULT_K = 5
+# Kandidat ekstra dari tahap float32 sebelum re-ranking float64 (jarak yang hampir sama)
+CANDIDATE_SLACK = 16
+
+
+def scaler_sha256(mean, scale):
+    """Identity of the standardisation: changes when the fitted scaler does."""
+    values = np.concatenate([np.asarray(mean, np.float64), np.asarray(scale, np.float64)])
+    return hashlib.sha256(values.tobytes()).hexdigest()
+
+
+# ===============================
+# INDEX
+# ===============================
+class ComparableIndex:
+    """Exact k-nearest-neighbour search over the standardised dataset.
+
+    Distances are taken in the model's feature layout (numeric + one-hot
+    brand) after the fitted scaler. Within one brand the one-hot part of
+    ``|x - q|²`` is the same for every row, so rows are grouped by brand:
+    only the 10 numeric columns are stored (float32, sorted by brand) and
+    every group adds its constant brand offset. Groups are visited in
+    increasing offset order and the scan stops once the offset exceeds
+    the current k-th best distance, which usually leaves only the query's
+    own brand and a few neighbours. Inside a group the search is a blocked
+    matrix-vector product (``|x|² - 2x·q``) with an ``argpartition``; the
+    k survivors are re-ranked with exact float64 distances. (A KD-tree
+    does not help here: in 28 dimensions with one-hot columns it
+    degrades to visiting most leaves.)
+    """
+
+    def __init__(self, points, rows, group_starts, mean, scale, schema=SCHEMA,
+                 block_rows=BLOCK_ROWS):
+        self.points = points              # (n, numeric) standardised, urut per brand
+        self.rows = rows                  # posisi baris asli di dataset
+        self.group_starts = np.asarray(group_starts, dtype=np.int64)  # brand -1, 0, 1, ...
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.schema = schema
+        self.block_rows = block_rows
+        n_num = len(schema.numeric)
+        if points.shape[1] != n_num or len(self.mean) != len(schema.feature_columns):
+            raise ValueError("Index layout does not match the schema")
+        if len(self.group_starts) != len(schema.categories) + 2:
+            raise ValueError("Expected one group per brand plus the reference brand")
+        self.sq_norms = np.einsum("ij,ij->i", points, points, dtype=np.float32)
+        # Vektor one-hot ter-standardisasi per kode brand (-1 = brand referensi)
+        codes = np.arange(-1, len(schema.categories))
+        self._brand_vectors = ((schema.onehot(codes) - self.mean[n_num:]) / self.scale[n_num:])
+
+    def __len__(self):
+        return len(self.points)
+
+    @classmethod
+    def build(cls, df, mean, scale, schema=SCHEMA):
+        X_numeric, codes = schema.encode(df)
+        n_num = len(schema.numeric)
+        mean, scale = np.asarray(mean, np.float64), np.asarray(scale, np.float64)
+        order = np.argsort(codes, kind="stable")
+        points = ((X_numeric[order] - mean[:n_num]) / scale[:n_num]).astype(np.float32)
+        counts = np.bincount(codes + 1, minlength=len(schema.categories) + 1)
+        group_starts = np.concatenate([[0], np.cumsum(counts)])
+        return cls(points, order.astype(np.int64), group_starts, mean, scale, schema)
+
+    def query_point(self, spec):
+        """(standardised numeric vector, brand code) for a ``predict()``-style spec."""
+        n_num = len(self.schema.numeric)
+        x = np.asarray(spec[:n_num], dtype=np.float64)
+        return ((x - self.mean[:n_num]) / self.scale[:n_num]), self.schema.index(spec[-1])
+
+    def query(self, spec, k=DEFAULT_K):
+        """``(rows, distances)`` of the ``k`` dataset rows closest to ``spec``."""
+        q, code = self.query_point(spec)
+        return self.query_vector(q, code, k)
+
+    def query_vector(self, q, code, k=DEFAULT_K):
+        k = min(k, len(self.points))
+        m = min(k + CANDIDATE_SLACK, len(self.points))
+        q64 = np.asarray(q, dtype=np.float64)
+        q32 = q64.astype(np.float32)
+        diff = self._brand_vectors - self._brand_vectors[code + 1]
+        offsets = np.einsum("ij,ij->i", diff, diff)
+
+        best_pos = np.empty(0, dtype=np.int64)
+        best_d2 = np.empty(0, dtype=np.float64)
+        qq = float(q64 @ q64)
+        for g in np.argsort(offsets, kind="stable"):
+            if len(best_d2) == m and offsets[g] >= best_d2.max():
+                break  # semua brand berikutnya lebih jauh
+            lo, hi = self.group_starts[g], self.group_starts[g + 1]
+            for start in range(lo, hi, self.block_rows):
+                stop = min(start + self.block_rows, hi)
+                d2 = (self.sq_norms[start:stop] - 2 * (self.points[start:stop] @ q32)
+                      + (qq + offsets[g]))
+                top = np.argpartition(d2, m - 1)[:m] if stop - start > m else np.arange(stop - start)
+                best_pos = np.concatenate([best_pos, top + start])
+                best_d2 = np.concatenate([best_d2, d2[top]])
+                if len(best_d2) > m:
+                    keep = np.argpartition(best_d2, m - 1)[:m]
+                    best_pos, best_d2 = best_pos[keep], best_d2[keep]
+
+        # Jarak persis (float64) untuk m kandidat, ambil k terdekat
+        group = np.searchsorted(self.group_starts, best_pos, side="right") - 1
+        diff = np.asarray(self.points[best_pos], dtype=np.float64) - q64
+        dist = np.sqrt(np.einsum("ij,ij->i", diff, diff) + offsets[group])
+        rows = np.asarray(self.rows[best_pos])
+        order = np.lexsort((rows, dist))[:k]
+        return rows[order], dist[order]
+
+    # -------------------------------
+    # PERSISTENCE
+    # -------------------------------
+    def save(self, path=INDEX_PATH, meta_path=INDEX_META_PATH, dataset_sha256=None):
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp, points=np.ascontiguousarray(self.points, dtype=np.float32),
+                 rows=np.asarray(self.rows, dtype=np.int64))
+        os.replace(tmp, path)
+        meta = {
+            "format_version": INDEX_FORMAT_VERSION,
+            "n_rows": len(self),
+            "feature_names": self.schema.feature_columns,
+            "group_starts": self.group_starts.tolist(),
+            "mean": self.mean.tolist(),
+            "scale": self.scale.tolist(),
+            "scaler_sha256": scaler_sha256(self.mean, self.scale),
+            "dataset_sha256": dataset_sha256,
+        }
+        tmp = f"{meta_path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, meta_path)
+        return meta
+
+    @classmethod
+    def open(cls, path=INDEX_PATH, meta_path=INDEX_META_PATH, schema=SCHEMA):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get("format_version") != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported index format {meta.get('format_version')}")
+        if meta["feature_names"] != schema.feature_columns:
+            raise ValueError("Index feature layout does not match the schema")
+        with np.load(path) as arrays:
+            points, rows = arrays["points"], arrays["rows"]
+        if points.shape != (meta["n_rows"], len(schema.numeric)) or len(rows) != meta["n_rows"]:
+            raise ValueError("Index arrays do not match their metadata")
+        index = cls(points, rows, meta["group_starts"], meta["mean"], meta["scale"], schema)
+        return index, meta
+
+
+def _open_current(artifact, dataset_sha256, path, meta_path):
+    mean, scale = artifact["scaler"]["mean"], artifact["scaler"]["scale"]
+    if not (os.path.exists(path) and os.path.exists(meta_path)):
+        return None
+    try:
+        # Layout dari artefak model, bukan daftar brand hard-coded
+        index, meta = ComparableIndex.open(path, meta_path, artifact_schema(artifact))
+    except ValueError:
+        return None
+    if (meta.get("dataset_sha256") != dataset_sha256
+            or meta.get("scaler_sha256") != scaler_sha256(mean, scale)):
+        return None
+    return index
+
+
+def open_index_if_current(dataset_sha256, artifact_path=ARTIFACT_PATH,
+                          path=INDEX_PATH, meta_path=INDEX_META_PATH):
+    """Saved index if it was built from ``dataset_sha256`` with the scaler of
+    ``artifact_path``, else None. Never builds: serving reads what training
+    (or ``comparables.py build``) wrote."""
+    return _open_current(read_artifact(artifact_path), dataset_sha256, path, meta_path)
+
+
+def load_or_build_index(df, data_path=DATA_PATH, artifact_path=ARTIFACT_PATH,
+                        path=INDEX_PATH, meta_path=INDEX_META_PATH, dataset_sha256=None):
+    """Index for the current dataset and scaler (from the JSON model
+    artifact); read from disk when both match, otherwise rebuilt from
+    ``df`` and saved next to the model artifacts (offline tools only; the
+    app uses :func:`open_index_if_current`). ``dataset_sha256`` is the hash
+    of the CSV ``df`` was read from (default: hash ``data_path`` now)."""
+    artifact = read_artifact(artifact_path)
+    digest = dataset_sha256 or file_sha256(data_path)
+    index = _open_current(artifact, digest, path, meta_path)
+    if index is not None:
+        return index
+    mean, scale = artifact["scaler"]["mean"], artifact["scaler"]["scale"]
+    index = ComparableIndex.build(df, mean, scale, artifact_schema(artifact))
+    try:
+        index.save(path, meta_path, dataset_sha256=digest)
+    except OSError:
+        pass
+    return index
+
+
+# ===============================
+# CLI
+# ===============================
+def _synthetic_frame(df, n, seed=0):
+    """``n`` rows: the dataset repeated with small numeric jitter (no exact ties)."""
+    rng = np.random.default_rng(seed)
+    big = df.iloc[rng.integers(0, len(df), n)].reset_index(drop=True)
+    for col in SCHEMA.numeric:
+        values = big[col].to_numpy(dtype=np.float64)
+        big[col] = values + rng.normal(0, 0.02 * (values.std() or 1), n)
+    return big
+
+
+def _full_vectors(index, df):
+    X_numeric, codes = index.schema.encode(df)
+    X = np.hstack([X_numeric, index.schema.onehot(codes)])
+    return (X - index.mean) / index.scale
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Nearest-neighbour index of comparable laptops")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="(re)build the index for the current dataset + scaler")
+    bench = sub.add_parser("bench", help="build time and query latency by dataset size")
+    bench.add_argument("--sizes", default="1000,100000,1000000")
+    bench.add_argument("--k", type=int, default=DEFAULT_K)
+    bench.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    from dataset_store import load_dataset
+
+    df = load_dataset()
+    if args.command == "build":
+        index = load_or_build_index(df)
+        print(f"{len(index.points):,} rows x {index.points.shape[1]} features -> {INDEX_PATH}")
+        return
+
+    artifact = read_artifact()
+    mean, scale = artifact["scaler"]["mean"], artifact["scaler"]["scale"]
+    rng = np.random.default_rng(1)
+    specs = [tuple(r[:-1]) + (SCHEMA.name(r[-1]),)
+             for r in (list(x) + [c] for x, c in zip(*SCHEMA.encode(df)))]
+    print(f"{'rows':>10} {'build ms':>9} {'MB':>7} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'brute ms':>9} {'exact':>6}")
+    for n in (int(s) for s in args.sizes.split(",")):
+        big = _synthetic_frame(df, n)
+        start = time.perf_counter()
+        index = ComparableIndex.build(big, mean, scale)
+        build_ms = (time.perf_counter() - start) * 1000
+        queries = [specs[i] for i in rng.integers(0, len(specs), args.queries)]
+        lat = []
+        for _ in range(3):
+            for spec in queries:
+                start = time.perf_counter()
+                index.query(spec, args.k)
+                lat.append((time.perf_counter() - start) * 1000)
+
+        # Pembanding: jarak penuh float64 di 28 dimensi + sort, tanpa index
+        # (toleransi: titik index disimpan float32)
+        full = _full_vectors(index, big)
+        exact = True
+        start = time.perf_counter()
+        for spec in queries[:5]:
+            q_num, code = index.query_point(spec)
+            q = np.concatenate([q_num, index._brand_vectors[code + 1]])
+            expected = np.sort(np.linalg.norm(full - q, axis=1))[:args.k]
+            exact &= np.allclose(expected, index.query(spec, args.k)[1], rtol=1e-5)
+        brute_ms = (time.perf_counter() - start) * 1000 / 5
+        print(f"{n:>10,} {build_ms:>9.1f} {index.points.nbytes / 1e6:>7.1f} "
+              f"{np.median(lat):>8.3f} {np.percentile(lat, 95):>8.3f} {brute_ms:>9.1f} {str(exact):>6}")
+
+
+if __name__ == "__main__":
+    main()
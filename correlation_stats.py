@@ -0,0 +1,170 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+PRICE_COL = "Price (Euro)"
+PRICE_BIN_WIDTH = 100.0  # sama dengan step slider harga di halaman Analisis
+
+
+# ===============================
+# SUFFICIENT STATISTICS
+# ===============================
+class CorrelationStats:
+    """Pre-aggregated moments for the Analysis correlation heatmap.
+
+    Rows are bucketed by (RAM value, IPS value, price bin). Each bucket keeps
+    its row count, column sums and cross-product matrix XᵀX over the
+    numeric columns (centred on the global mean for numerical stability).
+    A filter state is answered by summing the buckets it fully covers; the
+    at most two price bins cut by the slider bounds are added from their
+    actual rows, which are contiguous in price order. The result is exact
+    and independent of the number of rows in the covered buckets.
+    """
+
+    def __init__(self, df, price_bin_width=PRICE_BIN_WIDTH):
+        self.columns = list(df.select_dtypes(include=[np.number]).columns)
+        X = df[self.columns].to_numpy(dtype=np.float64)
+        self.shift = X.mean(axis=0) if len(X) else np.zeros(len(self.columns))
+        self.X = X - self.shift
+
+        price = df[PRICE_COL].to_numpy(dtype=np.float64)
+        self.price_order = np.argsort(price, kind="stable")
+        self.sorted_price = price[self.price_order]
+
+        self.ram_values = np.unique(df["RAM (GB)"].to_numpy())
+        self.ips_values = np.unique(df["IPS_Panel"].to_numpy())
+        self.ram_code = np.searchsorted(self.ram_values, df["RAM (GB)"].to_numpy())
+        self.ips_code = np.searchsorted(self.ips_values, df["IPS_Panel"].to_numpy())
+
+        p0 = price.min() if len(price) else 0.0
+        n_bins = int((price.max() - p0) // price_bin_width) + 1 if len(price) else 1
+        self.bin_edges = p0 + price_bin_width * np.arange(n_bins + 1)
+        bin_code = np.minimum(((price - p0) // price_bin_width).astype(np.intp), n_bins - 1)
+
+        shape = (len(self.ram_values), len(self.ips_values), n_bins)
+        p = len(self.columns)
+        self.count = np.zeros(shape, dtype=np.int64)
+        self.sums = np.zeros(shape + (p,))
+        self.xtx = np.zeros(shape + (p, p))
+
+        bucket = np.ravel_multi_index((self.ram_code, self.ips_code, bin_code), shape)
+        order = np.argsort(bucket, kind="stable")
+        ids, starts = np.unique(bucket[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+        count, sums, xtx = (a.reshape((-1,) + a.shape[3:]) for a in (self.count, self.sums, self.xtx))
+        for b, s, e in zip(ids, starts, ends):
+            Xb = self.X[order[s:e]]
+            count[b] = e - s
+            sums[b] = Xb.sum(axis=0)
+            xtx[b] = Xb.T @ Xb
+
+    @staticmethod
+    def _codes(values, selected):
+        selected = np.asarray(list(selected))
+        return np.flatnonzero(np.isin(values, selected))
+
+    def moments(self, min_price, max_price, ram_filter, ips_filter):
+        """(n, Σx, ΣxxT) of the rows matching the filter state."""
+        p = len(self.columns)
+        ram_sel = self._codes(self.ram_values, ram_filter)
+        ips_sel = self._codes(self.ips_values, ips_filter)
+        n, s, xtx = 0, np.zeros(p), np.zeros((p, p))
+        if not len(ram_sel) or not len(ips_sel) or min_price > max_price:
+            return n, s, xtx
+
+        lo_edges, hi_edges = self.bin_edges[:-1], self.bin_edges[1:]
+        inside = (lo_edges >= min_price) & (hi_edges <= max_price)
+        full_bins = np.flatnonzero(inside)
+        if len(full_bins):
+            idx = np.ix_(ram_sel, ips_sel, full_bins)
+            n += int(self.count[idx].sum())
+            s += self.sums[idx].sum(axis=(0, 1, 2))
+            xtx += self.xtx[idx].sum(axis=(0, 1, 2))
+
+        # Bin yang terpotong slider: ambil baris aslinya (berurutan di price order)
+        if len(full_bins):
+            ranges = [
+                (min_price, lo_edges[full_bins[0]], "left"),
+                (hi_edges[full_bins[-1]], max_price, "right"),
+            ]
+        else:
+            ranges = [(min_price, max_price, "right")]
+        for lo, hi, hi_side in ranges:
+            a = np.searchsorted(self.sorted_price, lo, side="left")
+            b = np.searchsorted(self.sorted_price, hi, side=hi_side)
+            if b <= a:
+                continue
+            rows = self.price_order[a:b]
+            keep = np.isin(self.ram_code[rows], ram_sel) & np.isin(self.ips_code[rows], ips_sel)
+            Xr = self.X[rows[keep]]
+            n += len(Xr)
+            s += Xr.sum(axis=0)
+            xtx += Xr.T @ Xr
+        return n, s, xtx
+
+    def corr(self, min_price, max_price, ram_filter, ips_filter):
+        """Pearson correlation matrix, same as ``filtered_df[numeric_cols].corr()``."""
+        n, s, xtx = self.moments(min_price, max_price, ram_filter, ips_filter)
+        p = len(self.columns)
+        if n < 2:
+            return pd.DataFrame(np.full((p, p), np.nan), index=self.columns, columns=self.columns)
+        mean = s / n
+        cov = xtx / n - np.outer(mean, mean)
+        var = np.diag(cov)
+        # Kolom konstan (mis. satu brand tidak muncul) -> NaN seperti pandas
+        constant = var <= 1e-12 * np.maximum(np.diag(xtx) / n, 1.0)
+        std = np.sqrt(np.where(constant, 1.0, var))
+        corr = np.clip(cov / np.outer(std, std), -1.0, 1.0)
+        np.fill_diagonal(corr, 1.0)
+        corr[constant, :] = np.nan
+        corr[:, constant] = np.nan
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+def melt_corr(corr_matrix):
+    """Long format used by the Altair heatmap (index / variable / value)."""
+    return corr_matrix.reset_index().melt('index')
+
+
+# ===============================
+# BENCHMARK
+# ===============================
+def main(argv=None):
+    from filter_index import synthetic_frame
+
+    parser = argparse.ArgumentParser(description="Benchmark heatmap correlation: .corr() vs moments")
+    parser.add_argument("--sizes", default="1275,100000,1000000")
+    parser.add_argument("--columns", type=int, default=29)
+    args = parser.parse_args(argv)
+
+    state = (500, 1500, [4, 8], [0, 1])
+    print(f"{'rows':>10} {'build ms':>9} {'.corr() ms':>11} {'moments ms':>11} {'max diff':>9}")
+    for n in (int(s) for s in args.sizes.split(",")):
+        df = synthetic_frame(n)
+        rng = np.random.default_rng(1)
+        for j in range(args.columns - df.shape[1]):
+            df[f"f{j}"] = rng.normal(size=n) + (df[PRICE_COL] / 1000 if j % 2 else 0)
+
+        start = time.perf_counter()
+        stats = CorrelationStats(df)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        filtered = df[
+            (df[PRICE_COL] >= state[0]) & (df[PRICE_COL] <= state[1]) &
+            df["RAM (GB)"].isin(state[2]) & df["IPS_Panel"].isin(state[3])
+        ]
+        ref = filtered[stats.columns].corr()
+        corr_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        ours = stats.corr(*state)
+        ours_ms = (time.perf_counter() - start) * 1000
+        diff = float(np.nanmax(np.abs(ours.to_numpy() - ref.to_numpy())))
+        print(f"{n:>10,} {build_ms:>9.1f} {corr_ms:>11.2f} {ours_ms:>11.2f} {diff:>9.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+DATA_PATH = "data_final1_TEKREK.csv"
+STATS_DIR = ".stats_cache"
+STATS_SCHEMA_VERSION = 2
+
+PRICE_COL = "Price (Euro)"
+HIST_BINS = 30
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+# ===============================
+# COMPUTE
+# ===============================
+def compute_stats(df):
+    """Everything the pages read from the full dataset, as plain JSON types."""
+    price = df[PRICE_COL].to_numpy(dtype=np.float64)
+    counts, edges = np.histogram(price, bins=HIST_BINS)
+    describe = df.describe()
+    return {
+        "n_rows": int(len(df)),
+        "n_cols": int(len(df.columns)),
+        "price_min": float(price.min()),
+        "price_max": float(price.max()),
+        "price_mean": float(price.mean()),
+        "ram_max": df["RAM (GB)"].max().item(),
+        "cpu_max": df["CPU_Frequency (GHz)"].max().item(),
+        "ram_values": sorted(v.item() for v in df["RAM (GB)"].unique()),
+        "price_hist": {
+            "counts": counts.tolist(),
+            "edges": edges.tolist(),
+        },
+        "describe": describe.to_dict(orient="split"),
+    }
+
+
+def describe_frame(stats):
+    """``df.describe()`` rebuilt from the stored stats."""
+    d = stats["describe"]
+    return pd.DataFrame(d["data"], index=d["index"], columns=d["columns"])
+
+
+def histogram_frame(stats):
+    """Price histogram as a frame with bin_start / bin_end / count."""
+    hist = stats["price_hist"]
+    return pd.DataFrame({
+        "bin_start": hist["edges"][:-1],
+        "bin_end": hist["edges"][1:],
+        "count": hist["counts"],
+    })
+
+
+# ===============================
+# PERSISTENT ARTIFACT
+# ===============================
+def stats_path(dataset_sha256, stats_dir=STATS_DIR):
+    return os.path.join(stats_dir, f"dataset_stats_v{STATS_SCHEMA_VERSION}_{dataset_sha256[:16]}.json")
+
+
+def load_or_build_stats(data_path=DATA_PATH, df=None, stats_dir=STATS_DIR, dataset_sha256=None):
+    """Stats for the current content of ``data_path``.
+
+    The artifact is keyed on the SHA-256 of the CSV, so it is computed once
+    per dataset version and read from disk on later cold starts. ``df`` may
+    be passed to avoid parsing the CSV again when building; pass the
+    ``dataset_sha256`` it was read from along with it, so a frame loaded
+    before the CSV changed is never saved under the new file's hash.
+    """
+    digest = dataset_sha256 or file_sha256(data_path)
+    path = stats_path(digest, stats_dir)
+    if os.path.exists(path):
+        with open(path) as f:
+            stats = json.load(f)
+        if stats.get("dataset_sha256") == digest:
+            return stats
+
+    if df is None:
+        df = pd.read_csv(data_path).drop(columns=["Unnamed: 0"], errors="ignore")
+    stats = compute_stats(df)
+    stats["schema_version"] = STATS_SCHEMA_VERSION
+    stats["dataset_sha256"] = digest
+
+    os.makedirs(stats_dir, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(stats, f)
+    os.replace(tmp, path)
+    return stats
@@ -0,0 +1,374 @@
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from feature_schema import SCHEMA
+
+DATA_PATH = "data_final1_TEKREK.csv"
+STORE_DIR = "data_final1_TEKREK.npcol"
+STORE_FORMAT_VERSION = 2
+
+logger = logging.getLogger(__name__)
+
+# Tipe data sempit per kolom (brand disimpan terpisah sebagai satu kolom kode).
+# Target harga tetap float64: nilai yang di-load harus sama persis dengan CSV
+COLUMN_DTYPES = {
+    "Inches": np.float32,
+    "CPU_Frequency (GHz)": np.float32,
+    "RAM (GB)": np.uint8,
+    "Weight (kg)": np.float32,
+    "Touchscreen": np.uint8,
+    "SSD": np.uint16,
+    "Res_Width": np.int16,
+    "Res_Height": np.int16,
+    "IPS_Panel": np.uint8,
+    "HDD": np.uint16,
+    "Price (Euro)": np.float64,
+}
+BRAND_COLUMN = SCHEMA.categorical
+
+
+def _file_name(column):
+    return "".join(c if c.isalnum() else "_" for c in column) + ".npy"
+
+
+def _file_sha256(path):
+    from dataset_stats import file_sha256
+    return file_sha256(path)
+
+
+# ===============================
+# CONVERT
+# ===============================
+def _save_atomic(path, array):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp, path)
+
+
+def convert_csv(csv_path=DATA_PATH, store_dir=STORE_DIR):
+    """Write ``csv_path`` as one narrow-dtype ``.npy`` file per column.
+
+    The 18 ``Company_*`` one-hot columns become a single int8 code column
+    (index into the schema brands, -1 for none). Every file is replaced
+    atomically: sessions still memory-mapping the previous version keep
+    reading the old inode instead of a truncated file.
+    """
+    source_sha256 = _file_sha256(csv_path)
+    df = pd.read_csv(csv_path).drop(columns=["Unnamed: 0"], errors="ignore")
+    os.makedirs(store_dir, exist_ok=True)
+
+    columns = []
+    for col in df.columns:
+        if col in SCHEMA.onehot_columns:
+            continue
+        dtype = COLUMN_DTYPES.get(col)
+        if dtype is None:
+            raise ValueError(f"No storage dtype defined for column {col!r}")
+        values = df[col].to_numpy()
+        narrow = values.astype(dtype)
+        if np.issubdtype(dtype, np.integer) and not np.array_equal(narrow, values):
+            raise ValueError(f"Column {col!r} does not fit in {np.dtype(dtype).name}")
+        _save_atomic(os.path.join(store_dir, _file_name(col)), narrow)
+        columns.append({"name": col, "file": _file_name(col), "dtype": np.dtype(dtype).name})
+
+    codes = SCHEMA.codes_from_onehot(df).astype(np.int8)
+    _save_atomic(os.path.join(store_dir, _file_name(BRAND_COLUMN)), codes)
+
+    meta = {
+        "format_version": STORE_FORMAT_VERSION,
+        "n_rows": int(len(df)),
+        "column_order": list(df.columns),
+        "columns": columns,
+        "brand": {
+            "file": _file_name(BRAND_COLUMN),
+            "categories": SCHEMA.categories,
+            "onehot_columns": SCHEMA.onehot_columns,
+        },
+        "source_sha256": source_sha256,
+    }
+    tmp = os.path.join(store_dir, "meta.json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(meta, f, indent=1)
+    os.replace(tmp, os.path.join(store_dir, "meta.json"))
+    return meta
+
+
+# ===============================
+# LOAD
+# ===============================
+def read_meta(store_dir=STORE_DIR):
+    with open(os.path.join(store_dir, "meta.json")) as f:
+        meta = json.load(f)
+    if meta.get("format_version") != STORE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported store format {meta.get('format_version')}")
+    return meta
+
+
+def load_columns(store_dir=STORE_DIR, mmap=True):
+    """Column arrays (memory-mapped, read-only) plus the brand code array."""
+    meta = read_meta(store_dir)
+    mode = "r" if mmap else None
+    arrays = {
+        c["name"]: np.load(os.path.join(store_dir, c["file"]), mmap_mode=mode)
+        for c in meta["columns"]
+    }
+    brand = np.load(os.path.join(store_dir, meta["brand"]["file"]), mmap_mode=mode)
+    return meta, arrays, brand
+
+
+def load_frame(store_dir=STORE_DIR, expand_brands=True):
+    """DataFrame over the memory-mapped columns, in the original column order.
+
+    With ``expand_brands`` the ``Company_*`` columns are rebuilt as uint8
+    (what the pages and the model expect); otherwise a single categorical
+    ``Company`` column is returned.
+    """
+    meta, arrays, brand = load_columns(store_dir)
+    categories = meta["brand"]["categories"]
+    data = {}
+    for col in meta["column_order"]:
+        if col in arrays:
+            data[col] = arrays[col]
+        elif expand_brands:
+            code = categories.index(col[len(SCHEMA.categorical) + 1:])
+            onehot = (brand == code).view(np.uint8)
+            onehot.flags.writeable = False
+            data[col] = onehot
+    if not expand_brands:
+        data[BRAND_COLUMN] = pd.Categorical.from_codes(brand, categories=categories)
+    return pd.DataFrame(data, copy=False)
+
+
+def freeze_frame(df):
+    """``df`` rebuilt over write-protected views of its columns (no copy).
+
+    In-place writes (``df.loc[...] = ...``, ``df[col] *= 2``, writes into
+    ``.values``) then raise ``ValueError: assignment destination is
+    read-only`` instead of silently changing data other sessions share.
+    Columns from the memory-mapped store are read-only already.
+    """
+    data = {}
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if values.flags.writeable:
+            values = values.view()
+            values.flags.writeable = False
+        data[col] = values
+    return pd.DataFrame(data, index=df.index, copy=False)
+
+
+def store_is_current(csv_path=DATA_PATH, store_dir=STORE_DIR):
+    """True if the store exists and was converted from the current CSV."""
+    if not os.path.exists(os.path.join(store_dir, "meta.json")):
+        return False
+    if not os.path.exists(csv_path):
+        return True
+    try:
+        meta = read_meta(store_dir)
+    except ValueError:
+        return False   # format lama / meta rusak: dibangun ulang
+    return meta.get("source_sha256") == _file_sha256(csv_path)
+
+
+def load_dataset(csv_path=DATA_PATH, store_dir=STORE_DIR, convert=True):
+    """Columnar store when it matches the CSV, otherwise the CSV parse.
+
+    With ``convert`` a missing or stale store is (re)built first; if that
+    fails (e.g. read-only checkout, or a column that does not fit its
+    storage dtype) the reason is logged and the CSV is parsed as before.
+    """
+    if not store_is_current(csv_path, store_dir) and convert:
+        try:
+            convert_csv(csv_path, store_dir)
+        except (OSError, ValueError) as e:
+            logger.warning("Columnar store not rebuilt, reading %s instead: %s", csv_path, e)
+    if store_is_current(csv_path, store_dir):
+        return load_frame(store_dir)
+    df = pd.read_csv(csv_path)
+    return df.drop(columns=["Unnamed: 0"])
+
+
+# ===============================
+# BENCHMARK
+# ===============================
+def _rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def _bench_child(kind, csv_path, store_dir):
+    base = _rss_mb()
+    start = time.perf_counter()
+    if kind == "csv":
+        df = pd.read_csv(csv_path).drop(columns=["Unnamed: 0"])
+    else:
+        df = load_frame(store_dir)
+    load_s = time.perf_counter() - start
+    after_load = _rss_mb()
+    df["Price (Euro)"].mean()  # sentuh satu kolom seperti sidebar/dashboard
+    print(json.dumps({
+        "load_s": load_s,
+        "rss_load_mb": after_load - base,
+        "rss_touch_mb": _rss_mb() - base,
+        "frame_mb": df.memory_usage(deep=False).sum() / 1e6,
+    }))
+
+
+def _bench_files(n, work_dir, base=None):
+    """CSV + columnar store of ``n`` rows (the dataset repeated) in ``work_dir``."""
+    base = pd.read_csv(DATA_PATH) if base is None else base
+    csv_path = os.path.join(work_dir, f"bench_{n}.csv")
+    store_dir = os.path.join(work_dir, f"bench_{n}.npcol")
+    reps = -(-n // len(base))
+    big = pd.concat([base] * reps, ignore_index=True).iloc[:n]
+    big["Unnamed: 0"] = np.arange(n)
+    big.to_csv(csv_path, index=False)
+    del big
+    convert_csv(csv_path, store_dir)
+    return csv_path, store_dir
+
+
+def benchmark(sizes, work_dir):
+    base = pd.read_csv(DATA_PATH)
+    results = []
+    for n in sizes:
+        csv_path, store_dir = _bench_files(n, work_dir, base)
+        row = {"rows": n}
+        for kind in ("csv", "npcol"):
+            proc = subprocess.run(
+                [sys.executable, __file__, "_child", kind, csv_path, store_dir],
+                capture_output=True, text=True,
+            )
+            # Proses yang di-kill (OOM) dicatat, bukan menggagalkan seluruh run
+            row[kind] = (json.loads(proc.stdout.strip().splitlines()[-1])
+                         if proc.returncode == 0 else {"failed": proc.returncode})
+        results.append(row)
+    return results
+
+
+def _sessions_child(kind, sessions, csv_path, store_dir):
+    """``sessions`` reruns in flight at once, each holding its ``load_data()``:
+    ``cache_data`` (unpickled copy per call) vs ``cache_resource`` (one
+    frozen frame, a shallow per-rerun view)."""
+    import logging
+
+    import streamlit as st
+
+    logging.getLogger("streamlit").setLevel(logging.ERROR)  # "no runtime" warnings
+    if kind == "cache_data":
+        @st.cache_data
+        def load_data():
+            return load_dataset(csv_path, store_dir, convert=False)
+        session_frame = load_data
+    else:
+        @st.cache_resource
+        def load_data():
+            return freeze_frame(load_dataset(csv_path, store_dir, convert=False))
+        session_frame = lambda: load_data().copy(deep=False)  # noqa: E731
+
+    session_frame()  # cache terisi sebelum pengukuran
+    base = _rss_mb()
+    held, times = [], []
+    for _ in range(sessions):
+        start = time.perf_counter()
+        df = session_frame()
+        df["Price (Euro)"].mean()
+        times.append(time.perf_counter() - start)
+        held.append(df)
+    print(json.dumps({
+        "median_ms": float(np.median(times)) * 1000,
+        "p95_ms": float(np.percentile(times, 95)) * 1000,
+        "rss_mb": _rss_mb() - base,
+    }))
+
+
+def sessions_benchmark(session_counts, rows, work_dir):
+    if rows:
+        csv_path, store_dir = _bench_files(rows, work_dir)
+    else:
+        csv_path, store_dir = DATA_PATH, STORE_DIR
+    results = []
+    for n in session_counts:
+        row = {"sessions": n}
+        for kind in ("cache_data", "cache_resource"):
+            proc = subprocess.run(
+                [sys.executable, __file__, "_sessions", kind, str(n), csv_path, store_dir],
+                capture_output=True, text=True,
+            )
+            row[kind] = (json.loads(proc.stdout.strip().splitlines()[-1])
+                         if proc.returncode == 0 else {"failed": proc.returncode})
+        results.append(row)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Columnar (.npy per column) dataset store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    conv = sub.add_parser("convert", help="convert the CSV into the columnar store")
+    conv.add_argument("--csv", default=DATA_PATH)
+    conv.add_argument("--out", default=STORE_DIR)
+    bench = sub.add_parser("bench", help="load time / RSS: CSV vs columnar")
+    bench.add_argument("--sizes", default="1000,1000000,10000000")
+    bench.add_argument("--work-dir", default="/tmp")
+    sess = sub.add_parser("sessions", help="load_data() per rerun: cache_data vs shared frame")
+    sess.add_argument("--sessions", default="1,50,200")
+    sess.add_argument("--rows", type=int, default=0,
+                      help="synthetic dataset size (0 = the shipped dataset)")
+    sess.add_argument("--work-dir", default="/tmp")
+    child = sub.add_parser("_child")
+    child.add_argument("kind")
+    child.add_argument("csv")
+    child.add_argument("store")
+    sess_child = sub.add_parser("_sessions")
+    sess_child.add_argument("kind")
+    sess_child.add_argument("sessions", type=int)
+    sess_child.add_argument("csv")
+    sess_child.add_argument("store")
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        meta = convert_csv(args.csv, args.out)
+        print(f"{meta['n_rows']:,} rows -> {args.out}/ ({len(meta['columns']) + 1} column files)")
+    elif args.command == "_child":
+        _bench_child(args.kind, args.csv, args.store)
+    elif args.command == "_sessions":
+        _sessions_child(args.kind, args.sessions, args.csv, args.store)
+    elif args.command == "sessions":
+        counts = [int(s) for s in args.sessions.split(",")]
+        print(f"{'sessions':>8} {'cache':>15} {'median ms':>10} {'p95 ms':>8} {'RSS MB':>8}")
+        for r in sessions_benchmark(counts, args.rows, args.work_dir):
+            for kind in ("cache_data", "cache_resource"):
+                m = r[kind]
+                if "failed" in m:
+                    print(f"{r['sessions']:>8} {kind:>15}  failed (exit {m['failed']})")
+                    continue
+                print(f"{r['sessions']:>8} {kind:>15} {m['median_ms']:>10.3f} "
+                      f"{m['p95_ms']:>8.3f} {m['rss_mb']:>8.1f}")
+    else:
+        sizes = [int(s) for s in args.sizes.split(",")]
+        print(f"{'rows':>11} {'format':>6} {'load s':>8} {'RSS load MB':>12} "
+              f"{'RSS touch MB':>13} {'frame MB':>9}")
+        for r in benchmark(sizes, args.work_dir):
+            for kind in ("csv", "npcol"):
+                m = r[kind]
+                if "failed" in m:
+                    print(f"{r['rows']:>11,} {kind:>6}  failed (exit {m['failed']}, e.g. OOM-killed)")
+                    continue
+                print(f"{r['rows']:>11,} {kind:>6} {m['load_s']:>8.3f} {m['rss_load_mb']:>12.1f} "
+                      f"{m['rss_touch_mb']:>13.1f} {m['frame_mb']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+
+# ===============================
+# FEATURE SCHEMA
+# ===============================
+NUMERIC_FEATURES = [
+    "Inches", "CPU_Frequency (GHz)", "RAM (GB)", "Weight (kg)",
+    "Touchscreen", "SSD", "Res_Width", "Res_Height",
+    "IPS_Panel", "HDD"
+]
+
+# Brand yang punya kolom dummy (Acer = referensi drop_first, tidak punya kolom)
+COMPANY_LIST = [
+    'Apple','Asus','Chuwi','Dell','Fujitsu','Google','HP',
+    'Huawei','LG','Lenovo','MSI','Mediacom',
+    'Microsoft','Razer','Samsung','Toshiba','Vero','Xiaomi'
+]
+REFERENCE_COMPANY = 'Acer'
+
+# ===============================
+# SPEC (input form)
+# ===============================
+# Urutan argumen PredictionEngine.predict: satu field per kolom NUMERIC_FEATURES, lalu brand
+SPEC_NUMERIC_FIELDS = (
+    "inches", "cpu", "ram", "weight", "touchscreen",
+    "ssd", "res_width", "res_height", "ips", "hdd"
+)
+SPEC_FIELDS = SPEC_NUMERIC_FIELDS + ("company",)
+
+# Pilihan form di halaman prediksi: selectbox/radio -> nilai, slider -> (min, max)
+SPEC_OPTIONS = {
+    "ram": [2, 4, 6, 8, 12, 14],
+    "ssd": [0, 128, 256, 512, 1024],
+    "hdd": [0, 500, 1000],
+    "res_width": [1366, 1920, 2560, 2880],
+    "res_height": [768, 1080, 1600, 1800],
+    "ips": [0, 1],
+    "touchscreen": [0, 1],
+}
+SPEC_RANGES = {
+    "cpu": (1.0, 5.0),
+    "inches": (10.0, 18.0),
+    "weight": (1.0, 4.0),
+}
+SLIDER_STEP = 0.1
+
+
+def slider_values(field):
+    """Every value the ``field`` slider can take (0.1 steps, rounded)."""
+    lo, hi = SPEC_RANGES[field]
+    return np.round(np.arange(lo, hi + 1e-9, SLIDER_STEP), 1)
+
+
+class FeatureSchema:
+    """Model input layout: numeric columns plus one categorical column.
+
+    The model was fitted on ``pd.get_dummies(..., drop_first=True)``, so the
+    categorical column is expanded to ``<name>_<category>`` columns only at
+    the sklearn boundary. Everywhere else a row carries a single category
+    code (index into ``categories``, -1 for the reference/unknown value),
+    and the model contribution of the category is a gather from a per-code
+    weight vector. ``reference`` is the display name of code -1.
+    """
+
+    def __init__(self, numeric, categories, categorical="Company", target="Price (Euro)",
+                 reference=REFERENCE_COMPANY):
+        self.numeric = list(numeric)
+        self.categories = list(categories)
+        self.categorical = categorical
+        self.target = target
+        self.reference = reference
+        self._index = {c: i for i, c in enumerate(self.categories)}
+
+    @classmethod
+    def from_feature_names(cls, names, categorical="Company", target="Price (Euro)"):
+        """Schema from a fitted column order (e.g. ``scaler.feature_names_in_``).
+
+        Numeric columns must come first, followed by the one-hot columns.
+        """
+        prefix = f"{categorical}_"
+        names = [str(n) for n in names]
+        first = next((i for i, n in enumerate(names) if n.startswith(prefix)), len(names))
+        if any(not n.startswith(prefix) for n in names[first:]):
+            raise ValueError(f"{categorical}_* columns must come after the numeric columns")
+        categories = [n[len(prefix):] for n in names[first:]]
+        return cls(names[:first], categories, categorical, target)
+
+    @property
+    def onehot_columns(self):
+        return [f"{self.categorical}_{c}" for c in self.categories]
+
+    @property
+    def feature_columns(self):
+        """Column order of the one-hot model input."""
+        return self.numeric + self.onehot_columns
+
+    def index(self, category):
+        """Code of ``category``, or -1 for the reference/unknown value."""
+        return self._index.get(category, -1)
+
+    def name(self, code):
+        """Category name of ``code`` (the reference category for -1)."""
+        return self.categories[code] if code >= 0 else self.reference
+
+    def codes(self, values):
+        """Category codes for an array of category names."""
+        values = pd.Series(values).astype(str).str.strip()
+        return pd.Categorical(values, categories=self.categories).codes.astype(np.intp)
+
+    def codes_from_onehot(self, frame):
+        """Category codes from whichever one-hot columns ``frame`` has.
+
+        Each column is read once and scattered into the code array; no
+        dense (n, k) matrix is materialised.
+        """
+        codes = np.full(len(frame), -1, dtype=np.intp)
+        for i, col in enumerate(self.onehot_columns):
+            if col in frame.columns:
+                codes[np.asarray(frame[col]) != 0] = i
+        return codes
+
+    def has_onehot(self, frame):
+        return any(c in frame.columns for c in self.onehot_columns)
+
+    def encode(self, frame):
+        """``(X_numeric, codes)`` for a frame with either one-hot columns or
+        a raw categorical column of names."""
+        missing = [c for c in self.numeric if c not in frame.columns]
+        if missing:
+            raise ValueError(f"Missing feature columns: {', '.join(missing)}")
+        X_numeric = frame[self.numeric].to_numpy(dtype=np.float64)
+        if self.has_onehot(frame):
+            codes = self.codes_from_onehot(frame)
+        elif self.categorical in frame.columns:
+            codes = self.codes(frame[self.categorical])
+        else:
+            raise ValueError(
+                f"Input needs either {self.categorical}_* one-hot columns "
+                f"or a '{self.categorical}' column"
+            )
+        return X_numeric, codes
+
+    def onehot(self, codes, dtype=np.float64):
+        """Dense one-hot block for ``codes`` (sklearn interop and the full
+        standardised feature space)."""
+        codes = np.asarray(codes, dtype=np.intp)
+        out = np.zeros((len(codes), len(self.categories)), dtype=dtype)
+        known = codes >= 0
+        out[np.flatnonzero(known), codes[known]] = 1
+        return out
+
+
+SCHEMA = FeatureSchema(NUMERIC_FEATURES, COMPANY_LIST)
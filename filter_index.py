@@ -0,0 +1,132 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+PRICE_COL = "Price (Euro)"
+BITSET_COLS = ("RAM (GB)", "IPS_Panel")
+
+
+# ===============================
+# FILTER INDEX
+# ===============================
+class FilterIndex:
+    """Per-dataset index for the Analysis page filters.
+
+    Price ranges are answered by binary search over a sorted copy of the
+    price column; every distinct ``RAM (GB)`` and ``IPS_Panel`` value has a
+    packed bitset (one bit per row). A filter state resolves to row
+    positions with a few bitwise AND/OR passes over ``n / 8`` bytes.
+    """
+
+    def __init__(self, n_rows, price_order, sorted_price, bitsets):
+        self.n_rows = n_rows
+        self.price_order = price_order
+        self.sorted_price = sorted_price
+        self.bitsets = bitsets
+        self._all = np.packbits(np.ones(n_rows, dtype=bool))
+
+    @classmethod
+    def build(cls, df):
+        price = df[PRICE_COL].to_numpy()
+        order = np.argsort(price, kind="stable")
+        bitsets = {}
+        for col in BITSET_COLS:
+            values = df[col].to_numpy()
+            bitsets[col] = {
+                v.item(): np.packbits(values == v) for v in np.unique(values)
+            }
+        return cls(len(df), order, price[order], bitsets)
+
+    def _price_bits(self, lo, hi):
+        start = np.searchsorted(self.sorted_price, lo, side="left")
+        stop = np.searchsorted(self.sorted_price, hi, side="right")
+        if start == 0 and stop == self.n_rows:
+            return self._all
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[self.price_order[start:stop]] = True
+        return np.packbits(mask)
+
+    def _any_of(self, col, values):
+        sets = [self.bitsets[col][v] for v in values if v in self.bitsets[col]]
+        if not sets:
+            return np.zeros_like(self._all)
+        if len(sets) == len(self.bitsets[col]):
+            return self._all
+        return np.bitwise_or.reduce(sets)
+
+    def query(self, min_price, max_price, ram_values, ips_values):
+        """Sorted row positions matching the filter state."""
+        bits = self._price_bits(min_price, max_price)
+        bits = bits & self._any_of("RAM (GB)", ram_values)
+        bits &= self._any_of("IPS_Panel", ips_values)
+        return np.flatnonzero(np.unpackbits(bits, count=self.n_rows))
+
+
+def scan_filter(df, min_price, max_price, ram_values, ips_values):
+    """The original full-scan filter, kept as the reference for benchmarks."""
+    mask = (
+        (df[PRICE_COL] >= min_price) &
+        (df[PRICE_COL] <= max_price) &
+        (df["RAM (GB)"].isin(ram_values)) &
+        (df["IPS_Panel"].isin(ips_values))
+    )
+    return np.flatnonzero(mask.to_numpy())
+
+
+# ===============================
+# BENCHMARK
+# ===============================
+def synthetic_frame(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        PRICE_COL: rng.integers(174, 3000, size=n_rows),
+        "RAM (GB)": rng.choice([2, 4, 6, 8, 12, 14], size=n_rows),
+        "IPS_Panel": rng.integers(0, 2, size=n_rows),
+    })
+
+
+def benchmark(sizes, repeats=5):
+    states = [
+        (174, 3000, [2, 4, 6, 8, 12, 14], [0, 1]),  # default (tanpa filter)
+        (500, 1500, [4, 8], [0, 1]),
+        (1000, 1200, [8], [1]),
+    ]
+    rows = []
+    for n in sizes:
+        df = synthetic_frame(n)
+        start = time.perf_counter()
+        index = FilterIndex.build(df)
+        build_ms = (time.perf_counter() - start) * 1000
+        for state in states:
+            assert np.array_equal(index.query(*state), scan_filter(df, *state))
+            timings = {}
+            for name, fn in (("scan", lambda: scan_filter(df, *state)),
+                             ("index", lambda: index.query(*state))):
+                start = time.perf_counter()
+                for _ in range(repeats):
+                    fn()
+                timings[name] = (time.perf_counter() - start) / repeats * 1000
+            rows.append({
+                "rows": n, "state": state[:2] + (len(state[2]), len(state[3])),
+                "build_ms": build_ms, "scan_ms": timings["scan"], "index_ms": timings["index"],
+            })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Analysis filter index")
+    parser.add_argument("--sizes", default="1000,100000,1000000,10000000")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    print(f"{'rows':>10} {'filter (price, #ram, #ips)':>28} {'build ms':>9} {'scan ms':>9} {'index ms':>9}")
+    for r in benchmark(sizes, args.repeats):
+        print(f"{r['rows']:>10,} {str(r['state']):>28} {r['build_ms']:>9.2f} "
+              f"{r['scan_ms']:>9.3f} {r['index_ms']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
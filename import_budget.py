@@ -0,0 +1,187 @@
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+APP_PATH = "app.py"
+BUDGET_PATH = "import_budget.json"
+
+# Tidak boleh ter-load oleh cold start halaman default (Dashboard); ini gate utama
+FORBIDDEN_AT_STARTUP = ["sklearn", "scipy", "joblib", "altair"]
+# Styler tabel Dashboard butuh matplotlib (yang menarik PIL): boleh saat render,
+# tidak saat import app.py
+FORBIDDEN_AT_IMPORT = FORBIDDEN_AT_STARTUP + ["PIL", "matplotlib"]
+
+# Di-import dulu di proses yang sama: waktu import pandas/streamlit (dan site) tidak
+# ikut dihitung, budget hanya untuk modul repo ini beserta dependensi yang mereka tarik
+BASELINE_IMPORTS = "import numpy, pandas, streamlit"
+
+
+# ===============================
+# MEASUREMENT
+# ===============================
+def app_imports(app_path=APP_PATH):
+    """Source of the module-level import statements of ``app_path``."""
+    with open(app_path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return "\n".join(
+        ast.unparse(node) for node in tree.body
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+    )
+
+
+def parse_importtime(stderr):
+    """Top-level ``-X importtime`` entries -> {module: cumulative µs}."""
+    top = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit() and not name.startswith("  "):
+            top[name.strip()] = int(cumulative)
+    return top
+
+
+def repo_modules(app_path=APP_PATH):
+    """Names of the top-level modules that live next to ``app_path``."""
+    app_dir = os.path.dirname(os.path.abspath(app_path))
+    return {name[:-3] for name in os.listdir(app_dir) if name.endswith(".py")}
+
+
+def measure_imports(app_path=APP_PATH):
+    """Cumulative import time (µs) per repo module imported by app.py,
+    after :data:`BASELINE_IMPORTS` in the same process."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"{BASELINE_IMPORTS}\n{app_imports(app_path)}"],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(app_path)),
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    own = repo_modules(app_path)
+    return {m: us for m, us in parse_importtime(proc.stderr).items() if m in own}
+
+
+def loaded_modules(app_path=APP_PATH):
+    """Top-level package names loaded by app.py's imports (baseline included)."""
+    proc = subprocess.run(
+        [sys.executable, "-c", f"{app_imports(app_path)}\nimport sys\n"
+         "print(' '.join(sorted({m.split('.')[0] for m in sys.modules})))"],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(app_path)), check=True,
+    )
+    return proc.stdout.split()
+
+
+_FIRST_RUN = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=120)
+before = set(sys.modules)
+start = time.perf_counter()
+at.run()
+elapsed = time.perf_counter() - start
+loaded = sorted({{m.split(".")[0] for m in set(sys.modules) - before}})
+print(json.dumps({{"seconds": elapsed, "loaded": loaded, "errors": len(at.exception)}}))
+"""
+
+
+def measure_first_run(app_path=APP_PATH):
+    """First (cold) script run of the default page in a fresh process."""
+    app_dir = os.path.dirname(os.path.abspath(app_path))
+    env = dict(os.environ, PYTHONPATH=app_dir)
+    proc = subprocess.run(
+        [sys.executable, "-c", _FIRST_RUN.format(app=os.path.basename(app_path))],
+        capture_output=True, text=True, cwd=app_dir, env=env, check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def measure(app_path=APP_PATH, repeats=5):
+    imports = [measure_imports(app_path) for _ in range(repeats)]
+    runs = [measure_first_run(app_path) for _ in range(repeats)]
+    modules = sorted(set().union(*imports))
+    per_module = {m: float(np.median([r.get(m, 0) for r in imports])) / 1000 for m in modules}
+    return {
+        "repo_import_ms": float(np.median([sum(r.values()) for r in imports])) / 1000,
+        "first_run_ms": float(np.median([r["seconds"] for r in runs])) * 1000,
+        "per_module_ms": per_module,
+        "loaded_at_import": loaded_modules(app_path),
+        "loaded_on_first_run": runs[0]["loaded"],
+        "errors": max(r["errors"] for r in runs),
+    }
+
+
+# ===============================
+# BUDGET
+# ===============================
+def check(result, budget):
+    """List of budget violations (empty = within budget).
+
+    Forbidden modules are the hard gate. The time budgets cover only the
+    repo's own modules and the first script run, not interpreter start-up
+    or the pandas/streamlit imports every version of the app pays.
+    """
+    problems = []
+    if result["repo_import_ms"] > budget["repo_import_ms"]:
+        problems.append(f"repo module imports took {result['repo_import_ms']:.0f} ms "
+                        f"(budget {budget['repo_import_ms']:.0f} ms)")
+    if result["first_run_ms"] > budget["first_run_ms"]:
+        problems.append(f"first Dashboard run took {result['first_run_ms']:.0f} ms "
+                        f"(budget {budget['first_run_ms']:.0f} ms)")
+    for name in budget.get("forbidden_at_import", FORBIDDEN_AT_IMPORT):
+        if name in result["loaded_at_import"]:
+            problems.append(f"{name} is imported by app.py's module-level imports")
+    loaded = set(result["loaded_on_first_run"]) | set(result["loaded_at_import"])
+    for name in budget.get("forbidden_at_startup", FORBIDDEN_AT_STARTUP):
+        if name in loaded:
+            problems.append(f"{name} is imported on cold start")
+    if result["errors"]:
+        problems.append("app.py raised an exception on the first run")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start import budget for app.py")
+    parser.add_argument("--app", default=APP_PATH)
+    parser.add_argument("--budget", default=BUDGET_PATH)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--update", action="store_true",
+                        help="write the measured times (+ headroom) as the new budget")
+    parser.add_argument("--headroom", type=float, default=1.5)
+    args = parser.parse_args(argv)
+
+    result = measure(args.app, args.repeats)
+    print(f"repo module imports: {result['repo_import_ms']:.0f} ms "
+          f"(after {BASELINE_IMPORTS!r}) | first Dashboard run: {result['first_run_ms']:.0f} ms")
+    slowest = sorted(result["per_module_ms"].items(), key=lambda kv: -kv[1])[:8]
+    for name, ms in slowest:
+        print(f"  {name:<24} {ms:>8.1f} ms")
+
+    if args.update:
+        budget = {
+            "repo_import_ms": round(result["repo_import_ms"] * args.headroom),
+            "first_run_ms": round(result["first_run_ms"] * args.headroom),
+            "forbidden_at_startup": FORBIDDEN_AT_STARTUP,
+            "forbidden_at_import": FORBIDDEN_AT_IMPORT,
+        }
+        with open(args.budget, "w") as f:
+            json.dump(budget, f, indent=2)
+            f.write("\n")
+        print(f"budget written to {args.budget}")
+        return
+
+    with open(args.budget) as f:
+        budget = json.load(f)
+    problems = check(result, budget)
+    for p in problems:
+        print(f"OVER BUDGET: {p}")
+    if problems:
+        raise SystemExit(1)
+    print("within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+
+import numpy as np
+
+from feature_schema import SPEC_FIELDS, SPEC_OPTIONS, SPEC_RANGES
+from prediction_engine import COMPANY_LIST
+
+
+def random_spec(rng):
+    """Random spec drawn from the same options as the prediction form."""
+    spec = {}
+    for field in SPEC_FIELDS:
+        if field == "company":
+            spec[field] = rng.choice(COMPANY_LIST)
+        elif field in SPEC_RANGES:
+            spec[field] = round(rng.uniform(*SPEC_RANGES[field]), 1)
+        else:
+            spec[field] = rng.choice(SPEC_OPTIONS[field])
+    return spec
+
+
+def _worker(host, port, n_requests, seed, latencies, errors):
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    headers = {"Content-Type": "application/json"}
+    for _ in range(n_requests):
+        body = json.dumps(random_spec(rng)).encode("utf-8")
+        start = time.perf_counter()
+        try:
+            conn.request("POST", "/predict", body, headers)
+            resp = conn.getresponse()
+            resp.read()
+            ok = resp.status == 200
+        except (OSError, http.client.HTTPException):
+            ok = False
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+        latencies.append(time.perf_counter() - start)
+        if not ok:
+            errors.append(1)
+    conn.close()
+
+
+def run_level(host, port, concurrency, requests_per_client):
+    """Hammer the server with ``concurrency`` keep-alive clients.
+
+    Returns throughput and latency percentiles (ms) for this level.
+    """
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(
+            target=_worker,
+            args=(host, port, requests_per_client, i, latencies, errors),
+        )
+        for i in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    lat_ms = np.asarray(latencies) * 1000
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "throughput_rps": len(latencies) / elapsed,
+        "p50_ms": float(np.percentile(lat_ms, 50)),
+        "p99_ms": float(np.percentile(lat_ms, 99)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load generator for prediction_server.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--concurrency", default="1,4,16,64",
+                        help="comma separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200,
+                        help="requests per client at each level")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = [
+        run_level(args.host, args.port, int(c), args.requests)
+        for c in args.concurrency.split(",")
+    ]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'conc':>5} {'reqs':>7} {'err':>4} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for r in results:
+        print(
+            f"{r['concurrency']:>5} {r['requests']:>7} {r['errors']:>4} "
+            f"{r['throughput_rps']:>9.0f} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+import argparse
+import json
+import math
+import os
+
+import numpy as np
+
+from feature_schema import FeatureSchema
+from prediction_engine import MODEL_PATH, SCALER_PATH, PredictionEngine
+from price_grid import artifact_sha256
+
+ARTIFACT_PATH = "model_linear_TEKREK.json"
+ARTIFACT_FORMAT = "laptop-price-linear"
+ARTIFACT_VERSION = 1
+
+# "json" = artefak ringan (harus sudah di-export dari .pkl yang sama), "pickle" = selalu .pkl
+MODEL_ARTIFACT_FORMAT = os.environ.get("MODEL_ARTIFACT_FORMAT", "json")
+
+
+# ===============================
+# EXPORT
+# ===============================
+def export_artifact(model, scaler, path=ARTIFACT_PATH, source_sha256=None):
+    """Write the fitted scaler + regression as a small versioned JSON file.
+
+    Floats are written with ``repr`` precision, so loading reproduces the
+    pickled values bit for bit.
+    """
+    names = getattr(scaler, "feature_names_in_", None)
+    if names is None:
+        raise ValueError("Scaler has no feature_names_in_; cannot record the feature layout")
+    schema = FeatureSchema.from_feature_names(names)
+    coef = np.ravel(np.asarray(model.coef_, dtype=np.float64))
+    mean = np.asarray(scaler.mean_, dtype=np.float64) if scaler.with_mean else np.zeros_like(coef)
+    scale = np.asarray(scaler.scale_, dtype=np.float64) if scaler.with_std else np.ones_like(coef)
+    artifact = {
+        "format": ARTIFACT_FORMAT,
+        "version": ARTIFACT_VERSION,
+        "feature_names": schema.feature_columns,
+        "numeric_features": schema.numeric,
+        "categorical": schema.categorical,
+        "categories": schema.categories,
+        "scaler": {"mean": mean.tolist(), "scale": scale.tolist()},
+        "model": {"coef": coef.tolist(), "intercept": float(np.ravel(model.intercept_)[0])},
+        "source_sha256": source_sha256,
+    }
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(artifact, f, indent=1)
+    os.replace(tmp, path)
+    return artifact
+
+
+def export_from_pickles(model_path=MODEL_PATH, scaler_path=SCALER_PATH, path=ARTIFACT_PATH):
+    import joblib
+
+    return export_artifact(
+        joblib.load(model_path), joblib.load(scaler_path), path,
+        source_sha256=artifact_sha256(model_path, scaler_path),
+    )
+
+
+# ===============================
+# LOAD (NumPy only)
+# ===============================
+def read_artifact(path=ARTIFACT_PATH):
+    """Parse and validate an artifact written by ``export_artifact``."""
+    with open(path) as f:
+        artifact = json.load(f)
+    if artifact.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"{path}: not a {ARTIFACT_FORMAT} artifact")
+    if artifact.get("version") != ARTIFACT_VERSION:
+        raise ValueError(f"{path}: unsupported artifact version {artifact.get('version')}")
+    schema = artifact_schema(artifact)
+    if schema.feature_columns != artifact["feature_names"]:
+        raise ValueError(f"{path}: feature_names do not match numeric_features + categories")
+    p = len(schema.feature_columns)
+    values = artifact["scaler"]["mean"] + artifact["scaler"]["scale"] + artifact["model"]["coef"]
+    if len(values) != 3 * p:
+        raise ValueError(f"{path}: expected {p} values for mean, scale and coef")
+    if not all(math.isfinite(v) for v in values + [artifact["model"]["intercept"]]):
+        raise ValueError(f"{path}: non-finite parameter")
+    return artifact
+
+
+def artifact_schema(artifact):
+    """Feature layout recorded in the artifact (brands come from the data)."""
+    return FeatureSchema(artifact["numeric_features"], artifact["categories"],
+                         artifact["categorical"])
+
+
+def engine_from_artifact(artifact):
+    schema = artifact_schema(artifact)
+    return PredictionEngine.from_arrays(
+        artifact["model"]["coef"], artifact["model"]["intercept"],
+        artifact["scaler"]["mean"], artifact["scaler"]["scale"], schema,
+    )
+
+
+def artifact_source_sha256(path=ARTIFACT_PATH):
+    """Hash of the pickles ``path`` was exported from (None if not recorded).
+
+    This names the model version without needing the pickles themselves,
+    e.g. to key the price grid.
+    """
+    with open(path) as f:
+        return json.load(f).get("source_sha256")
+
+
+def artifact_is_current(path=ARTIFACT_PATH, model_path=MODEL_PATH, scaler_path=SCALER_PATH):
+    """True if ``path`` exists and was exported from the current pickles
+    (always true when the pickles are not shipped at all)."""
+    if not os.path.exists(path):
+        return False
+    if not (os.path.exists(model_path) and os.path.exists(scaler_path)):
+        return True
+    return artifact_source_sha256(path) == artifact_sha256(model_path, scaler_path)
+
+
+def load_engine(model_path=MODEL_PATH, scaler_path=SCALER_PATH, path=ARTIFACT_PATH,
+                prefer=None):
+    """Engine from the JSON artifact, or from the pickles when
+    ``MODEL_ARTIFACT_FORMAT=pickle``.
+
+    Never writes to disk: a missing artifact, or one exported from other
+    pickles than the ones shipped next to it, raises ``ValueError``;
+    re-exporting is the explicit ``model_artifact.py export`` step.
+    """
+    prefer = prefer or MODEL_ARTIFACT_FORMAT
+    if prefer == "pickle":
+        return PredictionEngine.from_files(model_path, scaler_path)
+    if not artifact_is_current(path, model_path, scaler_path):
+        raise ValueError(f"{path} is missing or stale for {model_path}; "
+                         "run `python model_artifact.py export`")
+    return engine_from_artifact(read_artifact(path))
+
+
+# ===============================
+# CLI
+# ===============================
+def _cold_start(kind, repeats):
+    """Cold-process engine load and app.py first run for ``kind``."""
+    import subprocess
+    import sys
+
+    engine_code = (
+        "import time, resource, sys; t = time.perf_counter()\n"
+        "import model_artifact as m\n"
+        f"e = m.load_engine(prefer={kind!r})\n"
+        "print(time.perf_counter() - t, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,"
+        " 'sklearn' in sys.modules)\n"
+    )
+    app_code = (
+        "import time, resource, sys\n"
+        "from streamlit.testing.v1 import AppTest\n"
+        "base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024\n"
+        "at = AppTest.from_file('app.py', default_timeout=120); t = time.perf_counter(); at.run()\n"
+        "print(time.perf_counter() - t, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 - base,"
+        " 'sklearn' in sys.modules)\n"
+    )
+    env = dict(os.environ, MODEL_ARTIFACT_FORMAT=kind, PYTHONPATH=os.getcwd())
+    rows = {}
+    for name, code in (("engine", engine_code), ("app", app_code)):
+        runs = []
+        for _ in range(repeats):
+            out = subprocess.run([sys.executable, "-c", code], env=env, check=True,
+                                 capture_output=True, text=True).stdout.split()
+            runs.append((float(out[0]), float(out[1]), out[2] == "True"))
+        rows[name] = (float(np.median([r[0] for r in runs])),
+                      float(np.median([r[1] for r in runs])), runs[0][2])
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lightweight JSON model artifact")
+    sub = parser.add_subparsers(dest="command", required=True)
+    exp = sub.add_parser("export", help="export the .pkl model + scaler to JSON")
+    exp.add_argument("--model", default=MODEL_PATH)
+    exp.add_argument("--scaler", default=SCALER_PATH)
+    exp.add_argument("-o", "--output", default=ARTIFACT_PATH)
+    bench = sub.add_parser("bench", help="cold start: JSON artifact vs pickles")
+    bench.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        artifact = export_from_pickles(args.model, args.scaler, args.output)
+        print(f"{len(artifact['feature_names'])} features -> {args.output} "
+              f"({os.path.getsize(args.output):,} bytes)")
+    else:
+        print(f"{'path':<8} {'what':<7} {'seconds':>8} {'peak RSS MB':>12} {'sklearn loaded':>15}")
+        for kind in ("pickle", "json"):
+            for what, (sec, rss, sk) in _cold_start(kind, args.repeats).items():
+                print(f"{kind:<8} {what:<7} {sec:>8.3f} {rss:>12.1f} {str(sk):>15}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,425 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from feature_schema import SCHEMA, FeatureSchema
+from model_artifact import ARTIFACT_PATH, engine_from_artifact, export_artifact, load_engine, read_artifact
+from prediction_engine import MODEL_PATH, SCALER_PATH
+
+REGISTRY_DIR = "models"
+MANIFEST_PATH = os.path.join(REGISTRY_DIR, "registry.json")
+MANIFEST_FORMAT_VERSION = 1
+
+DEFAULT_MODEL = "linear"
+# Batas model yang resident di memori (LRU); MB = 0 berarti tanpa batas byte
+MAX_RESIDENT = int(os.environ.get("MODEL_REGISTRY_MAX_RESIDENT", "3"))
+MAX_RESIDENT_MB = float(os.environ.get("MODEL_REGISTRY_MAX_MB", "0"))
+
+# Pool load dipakai bersama semua registry: hot reload membuat registry baru,
+# registry lama tidak meninggalkan thread executor sendiri. Beberapa worker supaya
+# load model kecil tidak antre di belakang load model besar; load yang sama
+# di-dedup per key di ModelRegistry.load_async
+LOAD_WORKERS = int(os.environ.get("MODEL_REGISTRY_LOAD_WORKERS", "4"))
+_LOAD_EXECUTOR = ThreadPoolExecutor(max_workers=max(1, LOAD_WORKERS), thread_name_prefix="model-load")
+
+# Pengecualian format bebas-pickle: tree ensemble tidak punya export JSON, jadi
+# disimpan dengan joblib. joblib.load menjalankan kode, hanya untuk file registry sendiri
+PICKLE_NOTE = ("joblib pickle: tree ensembles have no JSON export; "
+               "load only registry files you built yourself")
+
+# Model bawaan: artefak linear yang sudah ada (JSON, .pkl sebagai fallback)
+BUILTIN_ENTRY = {
+    "name": DEFAULT_MODEL,
+    "version": 1,
+    "kind": "linear",
+    "description": "StandardScaler + LinearRegression (notebook)",
+    "files": [ARTIFACT_PATH, MODEL_PATH, SCALER_PATH],
+}
+
+
+def model_key(name, version):
+    return f"{name}@v{version}"
+
+
+def entry_available(entry):
+    """Whether every file of ``entry`` is on disk. Pickled registry models
+    are not tracked in git, so a fresh checkout may list entries it cannot
+    load until ``model_registry.py train`` rebuilds them."""
+    return all(os.path.exists(path) for path in entry["files"])
+
+
+DEFAULT_KEY = model_key(DEFAULT_MODEL, BUILTIN_ENTRY["version"])
+
+
+# ===============================
+# PREDICTORS
+# ===============================
+class SklearnPredictor:
+    """``PredictionEngine``-compatible wrapper for any fitted sklearn regressor
+    trained on the schema's full feature layout (numeric + brand one-hot,
+    unscaled)."""
+
+    def __init__(self, model, schema=SCHEMA):
+        self.model = model
+        self.schema = schema
+
+    def brand_index(self, company):
+        return self.schema.index(company)
+
+    def predict(self, inches, cpu, ram, weight, touchscreen,
+                ssd, res_width, res_height, ips, hdd, company):
+        x = ((inches, cpu, ram, weight, touchscreen, ssd, res_width, res_height, ips, hdd),)
+        return float(self.predict_batch(x, [self.schema.index(company)])[0])
+
+    def predict_batch(self, X_numeric, brand_idx):
+        X_numeric = np.asarray(X_numeric, dtype=np.float64)
+        X = np.hstack([X_numeric, self.schema.onehot(np.asarray(brand_idx, dtype=np.intp))])
+        return np.asarray(self.model.predict(X), dtype=np.float64)
+
+
+def load_predictor(entry):
+    """Load one registry entry into a predictor (``predict``/``predict_batch``/``schema``)."""
+    kind = entry["kind"]
+    if kind == "linear":
+        return load_engine()
+    if kind == "linear-json":
+        return engine_from_artifact(read_artifact(entry["files"][0]))
+    if kind == "sklearn":   # satu-satunya pickle di registry, lihat PICKLE_NOTE
+        import joblib
+
+        bundle = joblib.load(entry["files"][0])
+        return SklearnPredictor(bundle["model"], FeatureSchema.from_feature_names(bundle["feature_names"]))
+    raise ValueError(f"Unknown model kind {kind!r}")
+
+
+def resident_bytes(obj):
+    """Approximate memory held by ``obj``: array buffers plus the Python
+    objects reachable through containers, ``__dict__`` and ``__getstate__``
+    (which is how sklearn's Cython trees expose their node arrays)."""
+    seen = set()
+    states = []   # objek sementara dari __getstate__ tetap hidup, supaya id() tidak dipakai ulang
+    stack = [obj]
+    total = 0
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, (type, types.ModuleType, types.FunctionType,
+                                           types.BuiltinFunctionType, types.MethodType)):
+            continue
+        seen.add(id(o))
+        if isinstance(o, np.ndarray):
+            if isinstance(o.base, np.ndarray):
+                stack.append(o.base)   # view: buffer dihitung sekali di array pemiliknya
+            else:
+                total += o.nbytes      # punya buffer sendiri (atau milik objek non-NumPy)
+            if o.dtype == object:
+                stack.extend(o.ravel())
+            continue
+        total += sys.getsizeof(o)
+        if isinstance(o, (str, bytes, int, float, bool, type(None))):
+            continue
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        elif hasattr(o, "__dict__"):
+            stack.append(vars(o))
+        else:
+            try:
+                state = o.__getstate__()
+            except (AttributeError, TypeError):
+                continue
+            if state is not None:
+                states.append(state)
+                stack.append(state)
+    return total
+
+
+# ===============================
+# REGISTRY
+# ===============================
+class ModelRegistry:
+    """Named, versioned models, loaded lazily and kept in an LRU.
+
+    At most ``max_resident`` models (and ``max_bytes`` of
+    :func:`resident_bytes`, when set) stay loaded; the least recently used
+    one is dropped first, except the pinned default. Loads run on a small
+    background pool (shared by every registry, so replacing a registry on
+    hot reload leaves no thread behind) and never hold the registry lock,
+    so reruns that use an already resident model are not held up by
+    someone else's slow load, and different models load side by side;
+    concurrent requests for the same model share one load.
+    """
+
+    def __init__(self, entries, max_resident=MAX_RESIDENT, max_bytes=None,
+                 pinned=(DEFAULT_KEY,), loader=load_predictor, executor=None):
+        self.entries = OrderedDict((model_key(e["name"], e["version"]), e) for e in entries)
+        self.max_resident = max(1, max_resident)
+        self.max_bytes = max_bytes
+        self.pinned = set(pinned) & set(self.entries)
+        self.loader = loader
+        self._resident = OrderedDict()   # key -> (predictor, bytes)
+        self._loading = {}               # key -> Future
+        self._lock = threading.Lock()
+        self._executor = executor or _LOAD_EXECUTOR
+        self.loads = {}
+        self.load_seconds = {}
+        self.evictions = 0
+
+    @classmethod
+    def from_manifest(cls, path=MANIFEST_PATH, **kwargs):
+        """Built-in linear model plus every entry of ``path`` (if it exists)
+        whose files are on disk."""
+        kwargs.setdefault("max_bytes", MAX_RESIDENT_MB * 2**20 if MAX_RESIDENT_MB > 0 else None)
+        entries = [e for e in read_manifest(path)["models"] if entry_available(e)]
+        return cls([BUILTIN_ENTRY] + entries, **kwargs)
+
+    def keys(self):
+        return list(self.entries)
+
+    def label(self, key):
+        entry = self.entries[key]
+        return f"{entry['name']} v{entry['version']}"
+
+    def is_resident(self, key):
+        with self._lock:
+            return key in self._resident
+
+    def _load(self, key):
+        start = time.perf_counter()
+        try:
+            predictor = self.loader(self.entries[key])
+            size = resident_bytes(predictor)
+            with self._lock:
+                self._resident[key] = (predictor, size)
+                self.loads[key] = self.loads.get(key, 0) + 1
+                self.load_seconds[key] = time.perf_counter() - start
+                self._evict()
+            return predictor
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+
+    def _evict(self):
+        def over():
+            total = sum(size for _, size in self._resident.values())
+            return (len(self._resident) > self.max_resident
+                    or (self.max_bytes is not None and total > self.max_bytes))
+
+        for key in list(self._resident):
+            if not over():
+                break
+            if key not in self.pinned and len(self._resident) > 1:
+                del self._resident[key]
+                self.evictions += 1
+
+    def load_async(self, key):
+        """Future of the predictor for ``key``; starts a background load if
+        it is neither resident nor already loading."""
+        if key not in self.entries:
+            raise KeyError(f"Unknown model {key!r}")
+        with self._lock:
+            if key in self._resident:
+                self._resident.move_to_end(key)
+                future = _done(self._resident[key][0])
+            else:
+                future = self._loading.get(key)
+                if future is None:
+                    future = self._loading[key] = self._executor.submit(self._load, key)
+        return future
+
+    def get(self, key, timeout=None):
+        """Predictor for ``key``, waiting for its load if needed."""
+        return self.load_async(key).result(timeout)
+
+    def resident_summary(self):
+        """``(models resident, accounted bytes)``."""
+        with self._lock:
+            return len(self._resident), sum(size for _, size in self._resident.values())
+
+    def stats(self):
+        """One row per registered model: residency, accounted MB, loads."""
+        with self._lock:
+            resident = {k: size for k, (_, size) in self._resident.items()}
+            loading = set(self._loading)
+        rows = []
+        for key, entry in self.entries.items():
+            rows.append({
+                "model": self.label(key),
+                "kind": entry["kind"],
+                "state": "resident" if key in resident else "loading" if key in loading else "on disk",
+                "MB": resident.get(key, 0) / 2**20,
+                "loads": self.loads.get(key, 0),
+                "load s": self.load_seconds.get(key, float("nan")),
+            })
+        return rows
+
+
+def _done(value):
+    from concurrent.futures import Future
+
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+# ===============================
+# MANIFEST + TRAINING
+# ===============================
+def read_manifest(path=MANIFEST_PATH):
+    if not os.path.exists(path):
+        return {"format_version": MANIFEST_FORMAT_VERSION, "models": []}
+    with open(path) as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != MANIFEST_FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported registry format {manifest.get('format_version')}")
+    return manifest
+
+
+def _write_json(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp, path)
+
+
+CANDIDATES = {
+    "ridge": "StandardScaler + Ridge(alpha=1)",
+    "quantile": "StandardScaler + median QuantileRegressor",
+    "gbr": "GradientBoostingRegressor (500 trees)",
+}
+
+
+def train_candidate(name, df_final, registry_dir=REGISTRY_DIR, manifest_path=MANIFEST_PATH):
+    """Fit candidate ``name`` on the notebook's training split, write it as
+    the next version in the registry and return its manifest entry.
+
+    Linear candidates are written as the same JSON artifact as the default
+    model (folded into a ``PredictionEngine`` on load); tree models are
+    pickled with joblib, the registry's one exception to the pickle-free
+    format (recorded in the entry's ``note``).
+    """
+    import joblib
+    import pandas as pd
+    from sklearn.ensemble import GradientBoostingRegressor
+    from sklearn.linear_model import QuantileRegressor, Ridge
+    from sklearn.metrics import mean_absolute_error, r2_score
+    from sklearn.preprocessing import StandardScaler
+
+    from prediction_intervals import training_split
+
+    if name not in CANDIDATES:
+        raise ValueError(f"Unknown candidate {name!r}; expected one of {sorted(CANDIDATES)}")
+    X_train, y_train, X_test, y_test = training_split(df_final, SCHEMA)
+    manifest = read_manifest(manifest_path)
+    version = 1 + max((e["version"] for e in manifest["models"] if e["name"] == name), default=0)
+    os.makedirs(registry_dir, exist_ok=True)
+    start = time.perf_counter()
+
+    if name == "gbr":
+        model = GradientBoostingRegressor(n_estimators=500, max_depth=3, learning_rate=0.05,
+                                          random_state=42).fit(X_train, y_train)
+        path = os.path.join(registry_dir, f"{name}-v{version}.joblib")
+        joblib.dump({"model": model, "feature_names": SCHEMA.feature_columns}, path)
+        kind, y_pred = "sklearn", model.predict(X_test)
+        note = PICKLE_NOTE
+    else:
+        scaler = StandardScaler().fit(pd.DataFrame(X_train, columns=SCHEMA.feature_columns))
+        Z_train = scaler.transform(pd.DataFrame(X_train, columns=SCHEMA.feature_columns))
+        if name == "ridge":
+            model = Ridge(alpha=1.0)
+        else:
+            model = QuantileRegressor(quantile=0.5, alpha=0.0, solver="highs")
+        model.fit(Z_train, y_train)
+        path = os.path.join(registry_dir, f"{name}-v{version}.json")
+        export_artifact(model, scaler, path)
+        kind, note = "linear-json", None
+        y_pred = model.predict(scaler.transform(pd.DataFrame(X_test, columns=SCHEMA.feature_columns)))
+
+    entry = {
+        "name": name,
+        "version": version,
+        "kind": kind,
+        "description": CANDIDATES[name],
+        "files": [path],
+        "fit_seconds": time.perf_counter() - start,
+        "test_mae": float(mean_absolute_error(y_test, y_pred)),
+        "test_r2": float(r2_score(y_test, y_pred)),
+    }
+    if note:
+        entry["note"] = note
+    manifest["models"].append(entry)
+    _write_json(manifest_path, manifest)
+    return entry
+
+
+# ===============================
+# CLI
+# ===============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Registry of named, versioned price models")
+    sub = parser.add_subparsers(dest="command", required=True)
+    tr = sub.add_parser("train", help="fit candidate models into the registry")
+    tr.add_argument("names", nargs="*", default=list(CANDIDATES), help=f"any of {', '.join(CANDIDATES)}")
+    sub.add_parser("list", help="registered models")
+    bench = sub.add_parser("bench", help="load time, resident memory, and default-model "
+                                         "latency while another model loads")
+    bench.add_argument("--max-resident", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    if args.command == "train":
+        from dataset_store import load_dataset
+
+        df = load_dataset()
+        for name in args.names:
+            e = train_candidate(name, df)
+            print(f"{model_key(e['name'], e['version']):<14} {e['kind']:<12} "
+                  f"MAE {e['test_mae']:8.2f}  R2 {e['test_r2']:.4f}  ({e['fit_seconds']:.1f}s)")
+        return
+
+    if args.command == "list":
+        for e in [BUILTIN_ENTRY] + read_manifest()["models"]:
+            missing = "" if entry_available(e) else "  (files missing, retrain)"
+            print(f"{model_key(e['name'], e['version']):<14} {e['kind']:<12} {e['description']}{missing}")
+        return
+
+    registry = ModelRegistry.from_manifest(max_resident=args.max_resident)
+    default = DEFAULT_KEY
+    spec = (15.6, 2.5, 8, 2.0, 0, 256, 1920, 1080, 1, 500, "Dell")
+    registry.get(default)
+    for key in registry.keys():
+        if key == default:
+            continue
+        # Selama model lain dimuat: berapa lama get()+predict() untuk model default?
+        future = registry.load_async(key)
+        lat = []
+        while not future.done():
+            start = time.perf_counter()
+            registry.get(default).predict(*spec)
+            lat.append((time.perf_counter() - start) * 1e3)
+            time.sleep(0.001)
+        predictor = future.result()
+        start = time.perf_counter()
+        for _ in range(100):
+            predictor.predict(*spec)
+        predict_us = (time.perf_counter() - start) * 1e4
+        print(f"{registry.label(key):<14} load {registry.load_seconds[key] * 1e3:8.1f} ms  "
+              f"predict {predict_us:8.1f} µs  default-model max {max(lat, default=0):6.2f} ms "
+              f"over {len(lat)} calls during load")
+    print()
+    print(f"{'model':<14} {'kind':<12} {'state':<9} {'MB':>8} {'loads':>6}")
+    for row in registry.stats():
+        print(f"{row['model']:<14} {row['kind']:<12} {row['state']:<9} {row['MB']:>8.3f} {row['loads']:>6}")
+    print(f"evictions: {registry.evictions}")
+
+
+if __name__ == "__main__":
+    main()
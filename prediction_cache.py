@@ -0,0 +1,90 @@
+import threading
+from collections import OrderedDict
+
+from feature_schema import SLIDER_STEP, SPEC_FIELDS, SPEC_RANGES
+
+
+# ===============================
+# KEY NORMALISATION
+# ===============================
+def spec_key(*spec):
+    """Canonical, hashable key for one configuration (``SPEC_FIELDS`` order).
+
+    Slider values (inches, CPU GHz, weight) are quantised to their 0.1 step
+    as integers, so 15.6 and 15.600000000000001 hit the same entry.
+    """
+    if len(spec) != len(SPEC_FIELDS):
+        raise ValueError(f"expected {len(SPEC_FIELDS)} spec values, got {len(spec)}")
+    return tuple(
+        str(value) if field == "company"
+        else int(round(value / SLIDER_STEP)) if field in SPEC_RANGES
+        else int(value)
+        for field, value in zip(SPEC_FIELDS, spec)
+    )
+
+
+# ===============================
+# LRU CACHE
+# ===============================
+class PredictionCache:
+    """Thread-safe, size-bounded LRU of spec key -> predicted price.
+
+    The artifact ``version`` is part of every entry's key, so during a hot
+    reload sessions still on the old version and sessions already on the
+    new one share the cache without invalidating each other; entries of a
+    retired version simply age out of the LRU. :meth:`clear` drops every
+    entry, and results still being computed at that moment are not stored.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._data = OrderedDict()   # (version, key) -> value
+        self._generation = 0         # naik tiap clear(); hasil dari sebelum clear dibuang
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_or_compute(self, key, compute, version=None):
+        key = (version, key)
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            generation = self._generation
+
+        # Hitung di luar lock supaya session lain tidak ikut menunggu
+        value = compute()
+
+        with self._lock:
+            if generation != self._generation:
+                return value
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            if self._data:
+                self.invalidations += 1
+            self._data.clear()
+            self._generation += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,120 @@
+import math
+
+import numpy as np
+
+from feature_schema import SCHEMA, FeatureSchema
+
+# ===============================
+# FEATURE LAYOUT
+# ===============================
+MODEL_PATH = "prediksi_model_linear_TEKREK.pkl"
+SCALER_PATH = "scaler_linear_TEKREK.pkl"
+
+NUMERIC_FEATURES = SCHEMA.numeric
+COMPANY_LIST = SCHEMA.categories
+COMPANY_COLUMNS = SCHEMA.onehot_columns
+
+# Urutan kolom persis seperti saat scaler & model di-fit di notebook
+FEATURE_COLUMNS = SCHEMA.feature_columns
+
+# Kurs asumsi yang ditampilkan di halaman prediksi
+EUR_TO_IDR = 19990
+
+
+# ===============================
+# FUSED LINEAR ENGINE
+# ===============================
+class PredictionEngine:
+    """StandardScaler + LinearRegression folded into one weight vector.
+
+    ``model.predict(scaler.transform(x))`` equals ``x @ (coef / scale) +
+    (intercept - coef @ (mean / scale))``, so the scaler disappears at load
+    time. The one-hot brand columns become a per-brand offset looked up
+    by index instead of being multiplied as zeros; the brand list comes
+    from ``schema`` (the scaler's fitted column names when available).
+    """
+
+    def __init__(self, numeric_weights, brand_offsets, intercept, schema=SCHEMA):
+        self.numeric_weights = np.asarray(numeric_weights, dtype=np.float64)
+        self.brand_offsets = np.asarray(brand_offsets, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.schema = schema
+        if len(self.brand_offsets) != len(schema.categories):
+            raise ValueError(
+                f"Expected {len(schema.categories)} brand offsets, got {len(self.brand_offsets)}"
+            )
+        # Plain Python copies for the single-row path (no NumPy dispatch)
+        self._weights = tuple(float(w) for w in self.numeric_weights)
+        self._offsets = tuple(float(o) for o in self.brand_offsets)
+
+    @classmethod
+    def from_sklearn(cls, model, scaler):
+        names = getattr(scaler, "feature_names_in_", None)
+        schema = FeatureSchema.from_feature_names(names) if names is not None else SCHEMA
+        if schema.numeric != NUMERIC_FEATURES:
+            raise ValueError("Scaler numeric feature order does not match NUMERIC_FEATURES")
+
+        coef = np.ravel(np.asarray(model.coef_, dtype=np.float64))
+        mean = np.asarray(scaler.mean_, dtype=np.float64) if scaler.with_mean else np.zeros_like(coef)
+        scale = np.asarray(scaler.scale_, dtype=np.float64) if scaler.with_std else np.ones_like(coef)
+        return cls.from_arrays(coef, float(np.ravel(model.intercept_)[0]), mean, scale, schema)
+
+    @classmethod
+    def from_arrays(cls, coef, intercept, mean, scale, schema=SCHEMA):
+        """Fold raw regression coefficients and scaler statistics."""
+        coef = np.asarray(coef, dtype=np.float64)
+        if coef.shape[0] != len(schema.feature_columns):
+            raise ValueError(
+                f"Expected {len(schema.feature_columns)} coefficients, got {coef.shape[0]}"
+            )
+        weights = coef / np.asarray(scale, dtype=np.float64)
+        intercept = float(intercept) - float(np.dot(weights, mean))
+        n_num = len(schema.numeric)
+        return cls(weights[:n_num], weights[n_num:], intercept, schema)
+
+    @classmethod
+    def from_files(cls, model_path=MODEL_PATH, scaler_path=SCALER_PATH):
+        import joblib
+        return cls.from_sklearn(joblib.load(model_path), joblib.load(scaler_path))
+
+    def brand_index(self, company):
+        """Index of ``company`` in the schema brands, or -1 for an unknown brand."""
+        return self.schema.index(company)
+
+    def predict(self, inches, cpu, ram, weight, touchscreen,
+                ssd, res_width, res_height, ips, hdd, company):
+        """Price in EUR for a single configuration."""
+        x = (inches, cpu, ram, weight, touchscreen, ssd, res_width, res_height, ips, hdd)
+        terms = [w * v for w, v in zip(self._weights, x)]
+        idx = self.schema.index(company)
+        if idx >= 0:
+            terms.append(self._offsets[idx])
+        terms.append(self.intercept)
+        return math.fsum(terms)
+
+    def predict_batch(self, X_numeric, brand_idx):
+        """Vectorised prediction.
+
+        ``X_numeric`` is an (n, 10) array in NUMERIC_FEATURES order and
+        ``brand_idx`` an (n,) integer array of schema brand codes
+        (-1 = unknown brand, contributes nothing).
+        """
+        X_numeric = np.asarray(X_numeric, dtype=np.float64)
+        brand_idx = np.asarray(brand_idx, dtype=np.intp)
+        out = X_numeric @ self.numeric_weights
+        out += self.intercept
+        known = brand_idx >= 0
+        if known.all():
+            out += self.brand_offsets[brand_idx]
+        else:
+            out[known] += self.brand_offsets[brand_idx[known]]
+        return out
+
+    def max_abs_error(self, model, scaler, X_full):
+        """Largest |engine - sklearn| over the one-hot frame ``X_full``.
+
+        ``X_full`` is a DataFrame with the schema's feature columns.
+        """
+        ours = self.predict_batch(*self.schema.encode(X_full))
+        ref = model.predict(scaler.transform(X_full))
+        return float(np.max(np.abs(ours - ref)))
@@ -0,0 +1,306 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from dataset_stats import DATA_PATH, file_sha256
+from feature_schema import SCHEMA, FeatureSchema
+
+INTERVALS_PATH = "bootstrap_TEKREK.npz"
+INTERVALS_META_PATH = "bootstrap_TEKREK.json"
+INTERVALS_FORMAT_VERSION = 1
+
+N_REPLICAS = 200
+LEVEL = 0.90
+SEED = 42
+# Baris per blok saat menghitung persentil batch: blok (rows × B) tetap di cache
+BLOCK_ROWS = 1024
+
+
+# ===============================
+# BOOTSTRAP FIT
+# ===============================
+def _fit_fused(X, y):
+    """StandardScaler + LinearRegression on ``(X, y)``, folded into
+    ``[weights..., intercept]`` (same fold as ``PredictionEngine``).
+
+    Least squares in the scaled space with the minimum-norm solution, so a
+    column that is constant in a resample (a brand that was not drawn) gets
+    weight 0 just like sklearn would give it.
+    """
+    mean = X.mean(axis=0)
+    scale = X.std(axis=0)
+    scale[scale < 10 * np.finfo(np.float64).eps] = 1.0  # sama dengan sklearn
+    y_mean = y.mean()
+    coef = np.linalg.lstsq((X - mean) / scale, y - y_mean, rcond=None)[0]
+    weights = coef / scale
+    return np.append(weights, y_mean - weights @ mean)
+
+
+def bootstrap_matrix(X, y, n_replicas=N_REPLICAS, seed=SEED):
+    """``(weights, residuals)`` of ``n_replicas`` bootstrap refits.
+
+    ``weights`` is (B, features + 1): one fused row per replica, intercept
+    last, so ``[x, 1] @ weights.T`` gives every replica's price at once.
+    ``residuals`` holds one out-of-bag residual per replica; adding it to
+    that replica's price turns the spread of the coefficients (uncertainty
+    of the mean price) into a prediction interval for a single laptop.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    n = len(X)
+    weights = np.empty((n_replicas, X.shape[1] + 1))
+    residuals = np.empty(n_replicas)
+    for b in range(n_replicas):
+        sample = rng.integers(0, n, n)
+        weights[b] = _fit_fused(X[sample], y[sample])
+        out_of_bag = np.setdiff1d(np.arange(n), sample)
+        j = rng.choice(out_of_bag) if len(out_of_bag) else rng.integers(0, n)
+        residuals[b] = y[j] - (X[j] @ weights[b, :-1] + weights[b, -1])
+    return weights, residuals
+
+
+def training_split(df_final, schema=SCHEMA):
+    """The notebook's 80/20 split of ``data_final1_TEKREK.csv`` as
+    ``(X_train, y_train, X_test, y_test)``, columns in schema order."""
+    from sklearn.model_selection import train_test_split
+
+    from train_pipeline import RANDOM_STATE, TEST_SIZE
+
+    X = df_final[schema.feature_columns].to_numpy(dtype=np.float64)
+    y = df_final[schema.target].to_numpy(dtype=np.float64)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE
+    )
+    return X_train, y_train, X_test, y_test
+
+
+# ===============================
+# SERVING
+# ===============================
+class BootstrapIntervals:
+    """Prediction intervals from a precomputed (B, features + 1) matrix.
+
+    The brand one-hot columns are looked up by index (like the engine's
+    brand offsets), so one interval or a whole batch is a single
+    ``X_numeric @ W_numeric.T`` plus a percentile over the B replicas.
+    """
+
+    def __init__(self, weights, residuals, schema=SCHEMA, level=LEVEL):
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.shape[1] != len(schema.feature_columns) + 1:
+            raise ValueError(
+                f"Expected {len(schema.feature_columns) + 1} columns, got {weights.shape[1]}"
+            )
+        if len(residuals) != len(weights):
+            raise ValueError("Expected one residual per bootstrap replica")
+        self.weights = weights
+        self.residuals = np.asarray(residuals, dtype=np.float64)
+        self.schema = schema
+        self.level = level
+        n_num = len(schema.numeric)
+        self._numeric_t = np.ascontiguousarray(weights[:, :n_num].T)   # (10, B)
+        # Baris brand: offset per brand + intercept + residual; baris terakhir = brand referensi
+        base = weights[:, -1] + self.residuals
+        self._brand_rows = np.vstack([weights[:, n_num:-1].T + base, base])  # (brands + 1, B)
+
+    def __len__(self):
+        return len(self.weights)
+
+    def _quantile_positions(self, level):
+        """Sorted positions and interpolation weights of the lower/upper
+        percentile (NumPy's default "linear" method) among B replicas."""
+        level = self.level if level is None else level
+        pos = np.array([(1 - level) / 2, (1 + level) / 2]) * (len(self) - 1)
+        below = np.floor(pos).astype(np.intp)
+        above = np.minimum(below + 1, len(self) - 1)
+        return below, above, pos - below
+
+    def replicas(self, X_numeric, brand_idx):
+        """(n, B) price of every row under every bootstrap replica (+ residual)."""
+        X_numeric = np.asarray(X_numeric, dtype=np.float64)
+        brand_idx = np.asarray(brand_idx, dtype=np.intp)
+        # -1 (brand tidak dikenal / referensi) -> baris terakhir
+        return X_numeric @ self._numeric_t + self._brand_rows[brand_idx]
+
+    def interval_batch(self, X_numeric, brand_idx, level=None, block_rows=BLOCK_ROWS):
+        """``(lower, upper)`` arrays in EUR for ``predict_batch``-style input.
+
+        Same values as ``np.percentile(replicas, [lo, hi], axis=1)``, but
+        only the four order statistics needed are placed (one in-place
+        ``partition`` per block instead of a full percentile pass).
+        """
+        X_numeric = np.asarray(X_numeric, dtype=np.float64)
+        brand_idx = np.asarray(brand_idx, dtype=np.intp)
+        below, above, frac = self._quantile_positions(level)
+        kth = np.unique(np.concatenate([below, above]))
+        out = np.empty((len(X_numeric), 2))
+        for start in range(0, len(X_numeric), block_rows):
+            stop = start + block_rows
+            prices = self.replicas(X_numeric[start:stop], brand_idx[start:stop])
+            prices.partition(kth, axis=1)
+            out[start:stop] = prices[:, below] * (1 - frac) + prices[:, above] * frac
+        return out[:, 0], out[:, 1]
+
+    def interval(self, inches, cpu, ram, weight, touchscreen,
+                 ssd, res_width, res_height, ips, hdd, company, level=None):
+        """``(lower, upper)`` in EUR for one configuration (``predict()`` arguments)."""
+        x = ((inches, cpu, ram, weight, touchscreen, ssd, res_width, res_height, ips, hdd),)
+        lower, upper = self.interval_batch(x, [self.schema.index(company)], level)
+        return float(lower[0]), float(upper[0])
+
+    # -------------------------------
+    # PERSISTENCE
+    # -------------------------------
+    def save(self, path=INTERVALS_PATH, meta_path=INTERVALS_META_PATH, **meta):
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp, weights=self.weights, residuals=self.residuals)
+        os.replace(tmp, path)
+        meta = {
+            "format_version": INTERVALS_FORMAT_VERSION,
+            "replicas": len(self),
+            "level": self.level,
+            "feature_names": self.schema.feature_columns,
+            "numeric_features": self.schema.numeric,
+            "categories": self.schema.categories,
+            **meta,
+        }
+        tmp = f"{meta_path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(meta, f, indent=1)
+        os.replace(tmp, meta_path)
+        return meta
+
+    @classmethod
+    def open(cls, path=INTERVALS_PATH, meta_path=INTERVALS_META_PATH):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get("format_version") != INTERVALS_FORMAT_VERSION:
+            raise ValueError(f"Unsupported interval format {meta.get('format_version')}")
+        schema = FeatureSchema(meta["numeric_features"], meta["categories"])
+        if schema.feature_columns != meta["feature_names"]:
+            raise ValueError("Interval feature layout does not match its metadata")
+        with np.load(path) as arrays:
+            weights, residuals = arrays["weights"], arrays["residuals"]
+        if weights.shape != (meta["replicas"], len(schema.feature_columns) + 1):
+            raise ValueError("Interval matrix does not match its metadata")
+        return cls(weights, residuals, schema, meta["level"]), meta
+
+
+def build_intervals(df_final, schema=SCHEMA, n_replicas=N_REPLICAS, seed=SEED, level=LEVEL):
+    X_train, y_train, _, _ = training_split(df_final, schema)
+    weights, residuals = bootstrap_matrix(X_train, y_train, n_replicas, seed)
+    return BootstrapIntervals(weights, residuals, schema, level)
+
+
+def write_intervals(df_final, path=INTERVALS_PATH, meta_path=INTERVALS_META_PATH,
+                    dataset_sha256=None, schema=SCHEMA, n_replicas=N_REPLICAS, seed=SEED):
+    """Fit the bootstrap replicas for ``df_final`` and save them (training time)."""
+    intervals = build_intervals(df_final, schema, n_replicas, seed)
+    intervals.save(path, meta_path, seed=seed, dataset_sha256=dataset_sha256)
+    return intervals
+
+
+def open_intervals_if_current(dataset_sha256, schema=SCHEMA, path=INTERVALS_PATH,
+                              meta_path=INTERVALS_META_PATH):
+    """Saved intervals if they were fitted on ``dataset_sha256`` with the
+    ``schema`` layout, else None. Never fits: serving reads what training
+    (or ``prediction_intervals.py build``) wrote."""
+    if not (os.path.exists(path) and os.path.exists(meta_path)):
+        return None
+    try:
+        intervals, meta = BootstrapIntervals.open(path, meta_path)
+    except ValueError:
+        return None
+    if meta.get("dataset_sha256") != dataset_sha256 or meta["feature_names"] != schema.feature_columns:
+        return None
+    return intervals
+
+
+def load_or_build_intervals(df, data_path=DATA_PATH, path=INTERVALS_PATH,
+                            meta_path=INTERVALS_META_PATH, dataset_sha256=None, schema=SCHEMA):
+    """Intervals for the current dataset; read from disk when the recorded
+    dataset hash and feature layout match, otherwise refit from ``df`` and
+    saved (offline tools only; the app uses :func:`open_intervals_if_current`).
+    ``dataset_sha256`` is the hash of the CSV ``df`` was read from (default:
+    hash ``data_path`` now); ``schema`` is the serving model's layout."""
+    digest = dataset_sha256 or file_sha256(data_path)
+    intervals = open_intervals_if_current(digest, schema, path, meta_path)
+    if intervals is not None:
+        return intervals
+    intervals = build_intervals(df, schema)
+    try:
+        intervals.save(path, meta_path, seed=SEED, dataset_sha256=digest)
+    except OSError:
+        pass
+    return intervals
+
+
+# ===============================
+# CLI
+# ===============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bootstrap prediction intervals")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="fit the bootstrap matrix for the current dataset")
+    build.add_argument("--replicas", type=int, default=N_REPLICAS)
+    build.add_argument("--seed", type=int, default=SEED)
+    sub.add_parser("check", help="interval coverage on the held-out 20 %% split")
+    bench = sub.add_parser("bench", help="one matmul + percentile vs B model calls")
+    bench.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    from dataset_store import load_dataset
+    from prediction_engine import PredictionEngine
+
+    df = load_dataset()
+    if args.command == "build":
+        start = time.perf_counter()
+        intervals = write_intervals(df, dataset_sha256=file_sha256(DATA_PATH),
+                                    n_replicas=args.replicas, seed=args.seed)
+        print(f"{len(intervals)} replicas x {intervals.weights.shape[1]} in "
+              f"{time.perf_counter() - start:.2f}s -> {INTERVALS_PATH}")
+        return
+
+    intervals = load_or_build_intervals(df)
+    if args.command == "check":
+        X_train, y_train, X_test, y_test = training_split(df)
+        n_num = len(SCHEMA.numeric)
+        for name, X, y in (("train", X_train, y_train), ("test", X_test, y_test)):
+            onehot = X[:, n_num:]
+            codes = np.where(onehot.any(axis=1), onehot.argmax(axis=1), -1)
+            lower, upper = intervals.interval_batch(X[:, :n_num], codes)
+            covered = np.mean((y >= lower) & (y <= upper))
+            print(f"{name:<6} {len(y):>6,} rows  coverage {covered:.1%} "
+                  f"(target {intervals.level:.0%})  median width €{np.median(upper - lower):,.0f}")
+        return
+
+    X_numeric, codes = SCHEMA.encode(df)
+    reps = -(-args.rows // len(X_numeric))
+    X_numeric, codes = np.tile(X_numeric, (reps, 1))[:args.rows], np.tile(codes, reps)[:args.rows]
+    spec = (15.6, 2.5, 8, 2.0, 0, 256, 1920, 1080, 1, 500, "Dell")
+    engines = [PredictionEngine.from_arrays(w[:-1], w[-1], np.zeros(len(w) - 1),
+                                            np.ones(len(w) - 1)) for w in intervals.weights]
+
+    def timed(fn, repeats=20):
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return float(np.median(times))
+
+    print(f"{len(intervals)} replicas")
+    print(f"{'one config: B predict()':<36} {timed(lambda: [e.predict(*spec) for e in engines]) * 1e6:>10.1f} µs")
+    print(f"{'one config: matmul + percentile':<36} {timed(lambda: intervals.interval(*spec)) * 1e6:>10.1f} µs")
+    print(f"{f'{args.rows:,} rows: B predict_batch':<36} "
+          f"{timed(lambda: np.percentile([e.predict_batch(X_numeric, codes) for e in engines], [5, 95], axis=0), 3) * 1e3:>10.1f} ms")
+    print(f"{f'{args.rows:,} rows: interval_batch':<36} "
+          f"{timed(lambda: intervals.interval_batch(X_numeric, codes), 3) * 1e3:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+import argparse
+import json
+import math
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from feature_schema import REFERENCE_COMPANY, SPEC_FIELDS, SPEC_NUMERIC_FIELDS
+from model_artifact import ARTIFACT_PATH, load_engine
+from prediction_engine import EUR_TO_IDR, MODEL_PATH, SCALER_PATH
+
+
+
+# ===============================
+# MICRO-BATCHING
+# ===============================
+class MicroBatcher:
+    """Coalesce concurrent prediction requests into one matrix multiply.
+
+    Handler threads call :meth:`submit` and block on the returned future.
+    A single worker thread takes the first pending request, then keeps
+    draining the queue until ``max_batch_size`` rows are collected or
+    ``max_wait_ms`` has passed, and answers the whole batch with one
+    ``engine.predict_batch`` call.
+    """
+
+    def __init__(self, engine, max_batch_size=256, max_wait_ms=2.0):
+        self.engine = engine
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self.batches = 0
+        self.rows = 0
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._queue.put(None)
+        self._thread.join()
+
+    def submit(self, X_numeric, brand_idx):
+        """Queue ``len(brand_idx)`` rows; the future resolves to their prices."""
+        future = Future()
+        self._queue.put((X_numeric, brand_idx, future))
+        return future
+
+    def _run(self):
+        while not self._stop.is_set():
+            item = self._queue.get()
+            if item is None:
+                break
+            pending = [item]
+            n_rows = len(item[1])
+            deadline = time.perf_counter() + self.max_wait
+            while n_rows < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._stop.set()
+                    break
+                pending.append(item)
+                n_rows += len(item[1])
+            self._predict(pending)
+
+    def _predict(self, pending):
+        try:
+            X = np.concatenate([p[0] for p in pending])
+            idx = np.concatenate([p[1] for p in pending])
+            prices = self.engine.predict_batch(X, idx)
+        except Exception as e:
+            for _, _, future in pending:
+                future.set_exception(e)
+            return
+        self.batches += 1
+        self.rows += len(idx)
+        start = 0
+        for X_part, _, future in pending:
+            end = start + len(X_part)
+            future.set_result(prices[start:end])
+            start = end
+
+
+# ===============================
+# HTTP HANDLER
+# ===============================
+def parse_specs(payload, engine):
+    """JSON object or list of objects -> ``(X_numeric, brand_idx)``."""
+    specs = payload if isinstance(payload, list) else [payload]
+    if not specs:
+        raise ValueError("empty request")
+    X = np.empty((len(specs), len(SPEC_NUMERIC_FIELDS)), dtype=np.float64)
+    idx = np.empty(len(specs), dtype=np.intp)
+    for i, spec in enumerate(specs):
+        if not isinstance(spec, dict):
+            raise ValueError("each spec must be a JSON object")
+        missing = [f for f in SPEC_FIELDS if f not in spec]
+        if missing:
+            raise ValueError(f"missing fields: {', '.join(missing)}")
+        try:
+            X[i] = [float(spec[f]) for f in SPEC_NUMERIC_FIELDS]
+        except (TypeError, ValueError):
+            raise ValueError("spec fields must be numeric") from None
+        bad = [f for f, v in zip(SPEC_NUMERIC_FIELDS, X[i]) if not math.isfinite(v)]
+        if bad:
+            raise ValueError(f"fields must be finite numbers: {', '.join(bad)}")
+        company = spec["company"]
+        # Brand tak dikenal jangan diam-diam dihargai sebagai Acer (-1)
+        if not isinstance(company, str):
+            raise ValueError("company must be a string")
+        idx[i] = engine.brand_index(company)
+        if idx[i] < 0 and company != REFERENCE_COMPANY:
+            raise ValueError(f"unknown company: {company!r}")
+    return X, idx
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # header & body ditulis terpisah
+    batcher = None  # diisi oleh make_server()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {
+                "status": "ok",
+                "batches": self.batcher.batches,
+                "rows": self.batcher.rows,
+            })
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/predict":
+            self._send_json(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length))
+            X, idx = parse_specs(payload, self.batcher.engine)
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        try:
+            prices = self.batcher.submit(X, idx).result()
+        except Exception as e:
+            self._send_json(500, {"error": f"prediction failed: {e}"})
+            return
+        results = [
+            {"price_eur": float(p), "price_idr": float(p) * EUR_TO_IDR} for p in prices
+        ]
+        self._send_json(200, results if isinstance(payload, list) else results[0])
+
+
+class PredictionHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # default 5 terlalu kecil untuk banyak klien
+
+
+def make_server(engine, host="127.0.0.1", port=8000, max_batch_size=256, max_wait_ms=2.0):
+    batcher = MicroBatcher(engine, max_batch_size, max_wait_ms).start()
+    handler = type("BoundPredictionHandler", (PredictionHandler,), {"batcher": batcher})
+    server = PredictionHTTPServer((host, port), handler)
+    return server, batcher
+
+
+# ===============================
+# CLI
+# ===============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="JSON prediction server with micro-batching")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--scaler", default=SCALER_PATH)
+    parser.add_argument("--artifact", default=ARTIFACT_PATH)
+    args = parser.parse_args(argv)
+
+    engine = load_engine(args.model, args.scaler, args.artifact)
+    server, batcher = make_server(
+        engine, args.host, args.port, args.max_batch_size, args.max_wait_ms
+    )
+    print(f"Serving on http://{args.host}:{args.port} (POST /predict, GET /health)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.stop()
+
+
+if __name__ == "__main__":
+    main()
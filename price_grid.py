@@ -0,0 +1,249 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from feature_schema import SPEC_NUMERIC_FIELDS, SPEC_OPTIONS, SPEC_RANGES
+from prediction_engine import COMPANY_LIST, MODEL_PATH, SCALER_PATH
+
+GRID_PATH = "price_grid_TEKREK.npy"
+GRID_META_PATH = "price_grid_TEKREK.json"
+
+BLOCK_CELLS = 1 << 20
+
+# ===============================
+# GRID AXES
+# ===============================
+# Urutan axis = urutan dimensi tensor. Slider (cpu, inches, weight) ditaruh
+# paling dalam dan disimpan sebagai integer persepuluhan (15.6 -> 156).
+SLIDER_AXES = tuple(SPEC_RANGES)
+
+
+def _tenths(lo, hi, step=1):
+    return list(range(lo, hi + 1, step))
+
+
+FULL_AXES = {
+    "company": list(COMPANY_LIST),
+    **{field: list(options) for field, options in SPEC_OPTIONS.items()},
+    **{field: _tenths(round(lo * 10), round(hi * 10)) for field, (lo, hi) in SPEC_RANGES.items()},
+}
+
+# Grid penuh ~42.7 GB; default build memakai slider yang lebih kasar
+PARTIAL_AXES = dict(
+    FULL_AXES,
+    cpu=_tenths(10, 50, 5),
+    inches=[116, 125, 133, 140, 156, 173],
+    weight=_tenths(10, 40, 5),
+)
+
+# Kolom NUMERIC_FEATURES -> nama axis
+_NUMERIC_AXES = SPEC_NUMERIC_FIELDS
+
+
+def estimate_size(axes):
+    """Number of cells and float32 bytes for a grid over ``axes``."""
+    cells = int(np.prod([len(v) for v in axes.values()], dtype=np.float64))
+    return cells, cells * np.dtype(np.float32).itemsize
+
+
+def artifact_sha256(*paths):
+    h = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+# ===============================
+# BUILD
+# ===============================
+def build_grid(engine, axes, path=GRID_PATH, meta_path=GRID_META_PATH,
+               model_sha256=None, block_cells=BLOCK_CELLS, progress=None):
+    """Enumerate every cell of ``axes`` and write the float32 price tensor.
+
+    Cells are generated in flat blocks of ``block_cells`` with
+    ``np.unravel_index`` and priced with one ``predict_batch`` per block, so
+    memory stays bounded regardless of grid size.
+    """
+    names = list(axes)
+    shape = tuple(len(axes[n]) for n in names)
+    cells = int(np.prod(shape, dtype=np.int64))
+    values = {
+        n: np.asarray(axes[n], dtype=np.float64) / (10.0 if n in SLIDER_AXES else 1.0)
+        for n in names if n != "company"
+    }
+    brand_idx = np.array([engine.brand_index(c) for c in axes["company"]], dtype=np.intp)
+
+    table = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=shape)
+    flat = table.reshape(-1)
+    for start in range(0, cells, block_cells):
+        stop = min(start + block_cells, cells)
+        coords = np.unravel_index(np.arange(start, stop, dtype=np.int64), shape)
+        pos = dict(zip(names, coords))
+        X = np.column_stack([values[n][pos[n]] for n in _NUMERIC_AXES])
+        flat[start:stop] = engine.predict_batch(X, brand_idx[pos["company"]])
+        if progress is not None:
+            progress(stop, cells)
+    table.flush()
+    del table
+
+    with open(meta_path, "w") as f:
+        json.dump({
+            "version": 1,
+            "axes": axes,
+            "shape": shape,
+            "model_sha256": model_sha256,
+        }, f)
+    return cells
+
+
+# ===============================
+# LOOKUP
+# ===============================
+class PriceGrid:
+    """Memory-mapped price tensor; one prediction = one index computation."""
+
+    def __init__(self, table, axes, model_sha256=None):
+        self.table = table
+        self.axes = axes
+        self.model_sha256 = model_sha256
+        self._index = [
+            {v: i for i, v in enumerate(axes[n])} for n in axes
+        ]
+        self._strides = [s // table.itemsize for s in table.strides]
+        self._flat = table.reshape(-1)
+
+    @classmethod
+    def open(cls, path=GRID_PATH, meta_path=GRID_META_PATH):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        table = np.load(path, mmap_mode="r")
+        if list(table.shape) != list(meta["shape"]):
+            raise ValueError("Grid tensor shape does not match its metadata")
+        return cls(table, meta["axes"], meta.get("model_sha256"))
+
+    def lookup(self, inches, cpu, ram, weight, touchscreen,
+               ssd, res_width, res_height, ips, hdd, company):
+        """Price in EUR, or ``None`` if the spec is outside this grid."""
+        key = (
+            company, int(ram), int(ssd), int(hdd), int(res_width), int(res_height),
+            int(ips), int(touchscreen),
+            int(round(cpu * 10)), int(round(inches * 10)), int(round(weight * 10)),
+        )
+        offset = 0
+        for k, index, stride in zip(key, self._index, self._strides):
+            i = index.get(k)
+            if i is None:
+                return None
+            offset += i * stride
+        return float(self._flat[offset])
+
+
+def open_grid_if_current(model_sha256, path=GRID_PATH, meta_path=GRID_META_PATH):
+    """Open the grid only if it exists and was built from ``model_sha256``."""
+    if not (os.path.exists(path) and os.path.exists(meta_path)):
+        return None
+    grid = PriceGrid.open(path, meta_path)
+    if grid.model_sha256 != model_sha256:
+        return None
+    return grid
+
+
+# ===============================
+# CLI
+# ===============================
+def _parse_axis(text):
+    return [int(round(float(v) * 10)) for v in text.split(",")]
+
+
+def _axes_from_args(args):
+    axes = dict(FULL_AXES if args.full else PARTIAL_AXES)
+    for name in SLIDER_AXES:
+        override = getattr(args, name)
+        if override:
+            axes[name] = _parse_axis(override)
+    return axes
+
+
+def benchmark(grid, engine, n=100_000, seed=0):
+    """Per-lookup latency (us) of the grid vs the live engine on in-grid specs."""
+    import joblib
+    import pandas as pd
+    from prediction_engine import FEATURE_COLUMNS
+
+    rng = np.random.default_rng(seed)
+    names = list(grid.axes)
+    picks = {n_: rng.integers(0, len(grid.axes[n_]), size=n) for n_ in names}
+    specs = []
+    for j in range(n):
+        v = {n_: grid.axes[n_][picks[n_][j]] for n_ in names}
+        specs.append((
+            v["inches"] / 10, v["cpu"] / 10, v["ram"], v["weight"] / 10, v["touchscreen"],
+            v["ssd"], v["res_width"], v["res_height"], v["ips"], v["hdd"], v["company"],
+        ))
+
+    results = {}
+    start = time.perf_counter()
+    grid_prices = [grid.lookup(*s) for s in specs]
+    results["grid_us"] = (time.perf_counter() - start) / n * 1e6
+
+    start = time.perf_counter()
+    engine_prices = [engine.predict(*s) for s in specs]
+    results["engine_us"] = (time.perf_counter() - start) / n * 1e6
+
+    model, scaler = joblib.load(MODEL_PATH), joblib.load(SCALER_PATH)
+    m = min(n, 500)
+    start = time.perf_counter()
+    for s in specs[:m]:
+        onehot = [1 if c == s[10] else 0 for c in COMPANY_LIST]
+        row = pd.DataFrame([list(s[:10]) + onehot], columns=FEATURE_COLUMNS)
+        model.predict(scaler.transform(row))
+    results["sklearn_dataframe_us"] = (time.perf_counter() - start) / m * 1e6
+
+    results["max_abs_diff_eur"] = float(np.max(np.abs(
+        np.asarray(grid_prices) - np.asarray(engine_prices)
+    )))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precomputed configuration-grid price table")
+    parser.add_argument("command", choices=["estimate", "build", "bench"])
+    parser.add_argument("--full", action="store_true", help="every 0.1 slider step (~42.7 GB)")
+    for name in SLIDER_AXES:
+        parser.add_argument(f"--{name}", help=f"comma separated {name} values, e.g. 13.3,15.6")
+    parser.add_argument("--output", default=GRID_PATH)
+    parser.add_argument("--meta", default=GRID_META_PATH)
+    args = parser.parse_args(argv)
+
+    axes = _axes_from_args(args)
+    cells, nbytes = estimate_size(axes)
+    full_cells, full_bytes = estimate_size(FULL_AXES)
+    print(f"grid: {cells:,} cells, {nbytes / 1e6:,.1f} MB "
+          f"(full grid: {full_cells:,} cells, {full_bytes / 1e9:,.1f} GB)")
+    if args.command == "estimate":
+        return
+
+    from model_artifact import artifact_source_sha256, load_engine
+
+    engine = load_engine()
+    if args.command == "build":
+        start = time.perf_counter()
+        build_grid(
+            engine, axes, args.output, args.meta,
+            model_sha256=artifact_source_sha256(),
+        )
+        elapsed = time.perf_counter() - start
+        print(f"built in {elapsed:.1f}s ({cells / elapsed:,.0f} cells/sec) -> {args.output}")
+    else:
+        grid = PriceGrid.open(args.output, args.meta)
+        for k, v in benchmark(grid, engine).items():
+            print(f"{k:>22}: {v:.4f}")
+
+
+if __name__ == "__main__":
+    main()
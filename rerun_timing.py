@@ -0,0 +1,90 @@
+import argparse
+import functools
+import time
+from collections import defaultdict
+
+import numpy as np
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+# ===============================
+# FRAGMENT TIMING
+# ===============================
+# AppTest selalu menjalankan seluruh script, jadi durasi body fragment
+# diukur terpisah: itulah kerja yang dilakukan saat fragment rerun sendiri.
+FRAGMENT_TIMES = defaultdict(list)
+_st_fragment = st.fragment
+
+
+def _timed_fragment(func=None, **kwargs):
+    if func is None:
+        return lambda f: _timed_fragment(f, **kwargs)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kw):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kw)
+        finally:
+            FRAGMENT_TIMES[func.__name__].append(time.perf_counter() - start)
+
+    return _st_fragment(wrapper, **kwargs)
+
+
+st.fragment = _timed_fragment
+
+
+def _interactions():
+    # (nama, halaman, fragment, aksi); widget dicari lewat key, bukan posisi,
+    # karena urutannya bergeser saat widget baru ditambahkan
+    return [
+        ("Prediksi: CPU slider", "🔮 Prediksi", "prediction_page",
+         lambda at: at.slider(key="cpu").set_value(3.1)),
+        ("Prediksi: RAM select", "🔮 Prediksi", "prediction_page",
+         lambda at: at.selectbox(key="ram").set_value(12)),
+        ("Prediksi: button", "🔮 Prediksi", "prediction_page",
+         lambda at: at.button(key="predict").click()),
+        ("Analisis: price slider", "📊 Analisis", "analytics_page",
+         lambda at: at.slider(key="price_range").set_value((500.0, 1500.0))),
+        ("Analisis: RAM filter", "📊 Analisis", "analytics_page",
+         lambda at: at.multiselect(key="ram_filter").set_value([4, 8])),
+    ]
+
+
+def measure(app_path="app.py", repeats=10):
+    rows = []
+    for name, page, fragment, action in _interactions():
+        full, frag = [], []
+        for _ in range(repeats):
+            at = AppTest.from_file(app_path, default_timeout=60)
+            at.run()
+            at.sidebar.radio(key="page").set_value(page).run()
+            FRAGMENT_TIMES.clear()
+            action(at)
+            start = time.perf_counter()
+            at.run()
+            full.append(time.perf_counter() - start)
+            frag.append(sum(FRAGMENT_TIMES[fragment]))
+        rows.append({
+            "interaction": name,
+            "full_rerun_ms": float(np.median(full) * 1000),
+            "fragment_rerun_ms": float(np.median(frag) * 1000),
+        })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Full-script vs fragment rerun time per interaction")
+    parser.add_argument("--app", default="app.py")
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    print(f"{'interaction':<24} {'full rerun ms':>14} {'fragment ms':>12} {'saved':>7}")
+    for r in measure(args.app, args.repeats):
+        saved = 1 - r["fragment_rerun_ms"] / r["full_rerun_ms"]
+        print(f"{r['interaction']:<24} {r['full_rerun_ms']:>14.1f} "
+              f"{r['fragment_rerun_ms']:>12.1f} {saved:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
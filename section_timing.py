@@ -0,0 +1,226 @@
+import argparse
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+
+# Opt-in: APP_TIMING=1 mengaktifkan timing, APP_TIMING_FILE=path menulis dump Prometheus
+TIMING_ENABLED = os.environ.get("APP_TIMING", "0").lower() in ("1", "true", "yes")
+TIMING_FILE = os.environ.get("APP_TIMING_FILE") or None
+
+WINDOW = 1024
+QUANTILES = (0.5, 0.95, 0.99)
+EXPORT_INTERVAL_S = 5.0
+METRIC_NAME = "app_section_seconds"
+
+_DISABLED = nullcontext()
+
+
+# ===============================
+# STORE
+# ===============================
+class SectionTimings:
+    """Thread-safe store of wall times per named section.
+
+    Every section keeps its last ``window`` samples in a ring buffer
+    (percentiles are computed from those on read, never on record) plus an
+    all-time count and sum. When ``enabled`` is false :meth:`section`
+    returns a shared no-op context manager and nothing is recorded.
+    """
+
+    def __init__(self, enabled=False, window=WINDOW, export_path=None,
+                 export_interval=EXPORT_INTERVAL_S):
+        self.enabled = enabled
+        self.window = window
+        self.export_path = export_path
+        self.export_interval = export_interval
+        self._samples = {}
+        self._lock = threading.Lock()
+        self._last_export = 0.0
+
+    def record(self, name, seconds):
+        with self._lock:
+            entry = self._samples.get(name)
+            if entry is None:
+                entry = self._samples[name] = {
+                    "ring": np.empty(self.window), "count": 0, "sum": 0.0, "last": 0.0,
+                }
+            entry["ring"][entry["count"] % self.window] = seconds
+            entry["count"] += 1
+            entry["sum"] += seconds
+            entry["last"] = seconds
+
+    def section(self, name):
+        """``with timings.section("name"):`` times the block (no-op when disabled)."""
+        if not self.enabled:
+            return _DISABLED
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timed(self, name):
+        """Decorator version of :meth:`section`; checks ``enabled`` per call."""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self._timed(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def now(self):
+        """Start mark for :meth:`record_since` (``None`` when disabled)."""
+        return time.perf_counter() if self.enabled else None
+
+    def record_since(self, name, start):
+        if start is not None:
+            self.record(name, time.perf_counter() - start)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+    # -------------------------------
+    # READ / EXPORT
+    # -------------------------------
+    def snapshot(self, quantiles=QUANTILES):
+        """One row per section: rolling percentiles (seconds) over the
+        window, all-time count/sum and the last sample."""
+        with self._lock:
+            entries = [(name, e["ring"][:min(e["count"], self.window)].copy(),
+                        e["count"], e["sum"], e["last"])
+                       for name, e in self._samples.items()]
+        rows = []
+        for name, window, count, total, last in sorted(entries):
+            row = {"section": name, "count": count, "sum": total, "last": last}
+            for q, value in zip(quantiles, np.quantile(window, quantiles)):
+                row[f"p{q * 100:g}"] = float(value)
+            rows.append(row)
+        return rows
+
+    def prometheus_text(self, quantiles=QUANTILES):
+        """Snapshot in the Prometheus text exposition format (a summary)."""
+        lines = [
+            f"# HELP {METRIC_NAME} Wall time of named app.py sections "
+            f"(quantiles over the last {self.window} runs).",
+            f"# TYPE {METRIC_NAME} summary",
+        ]
+        for row in self.snapshot(quantiles):
+            label = _escape_label(row["section"])
+            for q in quantiles:
+                lines.append(f'{METRIC_NAME}{{section="{label}",quantile="{q:g}"}} '
+                             f'{row[f"p{q * 100:g}"]:.9g}')
+            lines.append(f'{METRIC_NAME}_sum{{section="{label}"}} {row["sum"]:.9g}')
+            lines.append(f'{METRIC_NAME}_count{{section="{label}"}} {row["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp, path)
+
+    def maybe_export(self):
+        """Write ``export_path`` at most once per ``export_interval`` seconds."""
+        if not (self.enabled and self.export_path):
+            return False
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_export < self.export_interval:
+                return False
+            self._last_export = now
+        self.write_prometheus(self.export_path)
+        return True
+
+
+def _escape_label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Satu store per proses: dipakai bersama oleh semua session
+TIMINGS = SectionTimings(enabled=TIMING_ENABLED, export_path=TIMING_FILE)
+
+
+# ===============================
+# CLI
+# ===============================
+def overhead_ns(n=200_000):
+    """Per-``with`` cost of a disabled and an enabled section, minus an empty loop."""
+    def loop(store):
+        start = time.perf_counter_ns()
+        for _ in range(n):
+            with store.section("x"):
+                pass
+        return (time.perf_counter_ns() - start) / n
+
+    start = time.perf_counter_ns()
+    for _ in range(n):
+        pass
+    base = (time.perf_counter_ns() - start) / n
+    return {
+        "disabled": loop(SectionTimings(enabled=False)) - base,
+        "enabled": loop(SectionTimings(enabled=True)) - base,
+    }
+
+
+def profile(app_path="app.py", repeats=5):
+    """Run every page (and a prediction) under AppTest with timing on."""
+    from streamlit.testing.v1 import AppTest
+
+    # app.py meng-import modul ini sebagai "section_timing", bukan "__main__"
+    from section_timing import TIMINGS
+
+    TIMINGS.enabled = True
+    TIMINGS.reset()
+    at = AppTest.from_file(app_path, default_timeout=120)
+    at.run()
+    for page in ("🏠 Dashboard", "📊 Analisis", "🔮 Prediksi"):
+        at.sidebar.radio(key="page").set_value(page).run()
+        for _ in range(repeats):
+            at.run()
+    for _ in range(repeats):
+        at.button(key="predict").click().run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return TIMINGS
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-section timing of app.py")
+    sub = parser.add_subparsers(dest="command", required=True)
+    prof = sub.add_parser("profile", help="time every section over AppTest reruns")
+    prof.add_argument("--app", default="app.py")
+    prof.add_argument("--repeats", type=int, default=5)
+    prof.add_argument("--prometheus", metavar="PATH",
+                      help="also write the Prometheus text dump to PATH")
+    sub.add_parser("overhead", help="cost of one section when disabled / enabled")
+    args = parser.parse_args(argv)
+
+    if args.command == "overhead":
+        for state, ns in overhead_ns().items():
+            print(f"{state:<9} {ns:>8.0f} ns per section")
+        return
+
+    timings = profile(args.app, args.repeats)
+    print(f"{'section':<34} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for row in sorted(timings.snapshot(), key=lambda r: -r["p50"]):
+        print(f"{row['section']:<34} {row['count']:>6} {row['p50'] * 1000:>9.2f} "
+              f"{row['p95'] * 1000:>9.2f} {row['p99'] * 1000:>9.2f}")
+    if args.prometheus:
+        timings.write_prometheus(args.prometheus)
+        print(f"-> {args.prometheus}")
+
+
+if __name__ == "__main__":
+    main()
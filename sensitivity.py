@@ -0,0 +1,116 @@
+import argparse
+import functools
+import time
+
+import numpy as np
+import pandas as pd
+
+from feature_schema import SPEC_FIELDS, SPEC_NUMERIC_FIELDS, SPEC_OPTIONS, slider_values
+
+# Opsi yang sama dengan form di halaman prediksi: nama kurva -> (field spec, nilai)
+SWEEPS = {
+    "CPU (GHz)": ("cpu", slider_values("cpu")),
+    "RAM (GB)": ("ram", SPEC_OPTIONS["ram"]),
+    "Layar (inci)": ("inches", slider_values("inches")),
+    "SSD (GB)": ("ssd", SPEC_OPTIONS["ssd"]),
+    "HDD (GB)": ("hdd", SPEC_OPTIONS["hdd"]),
+    "Resolution Width": ("res_width", SPEC_OPTIONS["res_width"]),
+    "Resolution Height": ("res_height", SPEC_OPTIONS["res_height"]),
+    "Berat (kg)": ("weight", slider_values("weight")),
+}
+BRAND_SWEEP = "Brand"
+
+
+# ===============================
+# SWEEP MATRIX
+# ===============================
+@functools.lru_cache(maxsize=8)
+def _sweep_layout(categories, sweeps_key):
+    """Spec-independent part of the sweep: per numeric row the column it
+    changes and the value it takes, plus the ``input``/``value``/``label``
+    columns (brand rows last)."""
+    sweeps = dict(sweeps_key)
+    columns, values, inputs, labels = [], [], [], []
+    for name, (field, options) in sweeps.items():
+        options = np.asarray(options, dtype=np.float64)
+        columns.append(np.full(len(options), SPEC_FIELDS.index(field)))
+        values.append(options)
+        inputs += [name] * len(options)
+        labels += [f"{v:g}" for v in options]
+    columns, values = np.concatenate(columns), np.concatenate(values)
+    static = {
+        "input": np.array(inputs + [BRAND_SWEEP] * len(categories), dtype=object),
+        "value": np.concatenate([values, np.full(len(categories), np.nan)]),
+        "label": np.array(labels + list(categories), dtype=object),
+    }
+    return columns, values, static
+
+
+def sweep_matrix(spec, schema, sweeps=SWEEPS):
+    """Every one-input-at-a-time variation of ``spec`` as one batch.
+
+    Returns ``(X_numeric, brand_idx, rows)``: the rows for
+    ``PredictionEngine.predict_batch`` (each sweep holds all other inputs
+    at ``spec``, the last block sweeps every schema brand) and the
+    ``input``, ``value``, ``label`` and ``current`` column arrays.
+    """
+    sweeps_key = tuple((name, (field, tuple(options))) for name, (field, options) in sweeps.items())
+    columns, values, static = _sweep_layout(tuple(schema.categories), sweeps_key)
+    base = np.asarray(spec[:len(SPEC_NUMERIC_FIELDS)], dtype=np.float64)
+    code = schema.index(spec[-1])
+    n_numeric, n_brands = len(values), len(schema.categories)
+
+    X_numeric = np.tile(base, (n_numeric + n_brands, 1))
+    X_numeric[np.arange(n_numeric), columns] = values
+    brand_idx = np.full(len(X_numeric), code, dtype=np.intp)
+    brand_idx[n_numeric:] = np.arange(n_brands)
+
+    rows = dict(static, current=np.concatenate([np.isclose(values, base[columns]),
+                                                np.arange(n_brands) == code]))
+    return X_numeric, brand_idx, rows
+
+
+def sensitivity(engine, spec, sweeps=SWEEPS):
+    """Long frame of the ``sweep_matrix`` rows plus their ``Price``, all
+    from one ``predict_batch`` call."""
+    X_numeric, brand_idx, rows = sweep_matrix(spec, engine.schema, sweeps)
+    rows["Price"] = engine.predict_batch(X_numeric, brand_idx)
+    return pd.DataFrame(rows, copy=False)
+
+
+# ===============================
+# CLI
+# ===============================
+def _median_us(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)) * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="What-if sweeps around one configuration")
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    from model_artifact import load_engine
+
+    engine = load_engine()
+    spec = (15.6, 2.5, 8, 2.0, 0, 256, 1920, 1080, 1, 500, "Dell")
+    X_numeric, brand_idx, _ = sweep_matrix(spec, engine.schema)
+    rows = [tuple(x) + (engine.schema.categories[b],) for x, b in zip(X_numeric, brand_idx)]
+
+    print(f"{len(rows)} sweep rows over {len(SWEEPS) + 1} inputs")
+    print(f"{'one predict()':<34} {_median_us(lambda: engine.predict(*spec), args.repeats):>10.1f} µs")
+    print(f"{'sweep: predict() per row':<34} "
+          f"{_median_us(lambda: [engine.predict(*r) for r in rows], args.repeats):>10.1f} µs")
+    print(f"{'sweep: one predict_batch':<34} "
+          f"{_median_us(lambda: engine.predict_batch(X_numeric, brand_idx), args.repeats):>10.1f} µs")
+    print(f"{'sweep: matrix + batch + frame':<34} "
+          f"{_median_us(lambda: sensitivity(engine, spec), args.repeats):>10.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+
+PAGES = ["🏠 Dashboard", "📊 Analisis", "🔮 Prediksi"]
+PREDICT_LABEL = "🚀 Prediksi Harga Sekarang!!"
+
+
+# ===============================
+# ONE SESSION (WebSocket protocol)
+# ===============================
+class Session:
+    """One browser tab on a running ``streamlit run app.py``.
+
+    Speaks the same protobuf-over-WebSocket protocol as the frontend:
+    a ``rerun_script`` BackMsg with the current widget states goes out,
+    ForwardMsgs come back until ``script_finished``. Widget ids (and the
+    fragment a widget belongs to) are read from the returned deltas.
+    """
+
+    def __init__(self, url):
+        self.url = url
+        self.ws = None
+        self.widgets = {}   # id -> (jenis, proto, fragment_id)
+        self.values = {}    # id -> fungsi yang mengisi WidgetState
+        self.triggers = set()
+
+    async def connect(self):
+        from tornado.httpclient import HTTPRequest
+        from tornado.websocket import websocket_connect
+
+        request = HTTPRequest(self.url, headers={"Sec-WebSocket-Protocol": "streamlit"})
+        self.ws = await websocket_connect(request, max_message_size=64 * 2**20)
+
+    def close(self):
+        if self.ws is not None:
+            self.ws.close()
+
+    async def rerun(self, fragment_id=""):
+        """Send one rerun; returns (seconds, status name, exceptions seen)."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.fragment_id = fragment_id
+        for widget_id, fill in self.values.items():
+            state = msg.rerun_script.widget_states.widgets.add()
+            state.id = widget_id
+            fill(state)
+        # Tombol hanya "true" untuk satu rerun, seperti di frontend
+        for widget_id in self.triggers:
+            self.values.pop(widget_id, None)
+        self.triggers.clear()
+        if not fragment_id:
+            self.widgets = {}
+
+        start = time.perf_counter()
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+        exceptions = 0
+        while True:
+            raw = await self.ws.read_message()
+            if raw is None:
+                raise ConnectionError("server closed the session")
+            fwd = ForwardMsg()
+            fwd.ParseFromString(raw)
+            kind = fwd.WhichOneof("type")
+            if kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                etype = element.WhichOneof("type")
+                if etype == "exception":
+                    exceptions += 1
+                elif etype in ("radio", "slider", "button", "selectbox", "multiselect"):
+                    proto = getattr(element, etype)
+                    self.widgets[proto.id] = (etype, proto, fwd.delta.fragment_id)
+            elif kind == "script_finished":
+                status = ForwardMsg.ScriptFinishedStatus.Name(fwd.script_finished)
+                if not fragment_id:
+                    # Widget yang tidak ter-render lagi tidak dikirim lagi
+                    self.values = {k: v for k, v in self.values.items() if k in self.widgets}
+                return time.perf_counter() - start, status, exceptions
+
+    def find(self, etype, match):
+        for widget_id, (kind, proto, fragment_id) in self.widgets.items():
+            if kind == etype and match(proto):
+                return widget_id, fragment_id
+        raise LookupError(f"no {etype} widget on the current page")
+
+    def set(self, widget_id, fill, trigger=False):
+        self.values[widget_id] = fill
+        if trigger:
+            self.triggers.add(widget_id)
+
+
+# ===============================
+# JOURNEYS
+# ===============================
+# Satu langkah = satu interaksi user = satu rerun; mengembalikan fragment_id
+def _goto(page):
+    def step(session, rng):
+        widget_id, fragment_id = session.find("radio", lambda w: list(w.options) == PAGES)
+        session.set(widget_id, lambda s: setattr(s, "int_value", PAGES.index(page)))
+        return fragment_id
+    return step
+
+
+def _price_range(session, rng):
+    widget_id, fragment_id = session.find("slider", lambda w: len(w.default) == 2)
+    lo = float(rng.choice(range(200, 1500, 100)))
+    hi = lo + rng.choice((500, 1000, 1500))
+    session.set(widget_id, lambda s: s.double_array_value.data.extend([lo, hi]))
+    return fragment_id
+
+
+def _predict(session, rng):
+    cpu_id, fragment_id = session.find("slider", lambda w: w.min == 1.0 and w.max == 5.0)
+    button_id, _ = session.find("button", lambda w: w.label == PREDICT_LABEL)
+    cpu = round(rng.uniform(1.0, 5.0), 1)
+    session.set(cpu_id, lambda s: s.double_array_value.data.extend([cpu]))
+    session.set(button_id, lambda s: setattr(s, "trigger_value", True), trigger=True)
+    return fragment_id
+
+
+JOURNEY = [
+    ("page Analisis", _goto("📊 Analisis")),
+    ("price slider", _price_range),
+    ("price slider", _price_range),
+    ("page Prediksi", _goto("🔮 Prediksi")),
+    ("predict", _predict),
+    ("predict", _predict),
+    ("page Dashboard", _goto("🏠 Dashboard")),
+]
+
+
+async def _session(url, journeys, seed, start_event, samples, errors):
+    rng = random.Random(seed)
+    session = Session(url)
+    await session.connect()
+    await start_event.wait()
+    try:
+        steps = [("first run", lambda s, r: "")] + JOURNEY * journeys
+        for name, step in steps:
+            seconds, status, exceptions = await session.rerun(step(session, rng))
+            samples.append((name, seconds))
+            if exceptions or not status.startswith("FINISHED_") or "ERROR" in status:
+                errors.append(f"{name}: {status}, {exceptions} exception(s)")
+    except (ConnectionError, LookupError, OSError) as e:
+        errors.append(f"{type(e).__name__}: {e}")
+    finally:
+        session.close()
+
+
+# ===============================
+# SERVER + LOAD LEVELS
+# ===============================
+def _rss_mb(pid, field="VmRSS"):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return float("nan")
+
+
+def start_server(app_path="app.py", port=8599, timeout=60):
+    """``streamlit run app_path`` headless on ``port``; returns the Popen."""
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", app_path, "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        cwd=os.path.dirname(os.path.abspath(app_path)),
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return proc
+        except OSError:
+            if proc.poll() is not None:
+                raise RuntimeError(f"streamlit exited with code {proc.returncode}")
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f"streamlit did not become healthy within {timeout} s")
+
+
+async def _run_level(url, sessions, journeys, seed, pid):
+    samples, errors = [], []
+    start_event = asyncio.Event()
+    tasks = [asyncio.create_task(_session(url, journeys, seed * 10_000 + i,
+                                          start_event, samples, errors))
+             for i in range(sessions)]
+    await asyncio.sleep(0.5)  # semua koneksi terbuka dulu
+    peak = [_rss_mb(pid)] if pid else [float("nan")]
+
+    async def sample_rss():
+        while True:
+            peak.append(_rss_mb(pid))
+            await asyncio.sleep(0.1)
+
+    sampler = asyncio.create_task(sample_rss()) if pid else None
+    start = time.perf_counter()
+    start_event.set()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    if sampler:
+        sampler.cancel()
+    return samples, errors, elapsed, max(peak)
+
+
+def run_level(url, sessions, journeys=2, seed=0, pid=None):
+    """``sessions`` concurrent WebSocket sessions, each doing a first run
+    and then :data:`JOURNEY` ``journeys`` times. Latency is per rerun as
+    seen by the client (send -> ``script_finished``)."""
+    samples, errors, elapsed, peak_rss = asyncio.run(
+        _run_level(url, sessions, journeys, seed, pid))
+    lat_ms = np.array([s for _, s in samples] or [np.nan]) * 1000
+    steps = {}
+    for name, s in samples:
+        steps.setdefault(name, []).append(s * 1000)
+    return {
+        "sessions": sessions,
+        "reruns": len(samples),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "throughput_rps": len(samples) / elapsed,
+        "p50_ms": float(np.percentile(lat_ms, 50)),
+        "p95_ms": float(np.percentile(lat_ms, 95)),
+        "p99_ms": float(np.percentile(lat_ms, 99)),
+        "server_rss_mb": _rss_mb(pid) if pid else None,
+        "server_peak_rss_mb": peak_rss if pid else None,
+        "step_p50_ms": {name: float(np.median(v)) for name, v in steps.items()},
+    }
+
+
+def saturation_point(results, min_gain=1.1):
+    """Session count after which more sessions add < 10 % throughput."""
+    for prev, cur in zip(results, results[1:]):
+        if cur["throughput_rps"] < prev["throughput_rps"] * min_gain:
+            return prev["sessions"]
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Concurrent-session load test for app.py (Streamlit WebSocket protocol)")
+    parser.add_argument("--app", default="app.py")
+    parser.add_argument("--port", type=int, default=8599)
+    parser.add_argument("--url", help="existing server, e.g. ws://127.0.0.1:8501/_stcore/stream "
+                                      "(default: start one for --app)")
+    parser.add_argument("--pid", type=int, help="server pid for memory readings (with --url)")
+    parser.add_argument("--sessions", default="1,4,16,64",
+                        help="comma separated concurrency levels")
+    parser.add_argument("--journeys", type=int, default=2,
+                        help="journeys per session at each level")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.url:
+        url, pid = args.url, args.pid
+    else:
+        server = start_server(args.app, args.port)
+        url, pid = f"ws://127.0.0.1:{args.port}/_stcore/stream", server.pid
+    try:
+        # Warm-up: import + cache_resource terisi, supaya level pertama tidak ikut membayar
+        run_level(url, 1, journeys=1, seed=999, pid=pid)
+        results = [run_level(url, int(n), args.journeys, seed=i, pid=pid)
+                   for i, n in enumerate(args.sessions.split(","))]
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+    print(f"{'sess':>5} {'reruns':>7} {'err':>4} {'rerun/s':>8} {'p50 ms':>8} "
+          f"{'p95 ms':>8} {'p99 ms':>8} {'RSS MB':>8} {'peak MB':>8}")
+    for r in results:
+        rss = r["server_rss_mb"] if r["server_rss_mb"] is not None else float("nan")
+        peak = r["server_peak_rss_mb"] if r["server_peak_rss_mb"] is not None else float("nan")
+        print(f"{r['sessions']:>5} {r['reruns']:>7} {r['errors']:>4} {r['throughput_rps']:>8.1f} "
+              f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} "
+              f"{rss:>8.1f} {peak:>8.1f}")
+        if r["first_error"]:
+            print(f"      first error: {r['first_error']}")
+    saturated = saturation_point(results)
+    if saturated is not None:
+        print(f"throughput stops scaling after {saturated} concurrent sessions")
+
+
+if __name__ == "__main__":
+    main()
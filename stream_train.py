@@ -0,0 +1,324 @@
+import argparse
+import io
+import os
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from feature_schema import FeatureSchema, NUMERIC_FEATURES
+from model_artifact import ARTIFACT_PATH, export_artifact
+from prediction_engine import MODEL_PATH, SCALER_PATH
+from price_grid import artifact_sha256
+from train_pipeline import (
+    RAW_PATH, TARGET, TEST_SIZE, engineer_features, raw_numeric_columns, select_features
+)
+
+DEFAULT_CHUNK_MB = 32
+
+
+# ===============================
+# CHUNKED CSV READING
+# ===============================
+def byte_ranges(path, n_parts):
+    """Header line plus ``n_parts`` line-aligned ``(start, end)`` byte ranges.
+
+    Assumes no quoted field contains a newline (true for the price dumps).
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        header = f.readline()
+        first = f.tell()
+        cuts = [first]
+        for k in range(1, n_parts):
+            f.seek(first + (size - first) * k // n_parts)
+            f.readline()
+            cuts.append(max(f.tell(), cuts[-1]))
+        cuts.append(size)
+    return header, [(a, b) for a, b in zip(cuts[:-1], cuts[1:]) if b > a]
+
+
+def read_range(path, header, start, end, chunk_mb=DEFAULT_CHUNK_MB):
+    """Yield DataFrames of at most ~``chunk_mb`` MB of CSV from one range."""
+    block = int(chunk_mb * 2**20)
+    with open(path, "rb") as f:
+        f.seek(start)
+        while f.tell() < end:
+            data = f.read(min(block, end - f.tell()))
+            if f.tell() < end:
+                data += f.readline()
+            yield pd.read_csv(io.BytesIO(header + data))
+
+
+def is_test_row(chunk, test_size=TEST_SIZE):
+    """Deterministic train/test split on row content.
+
+    Independent of chunking and worker count (duplicate rows always land
+    on the same side), unlike ``train_test_split`` which needs a
+    permutation of the whole file.
+    """
+    # Angka di-hash sebagai float64: dtype hasil parse bisa beda antar chunk
+    keyed = chunk.apply(lambda c: c.astype(np.float64) if pd.api.types.is_numeric_dtype(c) else c)
+    h = pd.util.hash_pandas_object(keyed, index=False).to_numpy()
+    return (h % 10_000) < int(test_size * 10_000)
+
+
+# ===============================
+# MERGEABLE STATISTICS
+# ===============================
+class Moments:
+    """Count, mean and centred cross-product matrix of row vectors.
+
+    Chunks are merged with the pairwise update of Chan et al., so the
+    result does not depend on how rows were split across chunks or
+    processes and avoids the cancellation of raw ``ΣxxT - n·mean²``.
+    """
+
+    def __init__(self, p):
+        self.n = 0
+        self.mean = np.zeros(p)
+        self.m2 = np.zeros((p, p))
+
+    def update(self, Z):
+        Z = np.asarray(Z, dtype=np.float64)
+        if len(Z):
+            other = Moments(Z.shape[1])
+            other.n = len(Z)
+            other.mean = Z.mean(axis=0)
+            D = Z - other.mean
+            other.m2 = D.T @ D
+            self.merge(other)
+        return self
+
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.n / n)
+        self.m2 = self.m2 + other.m2 + np.outer(delta, delta) * (self.n * other.n / n)
+        self.n = n
+        return self
+
+
+def quantile_from_counts(values, counts, q):
+    """``pd.Series.quantile(q)`` (linear) from sorted distinct values + counts."""
+    cum = np.cumsum(counts)
+    h = (cum[-1] - 1) * q
+    lo = int(np.floor(h))
+    i = np.searchsorted(cum, lo, side="right")
+    j = np.searchsorted(cum, lo + 1, side="right") if lo + 1 < cum[-1] else i
+    return values[i] + (h - lo) * (values[j] - values[i])
+
+
+# ===============================
+# WORKERS
+# ===============================
+def _scan_range(args):
+    """Pass 1: value counts of the raw numeric columns + brand names."""
+    path, header, start, end, chunk_mb = args
+    counts, brands = {}, set()
+    for chunk in read_range(path, header, start, end, chunk_mb):
+        for col in raw_numeric_columns(chunk):
+            vc = chunk[col].value_counts()
+            counts[col] = vc if col not in counts else counts[col].add(vc, fill_value=0)
+        brands.update(chunk["Company"].dropna().unique())
+    return counts, brands
+
+
+def _moments_range(args):
+    """Pass 2: train/test moments of ``[features..., price]`` for one range."""
+    path, header, start, end, chunk_mb, fmt, bounds, categories, test_size = args
+    p = len(NUMERIC_FEATURES) + len(categories) + 1
+    train, test = Moments(p), Moments(p)
+    for chunk in read_range(path, header, start, end, chunk_mb):
+        test_rows = is_test_row(chunk, test_size)
+        if fmt == "raw":
+            final = select_features(engineer_features(chunk, bounds), categories)
+        else:
+            final = chunk.drop(columns=["Unnamed: 0"], errors="ignore")
+        Z = final.to_numpy(dtype=np.float64)
+        train.update(Z[~test_rows])
+        test.update(Z[test_rows])
+    return train, test
+
+
+def _merge_counts(results):
+    counts, brands = {}, set()
+    for c, b in results:
+        brands |= b
+        for col, vc in c.items():
+            counts[col] = vc if col not in counts else counts[col].add(vc, fill_value=0)
+    return counts, brands
+
+
+def clip_bounds(counts):
+    """Exact IQR clip bounds (same as ``train_pipeline.iqr_bounds``)."""
+    lower, upper = {}, {}
+    for col, vc in counts.items():
+        vc = vc.sort_index()
+        values, n = vc.index.to_numpy(dtype=np.float64), vc.to_numpy()
+        q1 = quantile_from_counts(values, n, 0.25)
+        q3 = quantile_from_counts(values, n, 0.75)
+        iqr = q3 - q1
+        lower[col], upper[col] = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    return pd.Series(lower), pd.Series(upper)
+
+
+# ===============================
+# SOLVE
+# ===============================
+def solve(train, feature_names):
+    """StandardScaler + LinearRegression equivalent to fitting on the rows
+    summarised by ``train`` (last column = target)."""
+    from sklearn.linear_model import LinearRegression
+    from sklearn.preprocessing import StandardScaler
+
+    p = len(feature_names)
+    n = train.n
+    mean_x, mean_y = train.mean[:p], train.mean[p]
+    cxx, cxy = train.m2[:p, :p], train.m2[:p, p]
+
+    var = np.diag(cxx) / n
+    scale = np.sqrt(var)
+    scale[scale < 10 * np.finfo(np.float64).eps] = 1.0  # sama dengan sklearn
+
+    # Regresi di ruang ter-scale (seperti notebook): minimum-norm solution
+    s_xx = cxx / np.outer(scale, scale)
+    s_xy = cxy / scale
+    coef, _, rank, sv = np.linalg.lstsq(s_xx, s_xy, rcond=None)
+
+    scaler = StandardScaler()
+    scaler.feature_names_in_ = np.asarray(feature_names, dtype=object)
+    scaler.n_features_in_ = p
+    scaler.n_samples_seen_ = np.int64(n)
+    scaler.mean_ = mean_x
+    scaler.var_ = var
+    scaler.scale_ = scale
+
+    model = LinearRegression()
+    model.n_features_in_ = p
+    model.coef_ = coef
+    model.rank_ = int(rank)
+    model.singular_ = np.sqrt(np.maximum(sv, 0.0))
+    model.intercept_ = float(mean_y)  # fitur ter-scale punya mean 0
+    return model, scaler
+
+
+def test_metrics(model, scaler, test):
+    """Test RMSE / R² from the test-row moments (no extra pass)."""
+    if test.n == 0:
+        return {}
+    p = len(scaler.mean_)
+    w = model.coef_ / scaler.scale_
+    b = model.intercept_ - w @ scaler.mean_
+    # residual r = y - (Xw + b); E[r] dan Var[r] dari momen
+    a = np.append(-w, 1.0)
+    mean_r = a @ test.mean - b
+    sse = a @ test.m2 @ a + test.n * mean_r**2
+    sst = test.m2[p, p]
+    return {"test_rows": test.n, "test_rmse": float(np.sqrt(sse / test.n)),
+            "test_r2": float(1 - sse / sst) if sst > 0 else float("nan")}
+
+
+def stream_fit(path, fmt="raw", workers=1, chunk_mb=DEFAULT_CHUNK_MB, test_size=TEST_SIZE):
+    """Two streaming passes (one for ``final``) -> ``(model, scaler, info)``."""
+    header, ranges = byte_ranges(path, max(1, workers) * 4)
+    pool = ProcessPoolExecutor(workers) if workers > 1 else None
+    map_ = pool.map if pool else map
+    try:
+        if fmt == "raw":
+            scans = map_(_scan_range, [(path, header, a, b, chunk_mb) for a, b in ranges])
+            counts, brands = _merge_counts(scans)
+            bounds = clip_bounds(counts)
+            categories = sorted(brands)[1:]  # drop_first seperti get_dummies
+        else:
+            columns = pd.read_csv(io.BytesIO(header)).columns
+            bounds = None
+            categories = FeatureSchema.from_feature_names(
+                [c for c in columns if c not in ("Unnamed: 0", TARGET)]
+            ).categories
+
+        schema = FeatureSchema(NUMERIC_FEATURES, categories, target=TARGET)
+        p = len(schema.feature_columns) + 1
+        train, test = Moments(p), Moments(p)
+        jobs = [(path, header, a, b, chunk_mb, fmt, bounds, categories, test_size) for a, b in ranges]
+        for tr, te in map_(_moments_range, jobs):
+            train.merge(tr)
+            test.merge(te)
+    finally:
+        if pool:
+            pool.shutdown()
+
+    model, scaler = solve(train, schema.feature_columns)
+    info = {"train_rows": train.n, "bounds": bounds, **test_metrics(model, scaler, test)}
+    return model, scaler, info
+
+
+def in_memory_fit(path, fmt="raw", test_size=TEST_SIZE):
+    """Reference: whole file in RAM, same split, sklearn ``fit``."""
+    from sklearn.linear_model import LinearRegression
+    from sklearn.preprocessing import StandardScaler
+
+    raw = pd.read_csv(path)
+    test_rows = is_test_row(raw, test_size)
+    final = (select_features(engineer_features(raw)) if fmt == "raw"
+             else raw.drop(columns=["Unnamed: 0"], errors="ignore"))
+    X = final.drop(columns=[TARGET])[~test_rows]
+    y = final[TARGET][~test_rows]
+    scaler = StandardScaler()
+    model = LinearRegression().fit(scaler.fit_transform(X), y)
+    return model, scaler
+
+
+def _peak_rss_mb(who=resource.RUSAGE_SELF):
+    return resource.getrusage(who).ru_maxrss / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Out-of-core training from chunked CSV input")
+    parser.add_argument("data", nargs="?", default=RAW_PATH)
+    parser.add_argument("--format", choices=["raw", "final"], default="raw",
+                        help="raw laptop_price dump, or data_final1_TEKREK.csv layout")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--chunk-mb", type=float, default=DEFAULT_CHUNK_MB)
+    parser.add_argument("--out-dir", default=".")
+    parser.add_argument("--check", action="store_true",
+                        help="also fit in memory and report the coefficient difference")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    model, scaler, info = stream_fit(args.data, args.format, args.workers, args.chunk_mb)
+    elapsed = time.perf_counter() - start
+    peak = max(_peak_rss_mb(), _peak_rss_mb(resource.RUSAGE_CHILDREN))
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    model_file = os.path.join(args.out_dir, MODEL_PATH)
+    scaler_file = os.path.join(args.out_dir, SCALER_PATH)
+    joblib.dump(model, model_file)
+    joblib.dump(scaler, scaler_file)
+    export_artifact(model, scaler, os.path.join(args.out_dir, ARTIFACT_PATH),
+                    source_sha256=artifact_sha256(model_file, scaler_file))
+    print(f"{info['train_rows']:,} train rows in {elapsed:.2f}s "
+          f"({args.workers} worker(s), peak RSS {peak:.0f} MB) -> {args.out_dir}")
+    if "test_r2" in info:
+        print(f"test rows {info['test_rows']:,} | RMSE {info['test_rmse']:.2f} | R2 {info['test_r2']:.4f}")
+    # Interval & comparables butuh dataset final di memori; dibangun di langkah deploy
+    print("next: `python prediction_intervals.py build` and `python comparables.py build` "
+          "against the serving dataset (the app hides both until they exist)")
+
+    if args.check:
+        start = time.perf_counter()
+        ref_model, ref_scaler = in_memory_fit(args.data, args.format)
+        elapsed = time.perf_counter() - start
+        print(f"in-memory fit {elapsed:.2f}s (peak RSS {_peak_rss_mb():.0f} MB)")
+        print(f"max |coef diff| {np.max(np.abs(model.coef_ - ref_model.coef_)):.2e} | "
+              f"|intercept diff| {abs(model.intercept_ - ref_model.intercept_):.2e} | "
+              f"max |scale diff| {np.max(np.abs(scaler.scale_ - ref_scaler.scale_)):.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import os
+import shutil
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+DERIVED = ["bootstrap_TEKREK.npz", "bootstrap_TEKREK.json",
+           "comparables_TEKREK.npz", "comparables_TEKREK.json"]
+
+
+@pytest.fixture
+def checkout_without_pickles(tmp_path, monkeypatch):
+    """Fresh-checkout copy of the repo: no .pkl model files (JSON artifact
+    only) and none of the derived interval / comparables artifacts."""
+    work = tmp_path / "app"
+    shutil.copytree(ROOT, work, ignore=shutil.ignore_patterns(
+        ".git", "__pycache__", ".pytest_cache", "*.pkl", "*.npcol", ".stats_cache", *DERIVED))
+    monkeypatch.chdir(work)
+    monkeypatch.setenv("APP_RELOAD_INTERVAL", "0")
+    return work
+
+
+def test_app_starts_and_predicts_without_pickles(checkout_without_pickles):
+    at = AppTest.from_file(str(checkout_without_pickles / "app.py"), default_timeout=120)
+    at.run()
+    assert not at.exception
+    at.sidebar.radio(key="page").set_value("🔮 Prediksi").run()
+    at.button(key="predict").click().run()
+    assert not at.exception
+    assert any("Prediksi Selesai" in m.value for m in at.markdown)
+    # Interval & laptop serupa disembunyikan, tidak di-fit di request path
+    assert not any("Interval" in m.value for m in at.markdown)
+    assert not any((checkout_without_pickles / name).exists() for name in DERIVED)
@@ -0,0 +1,49 @@
+import copy
+import os
+
+import numpy as np
+import pytest
+
+from artifact_watcher import ModelBundle, validate_model
+from comparables import load_or_build_index
+from dataset_store import load_dataset
+from model_artifact import engine_from_artifact, read_artifact
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def artifact_with_new_brand(brand="Framework"):
+    """The shipped artifact retrained on data with one more brand (zero offset)."""
+    artifact = copy.deepcopy(read_artifact(os.path.join(ROOT, "model_linear_TEKREK.json")))
+    artifact["categories"].append(brand)
+    artifact["feature_names"].append(f"{artifact['categorical']}_{brand}")
+    artifact["scaler"]["mean"].append(0.0)
+    artifact["scaler"]["scale"].append(1.0)
+    artifact["model"]["coef"].append(0.0)
+    return artifact
+
+
+def test_model_with_new_brand_is_accepted():
+    engine = engine_from_artifact(artifact_with_new_brand())
+    validate_model(ModelBundle(None, engine, None))
+    assert engine.brand_index("Framework") == len(engine.schema.categories) - 1
+
+
+def test_model_with_non_finite_weights_is_rejected():
+    artifact = artifact_with_new_brand()
+    artifact["model"]["coef"][-1] = float("nan")
+    with pytest.raises(ValueError):
+        validate_model(ModelBundle(None, engine_from_artifact(artifact), None))
+
+
+def test_comparables_follow_the_artifact_schema(tmp_path):
+    import json
+
+    artifact_path = tmp_path / "model.json"
+    artifact_path.write_text(json.dumps(artifact_with_new_brand()))
+    df = load_dataset(os.path.join(ROOT, "data_final1_TEKREK.csv"), str(tmp_path / "store"))
+    index = load_or_build_index(df, artifact_path=str(artifact_path), path=str(tmp_path / "idx.npz"),
+                                meta_path=str(tmp_path / "idx.json"), dataset_sha256="x")
+    assert index.schema.categories[-1] == "Framework"
+    rows, dist = index.query((15.6, 2.5, 8, 2.0, 0, 256, 1920, 1080, 1, 500, "Framework"), k=3)
+    assert len(rows) == 3 and np.isfinite(dist).all()
@@ -0,0 +1,28 @@
+import shutil
+
+import pandas as pd
+
+from batch_predict import PRICE_EUR_COL, PRICE_IDR_COL, main, predict_csv
+from model_artifact import ARTIFACT_PATH, load_engine
+
+
+def test_empty_input_still_writes_header(tmp_path):
+    source, dest = tmp_path / "empty.csv", tmp_path / "out.csv"
+    source.write_text("")
+    engine = load_engine()
+    assert predict_csv(engine, str(source), str(dest))["rows"] == 0
+    header = pd.read_csv(dest).columns
+    assert list(header[:len(engine.schema.numeric)]) == engine.schema.numeric
+    assert PRICE_EUR_COL in header
+
+
+def test_non_default_model_gets_no_interval_columns(tmp_path, capsys):
+    artifact = tmp_path / "other.json"
+    shutil.copy(ARTIFACT_PATH, artifact)
+    source, dest = tmp_path / "in.csv", tmp_path / "out.csv"
+    source.write_text("Inches,CPU_Frequency (GHz),RAM (GB),Weight (kg),Touchscreen,SSD,"
+                      "Res_Width,Res_Height,IPS_Panel,HDD,Company\n"
+                      "15.6,2.5,8,2.0,0,256,1920,1080,1,0,Dell\n")
+    main([str(source), "-o", str(dest), "--artifact", str(artifact)])
+    assert "interval columns skipped" in capsys.readouterr().err
+    assert list(pd.read_csv(dest).columns[-2:]) == [PRICE_EUR_COL, PRICE_IDR_COL]
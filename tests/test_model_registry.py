@@ -0,0 +1,37 @@
+import json
+import threading
+
+from model_registry import DEFAULT_KEY, ModelRegistry, model_key
+
+
+def test_entries_without_files_are_skipped(tmp_path):
+    present = tmp_path / "ridge-v1.json"
+    present.write_text("{}")
+    manifest = tmp_path / "registry.json"
+    manifest.write_text(json.dumps({"format_version": 1, "models": [
+        {"name": "ridge", "version": 1, "kind": "linear-json", "files": [str(present)]},
+        {"name": "gbr", "version": 1, "kind": "sklearn", "files": [str(tmp_path / "gbr-v1.joblib")]},
+    ]}))
+    registry = ModelRegistry.from_manifest(str(manifest))
+    assert registry.keys() == [DEFAULT_KEY, model_key("ridge", 1)]
+
+
+def test_slow_load_does_not_block_other_models():
+    release = threading.Event()
+
+    def loader(entry):
+        if entry["name"] == "slow":
+            release.wait(10)
+        return entry["name"]
+
+    entries = [{"name": name, "version": 1, "kind": "test", "files": []} for name in ("slow", "fast")]
+    registry = ModelRegistry(entries, pinned=(), loader=loader)
+    try:
+        slow = registry.load_async(model_key("slow", 1))
+        assert registry.load_async(model_key("slow", 1)) is slow   # satu load per key
+        assert registry.get(model_key("fast", 1), timeout=5) == "fast"
+        assert not slow.done()
+    finally:
+        release.set()
+    assert slow.result(5) == "slow"
+    assert registry.loads == {model_key("slow", 1): 1, model_key("fast", 1): 1}
@@ -0,0 +1,18 @@
+from prediction_cache import PredictionCache
+
+
+def test_versions_do_not_invalidate_each_other():
+    cache = PredictionCache()
+    cache.get_or_compute("spec", lambda: 1.0, version="old")
+    cache.get_or_compute("spec", lambda: 2.0, version="new")
+    # Session lama dan baru bergantian selama hot reload: keduanya tetap hit
+    assert cache.get_or_compute("spec", lambda: None, version="old") == 1.0
+    assert cache.get_or_compute("spec", lambda: None, version="new") == 2.0
+    assert cache.stats()["invalidations"] == 0
+
+
+def test_clear_discards_results_computed_before_it():
+    cache = PredictionCache()
+    cache.get_or_compute("spec", lambda: cache.clear() or 1.0, version="v")
+    assert cache.stats()["size"] == 0
+    assert cache.get_or_compute("spec", lambda: 2.0, version="v") == 2.0
@@ -0,0 +1,18 @@
+import pandas as pd
+import pytest
+
+from train_pipeline import check, engineer_features, notebook_final_frame, select_features, synthetic_raw
+
+
+@pytest.mark.parametrize("n_rows, seed", [(50, 0), (400, 1), (2000, 7)])
+def test_vectorized_frame_matches_notebook(n_rows, seed):
+    raw = synthetic_raw(n_rows, seed)
+    ours = select_features(engineer_features(raw))
+    ref = notebook_final_frame(raw)
+    assert list(ours.columns) == list(ref.columns)
+    assert list(ours.dtypes) == list(ref.dtypes)
+    pd.testing.assert_frame_equal(ours, ref, check_exact=True)
+
+
+def test_vectorized_fit_matches_notebook():
+    assert check(synthetic_raw(500, seed=3)) == {}
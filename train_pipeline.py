@@ -0,0 +1,376 @@
+import argparse
+import os
+import re
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from dataset_stats import DATA_PATH, file_sha256
+from feature_schema import FeatureSchema, NUMERIC_FEATURES
+from model_artifact import ARTIFACT_PATH, export_artifact
+from prediction_engine import MODEL_PATH, SCALER_PATH
+from prediction_intervals import INTERVALS_META_PATH, INTERVALS_PATH, write_intervals
+from price_grid import artifact_sha256
+
+RAW_PATH = "laptop_price - dataset.csv"
+TARGET = "Price (Euro)"
+STORAGE_TYPES = ["SSD", "HDD", "Flash Storage", "Hybrid"]
+TOP_MODELS = 15
+TEST_SIZE = 0.2
+RANDOM_STATE = 42
+
+
+# ===============================
+# FEATURE ENGINEERING (vectorized)
+# ===============================
+def raw_numeric_columns(df):
+    """Kolom yang di-clip notebook: semua kolom numerik dataset mentah."""
+    return list(df.select_dtypes(include=["int64", "float64"]).columns)
+
+
+def iqr_bounds(df, columns):
+    """(lower, upper) per column from one multi-column quantile pass."""
+    q = df[columns].quantile([0.25, 0.75])
+    iqr = q.loc[0.75] - q.loc[0.25]
+    return q.loc[0.25] - 1.5 * iqr, q.loc[0.75] + 1.5 * iqr
+
+
+def _per_unique(values, func):
+    """Apply a vectorized string transform to the distinct values only.
+
+    Spec strings repeat heavily (a few hundred distinct values in any price
+    dump), so the string work no longer grows with the row count.
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    result = func(pd.Series(uniques, dtype=object))
+    out = result.iloc[codes]
+    out.index = values.index
+    return out
+
+
+def parse_memory(memory):
+    """SSD / HDD / Flash Storage / Hybrid capacity in GB for a Memory column.
+
+    Same rules as the notebook's per-row ``parse_memory``: drop ``.0``,
+    split on ``+``, take the first ``<n>GB|TB`` of each part and credit it
+    to the first storage type named in that part.
+    """
+    parts = memory.astype(str).str.replace(".0", "", regex=False).str.split("+", expand=True)
+    out = pd.DataFrame(0, index=memory.index, columns=STORAGE_TYPES, dtype=np.int64)
+    for j in parts.columns:
+        part = parts[j].str.strip()
+        size = part.str.extract(r"(\d+)(GB|TB)")
+        value = pd.to_numeric(size[0]).fillna(0).astype(np.int64)
+        value = value.where(size[1] != "TB", value * 1024)
+        claimed = pd.Series(False, index=memory.index)
+        for kind in STORAGE_TYPES:
+            hit = part.str.contains(kind, regex=False, na=False) & ~claimed
+            out[kind] += value.where(hit, 0)
+            claimed |= hit
+    return out
+
+
+def parse_screen(screen):
+    """Touchscreen / IPS_Panel flags and the first ``<w>x<h>`` resolution."""
+    res = screen.str.extract(r"(\d+)x(\d+)")
+    return pd.DataFrame({
+        "Touchscreen": screen.str.contains("Touchscreen", regex=False).astype(np.int64),
+        "IPS_Panel": screen.str.contains("IPS", regex=False).astype(np.int64),
+        "Res_Width": pd.to_numeric(res[0]),
+        "Res_Height": pd.to_numeric(res[1]),
+    })
+
+
+def first_words(values, n):
+    return values.str.split().str[:n].str.join(" ")
+
+
+def top_or_other(values, n=TOP_MODELS):
+    top = values.value_counts().nlargest(n).index
+    return values.where(values.isin(top), "Other")
+
+
+def engineer_features(df, bounds=None):
+    """Notebook cells 50-60 on a raw frame, without per-row Python.
+
+    ``bounds`` are the IQR clip bounds; by default they come from ``df``
+    itself (what the notebook does).
+    """
+    df = df.copy()
+    num_cols = raw_numeric_columns(df)
+    lower, upper = bounds if bounds is not None else iqr_bounds(df, num_cols)
+    df[num_cols] = df[num_cols].clip(lower[num_cols], upper[num_cols], axis=1)
+    df = df.drop(columns="Product")
+
+    screen = _per_unique(df["ScreenResolution"], parse_screen)
+    df[screen.columns] = screen
+    df = df.drop(columns=["ScreenResolution"])
+
+    df = pd.concat([df, _per_unique(df["Memory"], parse_memory)], axis=1).drop(columns=["Memory"])
+
+    df["CPU_Model"] = top_or_other(_per_unique(df["CPU_Type"], lambda s: first_words(s, 3)))
+    df["GPU_Model"] = top_or_other(_per_unique(df["GPU_Type"], lambda s: first_words(s, 2)))
+    return df.drop(columns=["CPU_Type", "GPU_Type"])
+
+
+def brand_categories(company):
+    """Dummy brands as ``get_dummies(drop_first=True)`` would create them."""
+    return sorted(pd.unique(company.dropna()))[1:]
+
+
+def select_features(df, categories=None):
+    """``data_final1_TEKREK.csv`` layout: numeric features, Company_*, price.
+
+    Only the brand is one-hot encoded; the notebook also dummies the other
+    categoricals but drops them again in ``feature_selection``.
+    """
+    if categories is None:
+        categories = brand_categories(df["Company"])
+    schema = FeatureSchema(NUMERIC_FEATURES, categories, target=TARGET)
+    out = df[schema.numeric].astype(int)
+    codes = pd.Categorical(df["Company"], categories=schema.categories).codes
+    onehot = pd.DataFrame(schema.onehot(codes, dtype=int), index=df.index,
+                          columns=schema.onehot_columns)
+    out = pd.concat([out, onehot], axis=1)
+    out[TARGET] = df[TARGET].astype(int)
+    return out
+
+
+# ===============================
+# TRAINING
+# ===============================
+def fit(df_final):
+    """StandardScaler + LinearRegression on the notebook's 80/20 split."""
+    from sklearn.linear_model import LinearRegression
+    from sklearn.metrics import mean_absolute_error, r2_score
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+
+    X = df_final.drop(columns=[TARGET])
+    y = df_final[TARGET]
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE
+    )
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    model = LinearRegression()
+    model.fit(X_train_scaled, y_train)
+
+    y_test_pred = model.predict(scaler.transform(X_test))
+    metrics = {
+        "rows": len(df_final),
+        "test_mae": float(mean_absolute_error(y_test, y_test_pred)),
+        "test_r2": float(r2_score(y_test, y_test_pred)),
+    }
+    return model, scaler, metrics
+
+
+def train(raw_path=RAW_PATH, out_dir=".", model_path=MODEL_PATH,
+          scaler_path=SCALER_PATH, data_path=DATA_PATH):
+    """Raw CSV -> model, scaler (.pkl + JSON artifact), the bootstrap
+    interval matrix, the comparables index and ``data_final1_TEKREK.csv``
+    in ``out_dir``. The app only reads the derived artifacts; it never
+    fits them on a request."""
+    from comparables import INDEX_META_PATH, INDEX_PATH, load_or_build_index
+
+    df_final = select_features(engineer_features(pd.read_csv(raw_path)))
+    model, scaler, metrics = fit(df_final)
+    os.makedirs(out_dir, exist_ok=True)
+    model_file = os.path.join(out_dir, model_path)
+    scaler_file = os.path.join(out_dir, scaler_path)
+    joblib.dump(model, model_file)
+    joblib.dump(scaler, scaler_file)
+    export_artifact(model, scaler, os.path.join(out_dir, ARTIFACT_PATH),
+                    source_sha256=artifact_sha256(model_file, scaler_file))
+    data_file = os.path.join(out_dir, data_path)
+    df_final.to_csv(data_file)
+    dataset_sha256 = file_sha256(data_file)
+    write_intervals(df_final, os.path.join(out_dir, INTERVALS_PATH),
+                    os.path.join(out_dir, INTERVALS_META_PATH),
+                    dataset_sha256=dataset_sha256,
+                    schema=FeatureSchema.from_feature_names(scaler.feature_names_in_))
+    load_or_build_index(df_final, artifact_path=os.path.join(out_dir, ARTIFACT_PATH),
+                        path=os.path.join(out_dir, INDEX_PATH),
+                        meta_path=os.path.join(out_dir, INDEX_META_PATH),
+                        dataset_sha256=dataset_sha256)
+    return metrics
+
+
+# ===============================
+# NOTEBOOK REFERENCE
+# ===============================
+def notebook_final_frame(df):
+    """The notebook's row-at-a-time transformations, kept as the reference
+    for ``check`` and ``bench``."""
+    df = df.copy()
+    num_cols = df.select_dtypes(include=['int64', 'float64']).columns
+    for col in num_cols:
+        Q1 = df[col].quantile(0.25)
+        Q3 = df[col].quantile(0.75)
+        IQR = Q3 - Q1
+        df[col] = df[col].clip(Q1 - 1.5*IQR, Q3 + 1.5*IQR)
+    df.drop(columns='Product', inplace=True)
+
+    df['Touchscreen'] = df['ScreenResolution'].apply(lambda x: 1 if 'Touchscreen' in x else 0)
+    df['IPS_Panel'] = df['ScreenResolution'].apply(lambda x: 1 if 'IPS' in x else 0)
+
+    def extract_resolution(res_str):
+        res = re.findall(r'(\d+)x(\d+)', res_str)
+        if res:
+            return int(res[0][0]), int(res[0][1])
+        return None, None
+    df['Res_Width'], df['Res_Height'] = zip(*df['ScreenResolution'].apply(extract_resolution))
+    df.drop(columns=['ScreenResolution'], inplace=True)
+
+    def parse_memory_row(mem_str):
+        mem_str = str(mem_str).replace('.0', '')
+        parts = mem_str.split('+')
+        res = {'SSD': 0, 'HDD': 0, 'Flash Storage': 0, 'Hybrid': 0}
+        for part in parts:
+            part = part.strip()
+            match = re.search(r'(\d+)(GB|TB)', part)
+            if match:
+                val = int(match.group(1))
+                unit = match.group(2)
+                if unit == 'TB': val *= 1024
+                for storage_type in res.keys():
+                    if storage_type in part:
+                        res[storage_type] += val
+                        break
+        return pd.Series(res)
+    mem_cols = df['Memory'].apply(parse_memory_row)
+    df = pd.concat([df, mem_cols], axis=1)
+    df.drop(columns=['Memory'], inplace=True)
+
+    df['CPU_Model'] = df['CPU_Type'].apply(lambda x: " ".join(x.split()[:3]))
+    df['GPU_Model'] = df['GPU_Type'].apply(lambda x: " ".join(x.split()[:2]))
+    top_cpus = df['CPU_Model'].value_counts().nlargest(15).index
+    df['CPU_Model'] = df['CPU_Model'].apply(lambda x: x if x in top_cpus else 'Other')
+    top_gpus = df['GPU_Model'].value_counts().nlargest(15).index
+    df['GPU_Model'] = df['GPU_Model'].apply(lambda x: x if x in top_gpus else 'Other')
+    df.drop(columns=['CPU_Type', 'GPU_Type'], inplace=True)
+
+    categorical_cols = ['Company', 'TypeName', 'CPU_Company', 'CPU_Model', 'GPU_Company', 'GPU_Model', 'OpSys']
+    df_encode = pd.get_dummies(df, columns=categorical_cols, drop_first=True).astype(int)
+    company_columns = [c for c in df_encode.columns if c.startswith('Company_')]
+    return df_encode[NUMERIC_FEATURES + company_columns + [TARGET]]
+
+
+def synthetic_raw(n_rows, seed=0):
+    """Random frame in the raw ``laptop_price - dataset.csv`` format."""
+    rng = np.random.default_rng(seed)
+    pick = lambda options, p=None: rng.choice(options, size=n_rows, p=p)
+    screens = pick([
+        "1366x768", "Full HD 1920x1080", "IPS Panel Full HD 1920x1080",
+        "Full HD / Touchscreen 1920x1080", "IPS Panel Retina Display 2560x1600",
+        "IPS Panel 4K Ultra HD / Touchscreen 3840x2160", "Touchscreen 2256x1504",
+    ])
+    memory = pick([
+        "128GB SSD", "256GB SSD", "512GB SSD", "1TB HDD", "500GB HDD", "32GB Flash Storage",
+        "1.0TB Hybrid", "128GB SSD +  1TB HDD", "256GB SSD +  2TB HDD", "512GB SSD +  1.0TB Hybrid",
+        "256GB Flash Storage", "64GB Flash Storage",
+    ])
+    cpu_family = pick(["Intel Core i3", "Intel Core i5", "Intel Core i7", "Intel Celeron Dual",
+                       "Intel Pentium Quad", "AMD A9-Series 9420", "Intel Atom x5-Z8350",
+                       "Intel Core M", "AMD Ryzen 1700", "Intel Xeon E3-1505M"])
+    cpu_suffix = pick(["7200U", "8550U", "6500U", "7700HQ", "N3060", "", "8250U"])
+    gpu = pick(["Intel HD Graphics 620", "Intel UHD Graphics 620", "Nvidia GeForce GTX 1050",
+                "Nvidia GeForce MX150", "AMD Radeon 530", "Nvidia Quadro M1200",
+                "Intel Iris Plus Graphics 640", "AMD Radeon R5 M430"])
+    return pd.DataFrame({
+        "Company": pick(["Acer", "Apple", "Asus", "Dell", "HP", "Lenovo", "MSI", "Toshiba",
+                         "Xiaomi", "Razer", "Samsung"]),
+        "Product": pick(["Aspire 3", "MacBook Pro", "XPS 13", "IdeaPad 320", "Inspiron 3567"]),
+        "TypeName": pick(["Notebook", "Ultrabook", "Gaming", "2 in 1 Convertible", "Workstation"]),
+        "Inches": np.round(rng.choice([11.6, 13.3, 14.0, 15.6, 17.3, 10.1, 18.4], size=n_rows), 1),
+        "ScreenResolution": screens,
+        "CPU_Company": [g.split()[0] for g in cpu_family],
+        "CPU_Type": [f"{a} {b}".strip() for a, b in zip(cpu_family, cpu_suffix)],
+        "CPU_Frequency (GHz)": np.round(rng.uniform(0.9, 3.6, size=n_rows), 1),
+        "RAM (GB)": pick([2, 4, 6, 8, 12, 16, 32, 64]),
+        "Memory": memory,
+        "GPU_Company": [g.split()[0] for g in gpu],
+        "GPU_Type": gpu,
+        "OpSys": pick(["Windows 10", "Linux", "No OS", "macOS", "Chrome OS"]),
+        "Weight (kg)": np.round(rng.gamma(9.0, 0.23, size=n_rows), 2),
+        "Price (Euro)": np.round(rng.lognormal(6.8, 0.6, size=n_rows), 2),
+    })
+
+
+def check(raw):
+    """Compare the vectorized pipeline with the notebook reference.
+
+    Returns a dict of mismatches; empty means identical frames and
+    coefficients equal to floating point tolerance.
+    """
+    problems = {}
+    ours = select_features(engineer_features(raw))
+    ref = notebook_final_frame(raw)
+    if list(ours.columns) != list(ref.columns):
+        problems["columns"] = (list(ours.columns), list(ref.columns))
+        return problems
+    if not ours.equals(ref):
+        diff = (ours != ref).sum()
+        problems["values"] = diff[diff > 0].to_dict()
+        return problems
+    model_a, scaler_a, _ = fit(ours)
+    model_b, scaler_b, _ = fit(ref)
+    coef_diff = float(np.max(np.abs(model_a.coef_ - model_b.coef_)))
+    if coef_diff > 1e-9 * max(1.0, float(np.max(np.abs(model_b.coef_)))):
+        problems["coef_max_abs_diff"] = coef_diff
+    if not np.allclose(scaler_a.mean_, scaler_b.mean_) or not np.allclose(scaler_a.scale_, scaler_b.scale_):
+        problems["scaler"] = "mean_/scale_ differ"
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the laptop price model from the raw CSV")
+    sub = parser.add_subparsers(dest="command", required=True)
+    tr = sub.add_parser("train", help="write model, scaler and data_final1_TEKREK.csv")
+    tr.add_argument("raw", nargs="?", default=RAW_PATH)
+    tr.add_argument("--out-dir", default=".")
+    ck = sub.add_parser("check", help="compare against the notebook's row-wise code")
+    ck.add_argument("raw", nargs="?", help="raw CSV (default: synthetic rows)")
+    ck.add_argument("--rows", type=int, default=5000)
+    ck.add_argument("--seeds", type=int, default=3)
+    bench = sub.add_parser("bench", help="feature engineering time: notebook vs vectorized")
+    bench.add_argument("--sizes", default="1303,13030,130300,1303000")
+    bench.add_argument("--reference-max", type=int, default=130300,
+                       help="skip the notebook code above this many rows")
+    args = parser.parse_args(argv)
+
+    if args.command == "train":
+        metrics = train(args.raw, args.out_dir)
+        print(f"{metrics['rows']:,} rows | test MAE {metrics['test_mae']:.2f} | "
+              f"test R2 {metrics['test_r2']:.4f} -> {args.out_dir}")
+    elif args.command == "check":
+        if args.raw:
+            frames = [(args.raw, pd.read_csv(args.raw))]
+        else:
+            frames = [(f"synthetic seed={s}", synthetic_raw(args.rows, s)) for s in range(args.seeds)]
+        failed = False
+        for name, raw in frames:
+            problems = check(raw)
+            print(f"{name}: {'OK' if not problems else problems}")
+            failed |= bool(problems)
+        raise SystemExit(1 if failed else 0)
+    else:
+        print(f"{'rows':>10} {'notebook s':>11} {'vectorized s':>13} {'speedup':>8}")
+        for n in (int(s) for s in args.sizes.split(",")):
+            raw = synthetic_raw(n)
+            start = time.perf_counter()
+            select_features(engineer_features(raw))
+            ours = time.perf_counter() - start
+            if n <= args.reference_max:
+                start = time.perf_counter()
+                notebook_final_frame(raw)
+                ref = time.perf_counter() - start
+                print(f"{n:>10,} {ref:>11.2f} {ours:>13.2f} {ref / ours:>7.1f}x")
+            else:
+                print(f"{n:>10,} {'-':>11} {ours:>13.2f} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()